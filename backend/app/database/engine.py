@@ -1,9 +1,13 @@
-from typing import Generator, Annotated
+import threading
+import time
+from typing import AsyncGenerator, Generator, Annotated, Optional
 
 from fastapi import Depends
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from sqlalchemy import create_engine, URL
+from sqlalchemy import create_engine, exc, text, URL
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 
 class DBSettings(BaseSettings):
@@ -15,6 +19,167 @@ class DBSettings(BaseSettings):
     port: int = 5432
     name: str = "crewboard"
 
+    # sync handlers run in a threadpool of about 40, size + overflow should cover it
+    pool_size: int = 10
+    max_overflow: int = 30
+    # async handlers share one event loop and hold a connection only while
+    # awaiting a query, so their pools are sized separately and much smaller
+    async_pool_size: int = 5
+    async_max_overflow: int = 10
+    # seconds a request waits for a connection before failing
+    pool_timeout: float = 10.0
+    # seconds after which a connection is replaced on checkout
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    # server-side limit per statement, 0 disables it
+    statement_timeout_ms: int = 30000
+
+    # optional streaming replica for read-only handlers, same credentials and database
+    replica_host: Optional[str] = None
+    replica_port: Optional[int] = None
+    # reads go to the primary while the replica is further behind than this
+    replica_max_lag_s: float = 5.0
+    # seconds between replica lag checks, and before retrying one that failed
+    replica_check_interval_s: float = 1.0
+    replica_retry_s: float = 10.0
+    # a replica that is down must fail fast, not hold the request
+    replica_connect_timeout_s: int = 2
+    # the replica pool serves the same async reads, not in addition to them
+    replica_pool_size: int = 5
+    replica_max_overflow: int = 10
+
+
+class PoolMetrics:
+    """Counters for how long requests wait to get a connection out of the pool."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total_s = 0.0
+        self.wait_max_s = 0.0
+
+    def record(self, waited_s: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.timeouts += timed_out
+            self.wait_total_s += waited_s
+            self.wait_max_s = max(self.wait_max_s, waited_s)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_total_s": round(self.wait_total_s, 6),
+                "wait_avg_s": round(self.wait_total_s / self.checkouts, 6) if self.checkouts else 0.0,
+                "wait_max_s": round(self.wait_max_s, 6),
+            }
+
+
+POOL_METRICS = PoolMetrics()
+ASYNC_POOL_METRICS = PoolMetrics()
+REPLICA_POOL_METRICS = PoolMetrics()
+
+
+class _MeteredCheckout:
+    """Pool mixin that records the time spent waiting for each checkout."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record(time.perf_counter() - started)
+        return connection
+
+
+class MeteredQueuePool(_MeteredCheckout, QueuePool):
+    metrics = POOL_METRICS
+
+
+class MeteredAsyncQueuePool(_MeteredCheckout, AsyncAdaptedQueuePool):
+    metrics = ASYNC_POOL_METRICS
+
+
+class MeteredReplicaQueuePool(_MeteredCheckout, AsyncAdaptedQueuePool):
+    metrics = REPLICA_POOL_METRICS
+
+
+# 0 when the replica has replayed everything it received (an idle primary
+# would otherwise look like growing lag), and on a server that is not a standby
+REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class ReplicaRouter:
+    """Decides whether read-only requests may use the replica.
+
+    The replica's lag is checked at most every ``check_interval_s`` and reads
+    go to the primary while it exceeds ``max_lag_s``. A replica that cannot be
+    reached is left alone for ``retry_s``, so a dead replica costs one failed
+    connect per retry period rather than one per request.
+    """
+
+    def __init__(
+        self,
+        engine: Optional[AsyncEngine],
+        *,
+        max_lag_s: float,
+        check_interval_s: float,
+        retry_s: float,
+    ) -> None:
+        self.engine = engine
+        self.max_lag_s = max_lag_s
+        self.check_interval_s = check_interval_s
+        self.retry_s = retry_s
+        self.lag_s: Optional[float] = None
+        self.error: Optional[str] = None
+        self._usable = False
+        self._next_check = 0.0
+
+    async def usable(self) -> bool:
+        if self.engine is None:
+            return False
+        now = time.monotonic()
+        if now < self._next_check:
+            return self._usable
+        # claimed before awaiting so concurrent requests reuse the last answer
+        self._next_check = now + self.check_interval_s
+        try:
+            async with self.engine.connect() as conn:
+                self.lag_s = float((await conn.execute(REPLICA_LAG_SQL)).scalar_one())
+        except (exc.DBAPIError, OSError) as error:
+            self.mark_down(error)
+        else:
+            self.error = None
+            self._usable = self.lag_s <= self.max_lag_s
+        return self._usable
+
+    def mark_down(self, error: BaseException) -> None:
+        self._usable = False
+        self.lag_s = None
+        self.error = type(error).__name__
+        self._next_check = time.monotonic() + self.retry_s
+
+    def status(self) -> dict:
+        return {
+            "configured": self.engine is not None,
+            "in_use": self._usable,
+            "lag_s": self.lag_s,
+            "max_lag_s": self.max_lag_s,
+            "error": self.error,
+        }
+
 
 DB_SETTINGS = DBSettings()
 DB_URL = URL.create(
@@ -22,15 +187,107 @@ DB_URL = URL.create(
     username=DB_SETTINGS.user,
     password=DB_SETTINGS.password,
     host=DB_SETTINGS.host,
+    port=DB_SETTINGS.port,
     database=DB_SETTINGS.name,
 )
-DB_ENGINE = create_engine(DB_URL)
+
+
+def _engine_options(pool_size: int, max_overflow: int, **connect_args) -> dict:
+    """Pool and session options shared by the engines, with the pool's own size."""
+    return dict(
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=DB_SETTINGS.pool_timeout,
+        pool_recycle=DB_SETTINGS.pool_recycle,
+        pool_pre_ping=DB_SETTINGS.pool_pre_ping,
+        connect_args={"options": f"-c statement_timeout={DB_SETTINGS.statement_timeout_ms}", **connect_args},
+    )
+
+
+# blocking engine for sync handlers, scripts, migrations and tests
+DB_ENGINE = create_engine(
+    DB_URL,
+    poolclass=MeteredQueuePool,
+    **_engine_options(DB_SETTINGS.pool_size, DB_SETTINGS.max_overflow),
+)
 DBSessionMaker = sessionmaker(DB_ENGINE)
 
+# the same psycopg driver in async mode, for async def handlers
+ASYNC_DB_ENGINE = create_async_engine(
+    DB_URL,
+    poolclass=MeteredAsyncQueuePool,
+    **_engine_options(DB_SETTINGS.async_pool_size, DB_SETTINGS.async_max_overflow),
+)
+AsyncDBSessionMaker = async_sessionmaker(ASYNC_DB_ENGINE, expire_on_commit=False)
+
+# read-only handlers, only when a replica is configured
+ASYNC_REPLICA_ENGINE = (
+    create_async_engine(
+        DB_URL.set(host=DB_SETTINGS.replica_host, port=DB_SETTINGS.replica_port or DB_SETTINGS.port),
+        poolclass=MeteredReplicaQueuePool,
+        **_engine_options(
+            DB_SETTINGS.replica_pool_size,
+            DB_SETTINGS.replica_max_overflow,
+            connect_timeout=DB_SETTINGS.replica_connect_timeout_s,
+        ),
+    )
+    if DB_SETTINGS.replica_host
+    else None
+)
+AsyncReplicaSessionMaker = (
+    async_sessionmaker(ASYNC_REPLICA_ENGINE, expire_on_commit=False) if ASYNC_REPLICA_ENGINE else None
+)
+REPLICA_ROUTER = ReplicaRouter(
+    ASYNC_REPLICA_ENGINE,
+    max_lag_s=DB_SETTINGS.replica_max_lag_s,
+    check_interval_s=DB_SETTINGS.replica_check_interval_s,
+    retry_s=DB_SETTINGS.replica_retry_s,
+)
+
+
+def pool_status(engine=None) -> dict:
+    pool = (engine or DB_ENGINE).pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        # QueuePool counts up from -size, only connections beyond size are overflow
+        "overflow": max(pool.overflow(), 0),
+        # each engine has its own limit, QueuePool keeps it only as an attribute
+        "max_overflow": pool._max_overflow,
+        **pool.metrics.snapshot(),
+    }
+
 
 def get_db_session() -> Generator[Session, None, None]:
     with DBSessionMaker() as db_session:
         yield db_session
 
 
-DBSession = Annotated[Session, Depends(get_db_session)]
\ No newline at end of file
+DBSession = Annotated[Session, Depends(get_db_session)]
+
+
+async def get_async_db_session() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncDBSessionMaker() as db_session:
+        yield db_session
+
+
+async def get_read_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """A session on the replica when it is up and fresh enough, on the primary otherwise.
+
+    The replica is checked before the request, not retried during it: if it
+    fails mid-request that request fails with a 500, and only later requests
+    go to the primary until ``replica_retry_s`` has passed.
+    """
+    if not await REPLICA_ROUTER.usable():
+        async with AsyncDBSessionMaker() as db_session:
+            yield db_session
+        return
+
+    async with AsyncReplicaSessionMaker() as db_session:
+        try:
+            yield db_session
+        except exc.OperationalError as error:
+            # the replica went away after the check, later requests use the primary
+            REPLICA_ROUTER.mark_down(error)
+            raise
@@ -0,0 +1,84 @@
+"""Reading CSV/NDJSON uploads for the bulk import endpoints.
+
+Uploads use the same two formats as the exports, so an export can be sent
+back as an import. The body is read whole, the rows are then yielded one at
+a time with their line number and every rejected row is reported by line.
+"""
+import csv
+import io
+import json
+from typing import Any, Iterator, Optional, Union
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+
+from app.domains.export import ExportFormat
+
+
+# per-row errors returned by a bulk import, the count is always complete
+MAX_REPORTED_ERRORS = 1000
+
+
+class BulkRowError(BaseModel):
+    line: int
+    id: Optional[str] = None
+    errors: list[str]
+
+
+class RowErrors:
+    """Rejected rows of one import: all of them counted, the first ``MAX_REPORTED_ERRORS`` kept."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self._kept: list[BulkRowError] = []
+
+    def reject(self, line: int, row_id: Any, messages: list[str]) -> None:
+        self.count += 1
+        if len(self._kept) < MAX_REPORTED_ERRORS:
+            self._kept.append(BulkRowError(
+                line=line,
+                id=None if row_id is None else str(row_id),
+                errors=messages,
+            ))
+
+    def report(self) -> list[BulkRowError]:
+        return sorted(self._kept, key=lambda e: e.line)
+
+
+def read_records(
+    body: str, fmt: ExportFormat, model: type[BaseModel]
+) -> Iterator[tuple[int, Union[dict, str]]]:
+    """``(line, record)`` for every row of an upload; ``record`` is an error message when unreadable.
+
+    A CSV upload must have a header row naming at least the required fields
+    of ``model``.
+    """
+    if fmt is ExportFormat.CSV:
+        reader = csv.DictReader(io.StringIO(body))
+        header = reader.fieldnames or []
+        missing = [name for name, field in model.model_fields.items() if field.is_required() and name not in header]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"CSV header is missing column(s): {', '.join(missing)}",
+            )
+        for row in reader:
+            # DictReader files surplus cells under the None key
+            yield reader.line_num, "too many fields" if None in row else row
+        return
+
+    for line, raw in enumerate(body.splitlines(), start=1):
+        if not raw.strip():
+            continue
+        try:
+            record = json.loads(raw)
+        except ValueError:
+            yield line, "not valid JSON"
+            continue
+        yield line, record if isinstance(record, dict) else "expected a JSON object"
+
+
+def describe_error(error) -> str:
+    """One pydantic error as ``"field: message"``."""
+    field = ".".join(str(part) for part in error["loc"])
+    return f"{field}: {error['msg']}" if field else error["msg"]
@@ -3,8 +3,11 @@ from app.domains.crew_assignment.schemas import (
     AssignmentCreate,
     AssignmentRead,
     AssignmentDelete,
+    AssignmentValidationBatch,
     AssignmentValidationResult,
     ValidationError,
+    EligibilityMatrix,
+    EligibilityRequest,
 )
 from app.domains.crew_assignment.service import CrewAssignmentService
 from app.domains.crew_assignment.repository import CrewAssignmentRepository
@@ -14,8 +17,11 @@ __all__ = [
     "AssignmentCreate",
     "AssignmentRead",
     "AssignmentDelete",
+    "AssignmentValidationBatch",
     "AssignmentValidationResult",
     "ValidationError",
+    "EligibilityMatrix",
+    "EligibilityRequest",
     "CrewAssignmentService",
     "CrewAssignmentRepository",
 ]
@@ -0,0 +1,31 @@
+"""Rebuild the crew_duty_days ledger from the active assignments.
+
+    python -m app.domains.crew_assignment.duty_ledger [CREW_ID ...]
+
+Without crew ids every crew member is rebuilt, in one transaction. The
+application keeps the ledger current itself; this is for assignments or
+flights changed behind its back, by hand in psql or by a restore.
+"""
+import argparse
+from typing import Optional, Sequence
+
+# every model, so relationships resolve
+from app.domains.crew_management.models import CrewMember  # noqa: F401
+from app.domains.flights.models import Flight  # noqa: F401
+from app.database.engine import DBSessionMaker
+from app.domains.crew_assignment.repository import CrewAssignmentRepository
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Rebuild crew_duty_days from the active assignments.")
+    parser.add_argument("crew_ids", nargs="*", metavar="CREW_ID", help="rebuild only these crew members")
+    args = parser.parse_args(argv)
+
+    with DBSessionMaker() as db:
+        rows = CrewAssignmentRepository().rebuild_duty_days(db, args.crew_ids or None)
+        db.commit()
+    print(f"crew_duty_days rebuilt: {rows} day(s)")
+
+
+if __name__ == "__main__":
+    main()
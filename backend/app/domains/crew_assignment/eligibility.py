@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Optional, Sequence
+
+import numpy as np
+
+from app.domains.crew_assignment.timeline import MAX_DAILY_DUTY_HOURS, MIN_REST_HOURS
+
+
+# one bit per validation error code, so a whole matrix of results fits in an int array
+VIOLATION_BITS: dict[str, int] = {
+    "QUALIFICATION_MISMATCH": 1 << 0,
+    "NO_QUALIFICATIONS": 1 << 1,
+    "DUPLICATE_ASSIGNMENT": 1 << 2,
+    "INSUFFICIENT_REST": 1 << 3,
+    "DAILY_DUTY_EXCEEDED": 1 << 4,
+    "FLIGHT_OVERLAP": 1 << 5,
+}
+
+MIN_REST_SECONDS = MIN_REST_HOURS * 3600
+
+# crew index and time are packed into one int64 key (crew * span + value) so a
+# single sorted array serves every crew member and one searchsorted call
+# answers the lookup for every (flight, crew) cell at once
+_EPOCH_SPAN = 1 << 40
+_DAY_SPAN = 1 << 24
+
+
+def _epoch(moment: Optional[datetime]) -> Optional[int]:
+    if moment is None:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+
+def _previous_in_group(keys: np.ndarray, group_of: np.ndarray, queries: np.ndarray, groups: np.ndarray):
+    """Index of the last key strictly below each query that belongs to the query's group."""
+    if not len(keys):
+        return np.zeros(queries.shape, dtype=np.int64), np.zeros(queries.shape, dtype=bool)
+    idx = np.searchsorted(keys, queries, side="left") - 1
+    safe = np.clip(idx, 0, len(keys) - 1)
+    return safe, (idx >= 0) & (group_of[safe] == groups)
+
+
+def build_eligibility_matrix(
+    flights: Sequence,
+    crew: Sequence,
+    roster_rows: Iterable,
+    parse: Callable[[str], Optional[datetime]],
+) -> np.ndarray:
+    """Violation bitmask for every (flight, crew) pair.
+
+    ``flights`` and ``crew`` are ORM objects (or anything with the same
+    attributes); ``roster_rows`` are ``(crew_id, flight_id, departure,
+    arrival, duty_hrs)`` tuples of active assignments. The result has shape
+    ``(len(flights), len(crew))`` and a cell is eligible when it is zero. The
+    rules mirror ``CrewAssignmentService.validate_assignment``.
+    """
+    n_flights, n_crew = len(flights), len(crew)
+    violations = np.zeros((n_flights, n_crew), dtype=np.int32)
+    if not n_flights or not n_crew:
+        return violations
+
+    crew_index = {c.id: i for i, c in enumerate(crew)}
+    flight_index = {f.id: i for i, f in enumerate(flights)}
+    crew_col = np.arange(n_crew, dtype=np.int64)[None, :]
+
+    # qualifications: crew x aircraft type table, then gathered per flight
+    aircraft_types = {}
+    flight_type = np.array(
+        [aircraft_types.setdefault(f.aircraft.strip(), len(aircraft_types)) for f in flights],
+        dtype=np.int64,
+    )
+    qualified = np.zeros((n_crew, len(aircraft_types)), dtype=bool)
+    has_quals = np.zeros(n_crew, dtype=bool)
+    for i, member in enumerate(crew):
+        if not member.qualifications:
+            continue
+        has_quals[i] = True
+        for code in member.qualifications:
+            t = aircraft_types.get(code)
+            if t is not None:
+                qualified[i, t] = True
+
+    violations |= np.where(has_quals[None, :], 0, VIOLATION_BITS["NO_QUALIFICATIONS"]).astype(np.int32)
+    mismatch = has_quals[None, :] & ~qualified[:, flight_type].T
+    violations |= np.where(mismatch, VIOLATION_BITS["QUALIFICATION_MISMATCH"], 0).astype(np.int32)
+
+    # candidate flights
+    f_dep = np.zeros(n_flights, dtype=np.int64)
+    f_arr = np.zeros(n_flights, dtype=np.int64)
+    f_day = np.zeros(n_flights, dtype=np.int64)
+    f_has_dep = np.zeros(n_flights, dtype=bool)
+    f_has_arr = np.zeros(n_flights, dtype=bool)
+    f_duty = np.array([f.duty_hrs for f in flights], dtype=np.float64)
+    for i, f in enumerate(flights):
+        departure, arrival = parse(f.departure), parse(f.arrival)
+        if departure:
+            f_dep[i], f_day[i], f_has_dep[i] = _epoch(departure), departure.date().toordinal(), True
+        if arrival:
+            f_arr[i], f_has_arr[i] = _epoch(arrival), True
+    f_has_both = f_has_dep & f_has_arr
+
+    # existing rosters, flattened
+    duplicates: list[tuple[int, int]] = []
+    e_crew, e_dep, e_arr, e_day, e_duty, e_has_dep, e_has_arr = [], [], [], [], [], [], []
+    for crew_id, flight_id, departure, arrival, duty_hrs in roster_rows:
+        c = crew_index.get(crew_id)
+        if c is None:
+            continue
+        if flight_id in flight_index:
+            duplicates.append((flight_index[flight_id], c))
+        dep_at, arr_at = parse(departure), parse(arrival)
+        e_crew.append(c)
+        e_dep.append(_epoch(dep_at) or 0)
+        e_arr.append(_epoch(arr_at) or 0)
+        e_day.append(dep_at.date().toordinal() if dep_at else 0)
+        e_duty.append(duty_hrs)
+        e_has_dep.append(dep_at is not None)
+        e_has_arr.append(arr_at is not None)
+
+    e_crew = np.array(e_crew, dtype=np.int64)
+    e_dep = np.array(e_dep, dtype=np.int64)
+    e_arr = np.array(e_arr, dtype=np.int64)
+    e_day = np.array(e_day, dtype=np.int64)
+    e_duty = np.array(e_duty, dtype=np.float64)
+    e_has_dep = np.array(e_has_dep, dtype=bool)
+    e_has_arr = np.array(e_has_arr, dtype=bool)
+
+    # overlap: among a crew's flights departing before the new arrival, the
+    # latest arrival must not reach past the new departure
+    both = e_has_dep & e_has_arr
+    order = np.argsort(e_crew[both] * _EPOCH_SPAN + e_dep[both], kind="stable")
+    dep_keys = (e_crew[both] * _EPOCH_SPAN + e_dep[both])[order]
+    dep_crew = e_crew[both][order]
+    # keys of later crew members are always larger, so a global running max
+    # never leaks across crew boundaries
+    reach = np.maximum.accumulate((e_crew[both] * _EPOCH_SPAN + e_arr[both])[order])
+    idx, found = _previous_in_group(dep_keys, dep_crew, crew_col * _EPOCH_SPAN + f_arr[:, None], crew_col)
+    if found.any():
+        latest_arrival = reach[idx] - crew_col * _EPOCH_SPAN
+        overlap = found & (latest_arrival > f_dep[:, None]) & f_has_both[:, None]
+        violations |= np.where(overlap, VIOLATION_BITS["FLIGHT_OVERLAP"], 0).astype(np.int32)
+
+    # rest: the closest earlier arrival gives the shortest rest
+    arr_keys = np.sort(e_crew[e_has_arr] * _EPOCH_SPAN + e_arr[e_has_arr])
+    idx, found = _previous_in_group(arr_keys, arr_keys // _EPOCH_SPAN, crew_col * _EPOCH_SPAN + f_dep[:, None], crew_col)
+    if found.any():
+        rest = f_dep[:, None] - (arr_keys[idx] - crew_col * _EPOCH_SPAN)
+        short_rest = found & (rest < MIN_REST_SECONDS) & f_has_both[:, None]
+        violations |= np.where(short_rest, VIOLATION_BITS["INSUFFICIENT_REST"], 0).astype(np.int32)
+
+    # daily duty: per (crew, departure date) totals, looked up by exact key
+    day_keys, inverse = np.unique(e_crew[e_has_dep] * _DAY_SPAN + e_day[e_has_dep], return_inverse=True)
+    day_totals = np.bincount(inverse, weights=e_duty[e_has_dep], minlength=len(day_keys))
+    queries = crew_col * _DAY_SPAN + f_day[:, None]
+    existing = np.zeros((n_flights, n_crew), dtype=np.float64)
+    if len(day_keys):
+        pos = np.clip(np.searchsorted(day_keys, queries), 0, len(day_keys) - 1)
+        existing = np.where(day_keys[pos] == queries, day_totals[pos], 0.0)
+    exceeded = ((existing + f_duty[:, None]) > MAX_DAILY_DUTY_HOURS) & f_has_dep[:, None]
+    violations |= np.where(exceeded, VIOLATION_BITS["DAILY_DUTY_EXCEEDED"], 0).astype(np.int32)
+
+    # a duplicate short-circuits validation, only the qualification result survives
+    if duplicates:
+        rows, cols = np.array(duplicates).T
+        keep = VIOLATION_BITS["QUALIFICATION_MISMATCH"] | VIOLATION_BITS["NO_QUALIFICATIONS"]
+        violations[rows, cols] = (violations[rows, cols] & keep) | VIOLATION_BITS["DUPLICATE_ASSIGNMENT"]
+
+    return violations
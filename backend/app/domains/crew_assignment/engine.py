@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.domains.crew_assignment.partitioning import solve_partitioned
+from app.domains.crew_assignment.repository import CrewAssignmentRepository
+from app.domains.crew_assignment.roster import RosterFlight
+from app.domains.crew_assignment.schemas import (
+    AutoAssignmentFailure,
+    AutoAssignmentResult,
+    AutoAssignmentSuccess,
+)
+from app.domains.crew_assignment.strategies import (
+    DEFAULT_LOOKAHEAD,
+    STRATEGIES,
+    AssignmentStrategy,
+    plan_greedy,
+)
+from app.domains.crew_assignment.timeline import CONTEXT_MARGIN, CrewTimeline
+from app.domains.crew_management.repository import CrewRepository
+from app.domains.flights.models import Flight
+from app.domains.flights.times import as_utc
+
+
+@dataclass(frozen=True)
+class OpenFlight(RosterFlight):
+    """A flight the engine may staff, with the aircraft type it requires."""
+
+    aircraft: str
+
+
+@dataclass
+class CrewState:
+    """What the engine knows about one crew member while it plans."""
+
+    crew_id: str
+    qualifications: frozenset[str]
+    timeline: CrewTimeline = field(default_factory=CrewTimeline)
+    hours: float = 0.0
+
+
+class AutoAssignEngine:
+    """In-memory auto-assignment over a snapshot of crew, flights and rosters.
+
+    Everything is loaded up front with three queries. Per-crew timelines and
+    hours are updated as flights are assigned, and the planned rows are written
+    afterwards in one statement, so the database is not touched while planning.
+    """
+
+    def __init__(
+        self,
+        crew: list[CrewState],
+        flights: list[OpenFlight],
+        covered: set[str],
+    ) -> None:
+        self.crew = crew
+        self.flights = flights
+        self.covered = covered
+        self.planned: list[tuple[str, str]] = []
+        self._by_aircraft: dict[str, list[CrewState]] = {}
+
+    @classmethod
+    def load(
+        cls,
+        db: Session,
+        repo: CrewAssignmentRepository,
+        parse: Callable[[str], Optional[datetime]],
+        *,
+        departure_from: Optional[datetime] = None,
+        departure_to: Optional[datetime] = None,
+        aircraft: Optional[str] = None,
+    ) -> "AutoAssignEngine":
+        """Snapshot everything needed to staff the flights in a window.
+
+        Only flights departing in ``[departure_from, departure_to)`` (and of
+        ``aircraft``, when given) are planned. Rosters are kept for flights
+        within ``CONTEXT_MARGIN`` of the window, which is all the rest, overlap
+        and duty checks can see. Without bounds every flight is planned.
+        """
+        window = departure_from is not None or departure_to is not None
+        lower = as_utc(departure_from) - CONTEXT_MARGIN if departure_from else None
+        upper = as_utc(departure_to) + CONTEXT_MARGIN if departure_to else None
+
+        flight_stmt = select(Flight.id, Flight.aircraft, Flight.departure, Flight.arrival, Flight.duty_hrs)
+        if lower is not None:
+            flight_stmt = flight_stmt.where(Flight.arrival >= lower)
+        if upper is not None:
+            flight_stmt = flight_stmt.where(Flight.departure <= upper)
+        flight_rows = db.execute(flight_stmt).all()
+        roster_rows = repo.get_roster_rows_for_crews(db, start=lower, end=upper)
+
+        flights = []
+        parsed: dict[str, OpenFlight] = {}
+        for flight_id, flight_aircraft, departure, arrival, duty_hrs in flight_rows:
+            flight = OpenFlight(
+                flight_id=flight_id,
+                departure=departure,
+                arrival=arrival,
+                duty_hrs=duty_hrs,
+                departure_at=parse(departure),
+                arrival_at=parse(arrival),
+                aircraft=flight_aircraft.strip(),
+            )
+            parsed[flight_id] = flight
+            if aircraft and flight.aircraft != aircraft:
+                continue
+            if window and not _departs_within(flight, departure_from, departure_to):
+                continue
+            flights.append(flight)
+
+        # candidates per aircraft type in one query, crew qualified for none
+        # of the planned types cannot take any flight and are left out
+        candidates = CrewRepository().crew_ids_by_qualification(db, {f.aircraft for f in flights})
+        held: dict[str, set[str]] = {}
+        for aircraft_type, crew_ids in candidates.items():
+            for crew_id in crew_ids:
+                held.setdefault(crew_id, set()).add(aircraft_type)
+        states = {
+            crew_id: CrewState(crew_id=crew_id, qualifications=frozenset(types))
+            for crew_id, types in sorted(held.items())
+        }
+
+        covered = set()
+        for crew_id, flight_id, *_ in roster_rows:
+            if flight_id in parsed:
+                covered.add(flight_id)
+                if crew_id in states:
+                    states[crew_id].timeline.add(parsed[flight_id])
+
+        engine = cls(list(states.values()), flights, covered)
+        engine._by_aircraft = {
+            aircraft_type: [states[crew_id] for crew_id in crew_ids]
+            for aircraft_type, crew_ids in candidates.items()
+        }
+        return engine
+
+    def qualified_for(self, aircraft: str) -> list[CrewState]:
+        if aircraft not in self._by_aircraft:
+            self._by_aircraft[aircraft] = [c for c in self.crew if aircraft in c.qualifications]
+        return self._by_aircraft[aircraft]
+
+    def assign(self, flight: OpenFlight, crew: CrewState) -> None:
+        crew.timeline.add(flight)
+        crew.hours += flight.duty_hrs
+        self.covered.add(flight.flight_id)
+        self.planned.append((flight.flight_id, crew.crew_id))
+
+    def run(
+        self,
+        strategy: AssignmentStrategy = AssignmentStrategy.GREEDY,
+        *,
+        time_budget_s: Optional[float] = None,
+        lookahead: int = DEFAULT_LOOKAHEAD,
+        workers: int = 1,
+    ) -> AutoAssignmentResult:
+        """Staff every uncovered flight with ``strategy``.
+
+        When the time budget runs out, the flights the strategy has not
+        reached yet are handed to the greedy pass so the run always finishes.
+        With more than one worker the flights are split into independent
+        partitions that are planned in separate processes.
+        """
+        started = time.monotonic()
+        open_flights = [f for f in self.flights if f.flight_id not in self.covered]
+
+        if workers > 1:
+            budget_exhausted = solve_partitioned(
+                self,
+                open_flights,
+                strategy,
+                workers=workers,
+                time_budget_s=time_budget_s,
+                lookahead=lookahead,
+            )
+        else:
+            deadline = started + time_budget_s if time_budget_s else None
+            leftover, budget_exhausted = STRATEGIES[strategy](self, open_flights, deadline, lookahead)
+            if leftover:
+                plan_greedy(self, leftover, None, lookahead)
+
+        assigned = [
+            AutoAssignmentSuccess(flight_id=flight_id, crew_member_id=crew_id)
+            for flight_id, crew_id in self.planned
+        ]
+        failed = [
+            AutoAssignmentFailure(flight_id=f.flight_id, reason="No eligible crew")
+            for f in open_flights
+            if f.flight_id not in self.covered
+        ]
+
+        return AutoAssignmentResult(
+            assigned=assigned,
+            failed=failed,
+            total_flights=len(self.flights),
+            total_assigned=len(assigned),
+            total_failed=len(failed),
+            strategy=strategy.value,
+            coverage=len(assigned) / len(open_flights) if open_flights else 1.0,
+            objective=self.objective(),
+            budget_exhausted=budget_exhausted,
+            elapsed_s=time.monotonic() - started,
+        )
+
+    def objective(self) -> float:
+        """Sum of squared hours assigned in this run; lower means better balanced."""
+        return sum(c.hours * c.hours for c in self.crew)
+
+
+def _departs_within(flight: OpenFlight, start: Optional[datetime], end: Optional[datetime]) -> bool:
+    if flight.departure_at is None:
+        return False
+    departure = as_utc(flight.departure_at)
+    return (start is None or departure >= as_utc(start)) and (end is None or departure < as_utc(end))
@@ -1,7 +1,7 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional, TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, DateTime
+from sqlalchemy import Date, ForeignKey, DateTime, Index, Numeric, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.domains.models import AppBase
@@ -14,6 +14,11 @@ if TYPE_CHECKING:
 
 class CrewAssignment(AppBase):
     __tablename__ = "crew_assignments"
+    __table_args__ = (
+        # live rows only, every roster and schedule query filters removed_at IS NULL
+        Index("ix_crew_assignments_active_crew", "crew_employee_id", postgresql_where=text("removed_at IS NULL")),
+        Index("ix_crew_assignments_active_flight", "flight_id", postgresql_where=text("removed_at IS NULL")),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     flight_id: Mapped[str] = mapped_column(ForeignKey("flights.id", ondelete="CASCADE"))
@@ -22,8 +27,23 @@ class CrewAssignment(AppBase):
     removed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), default=None)
 
     # Relationships - using string references to avoid circular imports
-    flight: Mapped["Flight"] = relationship("Flight", back_populates="assignments")
-    crew_member: Mapped["CrewMember"] = relationship("CrewMember", back_populates="assignments")
+    flight: Mapped["Flight"] = relationship("Flight", back_populates="assignments", lazy="raise")
+    crew_member: Mapped["CrewMember"] = relationship("CrewMember", back_populates="assignments", lazy="raise")
 
     def __repr__(self) -> str:
         return f"<CrewAssignment(id={self.id}, flight_id={self.flight_id}, crew_employee_id={self.crew_employee_id})>"
+
+
+class CrewDutyDay(AppBase):
+    """Duty hours of one crew member's active assignments departing on one UTC date.
+
+    A ledger kept by CrewAssignmentRepository in the same transaction as every
+    assignment write, so the daily duty limit is a primary key lookup. Numeric
+    so that adding and taking off the same flights returns exactly to zero.
+    """
+
+    __tablename__ = "crew_duty_days"
+
+    crew_id: Mapped[str] = mapped_column(ForeignKey("crew_members.id", ondelete="CASCADE"), primary_key=True)
+    duty_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    total_hours: Mapped[float] = mapped_column(Numeric(8, 3, asdecimal=False))
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
+
+from app.domains.crew_assignment.strategies import (
+    MIN_REST,
+    STRATEGIES,
+    AssignmentStrategy,
+    plan_greedy,
+)
+
+if TYPE_CHECKING:
+    from app.domains.crew_assignment.engine import AutoAssignEngine, CrewState, OpenFlight
+
+
+# enough tasks per worker that one slow partition does not leave the pool idle
+TASKS_PER_WORKER = 4
+
+# below this many open flights, starting worker processes costs more than it saves
+PARALLEL_MIN_FLIGHTS = 2000
+
+
+@dataclass
+class Partition:
+    """Flights that can be planned without looking at any other partition.
+
+    ``crew`` holds copies of everyone qualified for the partition's aircraft
+    types, with timelines trimmed to the partition's time span, so it pickles
+    small enough to ship to a worker process.
+    """
+
+    flights: list[OpenFlight] = field(default_factory=list)
+    crew: list[CrewState] = field(default_factory=list)
+
+
+def _aircraft_components(engine: AutoAssignEngine) -> dict[str, str]:
+    """Aircraft type -> representative type of its qualification component.
+
+    Two types share a component when some crew member is rated on both, so
+    the crew pools of different components never intersect.
+    """
+    parent: dict[str, str] = {}
+
+    def find(aircraft: str) -> str:
+        parent.setdefault(aircraft, aircraft)
+        while parent[aircraft] != aircraft:
+            parent[aircraft] = parent[parent[aircraft]]
+            aircraft = parent[aircraft]
+        return aircraft
+
+    for crew in engine.crew:
+        types = iter(crew.qualifications)
+        first = next(types, None)
+        if first is None:
+            continue
+        root = find(first)
+        for aircraft in types:
+            parent[find(aircraft)] = root
+    return {aircraft: find(aircraft) for aircraft in parent}
+
+
+def _time_windows(flights: list[OpenFlight]) -> list[list[OpenFlight]]:
+    """Split departure-ordered flights where nothing can carry over.
+
+    A new window starts once the next departure is at least one minimum rest
+    after every earlier arrival and falls on a later date, so neither rest,
+    overlap nor daily duty can link flights on both sides of the cut.
+    """
+    windows: list[list[OpenFlight]] = []
+    reach: Optional[datetime] = None
+    last_day = None
+    for flight in flights:
+        if not windows or (flight.departure_at - reach >= MIN_REST and flight.departure_at.date() > last_day):
+            windows.append([])
+        windows[-1].append(flight)
+        ends = flight.arrival_at or flight.departure_at
+        reach = ends if reach is None else max(reach, ends)
+        last_day = flight.departure_at.date()
+    return windows
+
+
+def partition(
+    engine: AutoAssignEngine,
+    flights: list[OpenFlight],
+    tasks: int,
+) -> tuple[list[Partition], list[OpenFlight]]:
+    """Group ``flights`` into about ``tasks`` independent partitions.
+
+    Flights are split by qualification component and then by time window;
+    consecutive windows of one component are packed together until they
+    reach an even share of the flights. Flights without a departure time or
+    without any qualified crew are returned separately for the serial pass.
+    """
+    from app.domains.crew_assignment.engine import CrewState
+
+    component = _aircraft_components(engine)
+    by_component: dict[str, list[OpenFlight]] = {}
+    serial: list[OpenFlight] = []
+    for flight in flights:
+        root = component.get(flight.aircraft)
+        if root is None or not flight.departure_at:
+            serial.append(flight)
+        else:
+            by_component.setdefault(root, []).append(flight)
+
+    share = max(1, -(-(len(flights) - len(serial)) // max(tasks, 1)))
+    position = {f.flight_id: i for i, f in enumerate(flights)}
+    partitions: list[Partition] = []
+    for root, members in by_component.items():
+        pool = [c for c in engine.crew if any(component.get(q) == root for q in c.qualifications)]
+
+        packed: list[list[OpenFlight]] = []
+        for window in _time_windows(sorted(members, key=lambda f: f.departure_at)):
+            if packed and len(packed[-1]) < share:
+                packed[-1].extend(window)
+            else:
+                packed.append(list(window))
+
+        for chunk in packed:
+            start = chunk[0].departure_at
+            end = max(f.arrival_at or f.departure_at for f in chunk)
+            partitions.append(
+                Partition(
+                    # strategies see the partition in the order they would have seen it serially
+                    flights=sorted(chunk, key=lambda f: position[f.flight_id]),
+                    crew=[
+                        CrewState(
+                            crew_id=c.crew_id,
+                            qualifications=c.qualifications,
+                            timeline=c.timeline.between(start, end),
+                            hours=c.hours,
+                        )
+                        for c in pool
+                    ],
+                )
+            )
+    return partitions, serial
+
+
+def solve_partition(
+    part: Partition,
+    strategy: AssignmentStrategy,
+    deadline: Optional[float],
+    lookahead: int,
+) -> tuple[list[tuple[str, str]], bool]:
+    """Plan one partition in a worker process.
+
+    ``deadline`` is wall-clock (``time.time()``) because monotonic clocks are
+    not comparable across processes.
+    """
+    from app.domains.crew_assignment.engine import AutoAssignEngine
+
+    local_deadline = None
+    if deadline is not None:
+        local_deadline = time.monotonic() + max(deadline - time.time(), 0.0)
+
+    engine = AutoAssignEngine(part.crew, part.flights, set())
+    leftover, exhausted = STRATEGIES[strategy](engine, part.flights, local_deadline, lookahead)
+    if leftover:
+        plan_greedy(engine, leftover, None, lookahead)
+    return engine.planned, exhausted
+
+
+def solve_partitioned(
+    engine: AutoAssignEngine,
+    flights: list[OpenFlight],
+    strategy: AssignmentStrategy,
+    *,
+    workers: int,
+    time_budget_s: Optional[float],
+    lookahead: int,
+) -> bool:
+    """Plan ``flights`` on ``engine`` with partitions solved in a process pool.
+
+    Every partition's plan is replayed onto the engine's own timelines before
+    it is accepted. A crew member can appear in several time partitions, so a
+    plan that no longer fits after an earlier partition was merged is dropped
+    and its flight goes to the final greedy pass together with the flights
+    that could not be partitioned. Crew hours start from the engine's values
+    in every partition, so load balancing is per partition rather than across
+    the whole run. Returns whether any partition ran out of time budget.
+    """
+    deadline = time.time() + time_budget_s if time_budget_s else None
+    partitions, _ = partition(engine, flights, workers * TASKS_PER_WORKER)
+
+    if len(partitions) > 1 and len(flights) >= PARALLEL_MIN_FLIGHTS:
+        # spawn rather than fork: the API process runs threads and holds pooled connections
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=min(workers, len(partitions)), mp_context=context) as pool:
+            results = list(
+                pool.map(
+                    solve_partition,
+                    partitions,
+                    [strategy] * len(partitions),
+                    [deadline] * len(partitions),
+                    [lookahead] * len(partitions),
+                )
+            )
+    else:
+        results = [solve_partition(part, strategy, deadline, lookahead) for part in partitions]
+
+    by_id = {f.flight_id: f for f in flights}
+    crew_by_id = {c.crew_id: c for c in engine.crew}
+    for planned, _ in results:
+        for flight_id, crew_id in planned:
+            flight, crew = by_id[flight_id], crew_by_id[crew_id]
+            if crew.timeline.accepts(flight):
+                engine.assign(flight, crew)
+
+    # conflicts, unpartitioned flights and anything a partition could not staff
+    plan_greedy(engine, [f for f in flights if f.flight_id not in engine.covered], None, lookahead)
+    return any(exhausted for _, exhausted in results)
@@ -1,11 +1,57 @@
-from datetime import datetime
-from typing import Optional, Sequence
+from datetime import date, datetime
+from typing import Iterable, Optional, Sequence
 from datetime import timedelta
 
-from sqlalchemy import select, and_
+from sqlalchemy import Row, Select, select, and_, delete, text, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
 from sqlalchemy.orm import Session
 
-from app.domains.crew_assignment.models import CrewAssignment
+from app.domains.export import EXPORT_BATCH_SIZE
+from app.domains.crew_assignment.models import CrewAssignment, CrewDutyDay
+from app.domains.crew_management.models import CrewMember
+from app.domains.flights.models import Flight
+from app.domains.flights.schedule_cache import SCHEDULE_CACHE
+
+
+# AssignmentRead's fields as plain columns, for lists and exports that skip the ORM
+_READ_COLUMNS = (
+    CrewAssignment.id,
+    CrewAssignment.flight_id,
+    CrewAssignment.crew_employee_id,
+    CrewAssignment.created_at,
+    CrewAssignment.removed_at,
+)
+
+# adds sign * duty of each (flight_id, crew_id) pair to its crew's departure date
+_ADD_DUTY_SQL = text("""
+    INSERT INTO crew_duty_days (crew_id, duty_date, total_hours)
+    SELECT p.crew_id, (f.departure AT TIME ZONE 'UTC')::date, sum(f."Duty_hrs"::numeric) * :sign
+    FROM unnest(CAST(:flight_ids AS varchar[]), CAST(:crew_ids AS varchar[])) AS p (flight_id, crew_id)
+    JOIN flights AS f ON f.id = p.flight_id
+    GROUP BY 1, 2
+    ON CONFLICT (crew_id, duty_date) DO UPDATE
+    SET total_hours = crew_duty_days.total_hours + EXCLUDED.total_hours
+""")
+
+# one statement whatever the plan size: two array parameters, not three per row,
+# which would pass libpq's 65535-parameter limit at about 21k pairs
+_BULK_CREATE_SQL = text("""
+    INSERT INTO crew_assignments (flight_id, crew_employee_id, created_at)
+    SELECT p.flight_id, p.crew_id, :now
+    FROM unnest(CAST(:flight_ids AS varchar[]), CAST(:crew_ids AS varchar[])) AS p (flight_id, crew_id)
+    ON CONFLICT ON CONSTRAINT uq_flight_crew DO UPDATE
+    SET removed_at = NULL, created_at = EXCLUDED.created_at
+    WHERE crew_assignments.removed_at IS NOT NULL
+    RETURNING flight_id, crew_employee_id
+""")
+
+_REBUILD_DUTY_SQL = """
+    INSERT INTO crew_duty_days (crew_id, duty_date, total_hours)
+    SELECT a.crew_employee_id, (f.departure AT TIME ZONE 'UTC')::date, sum(f."Duty_hrs"::numeric)
+    FROM crew_assignments AS a JOIN flights AS f ON f.id = a.flight_id
+    WHERE a.removed_at IS NULL {crew_filter}
+    GROUP BY 1, 2
+"""
 
 
 class CrewAssignmentRepository:
@@ -38,9 +84,12 @@ class CrewAssignmentRepository:
         return db.execute(stmt).scalar_one_or_none()
 
     def reactivate(self, db: Session, assignment: CrewAssignment) -> CrewAssignment:
+        if assignment.removed_at is not None:
+            self._roster_changed(db, [(assignment.flight_id, assignment.crew_employee_id)])
         assignment.removed_at = None
         db.commit()
         db.refresh(assignment)
+        SCHEDULE_CACHE.invalidate([assignment.crew_employee_id])
         return assignment
 
     def get_by_flight(self, db: Session, flight_id: str) -> Sequence[CrewAssignment]:
@@ -63,6 +112,66 @@ class CrewAssignmentRepository:
         )
         return list(db.execute(stmt).scalars().all())
 
+    def get_roster_rows(
+        self,
+        db: Session,
+        crew_employee_id: str,
+        *,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ):
+        # active assignments joined to their flights in a single round trip
+        stmt = (
+            select(Flight.id, Flight.departure, Flight.arrival, Flight.duty_hrs)
+            .join(CrewAssignment, Flight.id == CrewAssignment.flight_id)
+            .where(
+                and_(
+                    CrewAssignment.crew_employee_id == crew_employee_id,
+                    CrewAssignment.removed_at.is_(None),
+                )
+            )
+            # timelines are built in departure order
+            .order_by(Flight.departure)
+        )
+        return db.execute(self._touching(stmt, start, end)).all()
+
+    def get_roster_rows_for_crews(
+        self,
+        db: Session,
+        crew_employee_ids: Optional[list[str]] = None,
+        *,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ):
+        # every active assignment when no crew ids are given
+        if crew_employee_ids is not None and not crew_employee_ids:
+            return []
+        stmt = (
+            select(
+                CrewAssignment.crew_employee_id,
+                Flight.id,
+                Flight.departure,
+                Flight.arrival,
+                Flight.duty_hrs,
+            )
+            .join(CrewAssignment, Flight.id == CrewAssignment.flight_id)
+            .where(CrewAssignment.removed_at.is_(None))
+            # grouped per crew member in this order, timelines are built in departure order
+            .order_by(Flight.departure)
+        )
+        if crew_employee_ids is not None:
+            stmt = stmt.where(CrewAssignment.crew_employee_id.in_(crew_employee_ids))
+        return db.execute(self._touching(stmt, start, end)).all()
+
+    def _touching(self, stmt, start: Optional[datetime], end: Optional[datetime]):
+        # flights whose block time reaches into [start, end], served by the
+        # departure/arrival indexes
+        if start is not None:
+            stmt = stmt.where(Flight.arrival >= start)
+        if end is not None:
+            stmt = stmt.where(Flight.departure <= end)
+        return stmt
+
     def create(
         self,
         db: Session,
@@ -84,16 +193,100 @@ class CrewAssignmentRepository:
             created_at=datetime.utcnow(),
         )
         db.add(assignment)
+        self._roster_changed(db, [(flight_id, crew_employee_id)])
         db.commit()
         db.refresh(assignment)
+        SCHEDULE_CACHE.invalidate([crew_employee_id])
         return assignment
 
+    def bulk_create(self, db: Session, pairs: list[tuple[str, str]]) -> None:
+        """Insert (flight_id, crew_employee_id) pairs in one statement and commit once.
+
+        A soft-deleted row for the same pair is reactivated instead of
+        violating the unique constraint; an active one is left as it is.
+        """
+        if pairs:
+            activated = db.execute(_BULK_CREATE_SQL, {
+                "flight_ids": [flight_id for flight_id, _ in pairs],
+                "crew_ids": [crew_employee_id for _, crew_employee_id in pairs],
+                "now": datetime.utcnow(),
+            })
+            # only rows that became active change duty and schedules
+            self._roster_changed(db, [tuple(row) for row in activated])
+        db.commit()
+        SCHEDULE_CACHE.invalidate({crew_employee_id for _, crew_employee_id in pairs})
+
     def soft_delete(self, db: Session, assignment: CrewAssignment) -> CrewAssignment:
+        if assignment.removed_at is None:
+            self._roster_changed(db, [(assignment.flight_id, assignment.crew_employee_id)], sign=-1)
         assignment.removed_at = datetime.utcnow()
         db.commit()
         db.refresh(assignment)
+        SCHEDULE_CACHE.invalidate([assignment.crew_employee_id])
         return assignment
 
+    def _roster_changed(self, db: Session, pairs: Sequence[tuple[str, str]], *, sign: int = 1) -> None:
+        # (flight_id, crew_employee_id) pairs that became active (sign=1) or inactive (-1)
+        self.add_duty(db, pairs, sign=sign)
+        self.touch_schedules(db, {crew_employee_id for _, crew_employee_id in pairs})
+
+    def touch_schedules(self, db: Session, crew_ids: Iterable[str]) -> None:
+        """Bump the schedule_version, the schedule ETag, of ``crew_ids``, without committing."""
+        # sorted, so concurrent writers lock the crew rows in the same order
+        crew_ids = sorted(crew_ids)
+        if crew_ids:
+            db.execute(
+                update(CrewMember)
+                .where(CrewMember.id.in_(crew_ids))
+                .values(schedule_version=CrewMember.schedule_version + 1)
+                .execution_options(synchronize_session=False)
+            )
+
+    def add_duty(self, db: Session, pairs: Sequence[tuple[str, str]], *, sign: int = 1) -> None:
+        """Add (``sign=-1``: take off) the duty of (flight_id, crew_employee_id) pairs
+        to crew_duty_days, without committing. Days that drop to zero are removed.
+        """
+        if not pairs:
+            return
+        flight_ids, crew_ids = (list(column) for column in zip(*pairs))
+        db.execute(_ADD_DUTY_SQL, {"flight_ids": flight_ids, "crew_ids": crew_ids, "sign": sign})
+        if sign < 0:
+            db.execute(
+                delete(CrewDutyDay).where(CrewDutyDay.crew_id.in_(set(crew_ids)), CrewDutyDay.total_hours <= 0)
+            )
+
+    def rebuild_duty_days(self, db: Session, crew_ids: Optional[Iterable[str]] = None) -> int:
+        """Recompute crew_duty_days from the active assignments, for ``crew_ids`` or everyone.
+
+        Not committed; returns the number of (crew, day) rows written.
+        """
+        if crew_ids is None:
+            db.execute(delete(CrewDutyDay))
+            return db.execute(text(_REBUILD_DUTY_SQL.format(crew_filter=""))).rowcount
+        crew_ids = list(crew_ids)
+        if not crew_ids:
+            return 0
+        db.execute(delete(CrewDutyDay).where(CrewDutyDay.crew_id.in_(crew_ids)))
+        stmt = text(_REBUILD_DUTY_SQL.format(crew_filter="AND a.crew_employee_id = ANY(:crew_ids)"))
+        return db.execute(stmt, {"crew_ids": crew_ids}).rowcount
+
+    def get_duty_hours(self, db: Session, crew_employee_id: str, day: date) -> float:
+        """Duty hours already on ``day``, by primary key."""
+        stmt = select(CrewDutyDay.total_hours).where(
+            CrewDutyDay.crew_id == crew_employee_id, CrewDutyDay.duty_date == day
+        )
+        return db.execute(stmt).scalar_one_or_none() or 0.0
+
+    def get_duty_hours_for(self, db: Session, keys: Iterable[tuple[str, date]]) -> dict[tuple[str, date], float]:
+        """Duty hours of every (crew_employee_id, day) in ``keys`` that has any, in one query."""
+        keys = list(set(keys))
+        if not keys:
+            return {}
+        stmt = select(CrewDutyDay.crew_id, CrewDutyDay.duty_date, CrewDutyDay.total_hours).where(
+            tuple_(CrewDutyDay.crew_id, CrewDutyDay.duty_date).in_(keys)
+        )
+        return {(crew_id, day): hours for crew_id, day, hours in db.execute(stmt)}
+
     def list(
         self,
         db: Session,
@@ -101,22 +294,19 @@ class CrewAssignmentRepository:
         flight_id: Optional[str] = None,
         crew_employee_id: Optional[str] = None,
         include_removed: bool = False,
+        after: Optional[int] = None,
         limit: int = 100,
         offset: int = 0,
-    ) -> Sequence[CrewAssignment]:
-        stmt = select(CrewAssignment)
-
-        if flight_id:
-            stmt = stmt.where(CrewAssignment.flight_id == flight_id)
-
-        if crew_employee_id:
-            stmt = stmt.where(CrewAssignment.crew_employee_id == crew_employee_id)
-
-        if not include_removed:
-            stmt = stmt.where(CrewAssignment.removed_at.is_(None))
-
-        stmt = stmt.offset(offset).limit(limit)
-        return list(db.execute(stmt).scalars().all())
+    ) -> Sequence[Row]:
+        stmt = _list_stmt(
+            flight_id=flight_id,
+            crew_employee_id=crew_employee_id,
+            include_removed=include_removed,
+            after=after,
+            limit=limit,
+            offset=offset,
+        )
+        return list(db.execute(stmt).all())
 
     def get_active_assignments_for_crew_on_date(
         self, db: Session, crew_employee_id: str, date: datetime
@@ -146,3 +336,61 @@ class CrewAssignmentRepository:
             )
         )
         return list(db.execute(stmt).scalars().all())
+
+
+class AsyncCrewAssignmentRepository:
+    """Read queries of CrewAssignmentRepository on an AsyncSession."""
+
+    async def list(
+        self,
+        db: AsyncSession,
+        *,
+        flight_id: Optional[str] = None,
+        crew_employee_id: Optional[str] = None,
+        include_removed: bool = False,
+        after: Optional[int] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> Sequence[Row]:
+        stmt = _list_stmt(
+            flight_id=flight_id,
+            crew_employee_id=crew_employee_id,
+            include_removed=include_removed,
+            after=after,
+            limit=limit,
+            offset=offset,
+        )
+        return list((await db.execute(stmt)).all())
+
+    async def export(self, db: AsyncSession, *, include_removed: bool = False) -> AsyncResult:
+        stmt = select(*_READ_COLUMNS).order_by(CrewAssignment.id)
+        if not include_removed:
+            stmt = stmt.where(CrewAssignment.removed_at.is_(None))
+        return await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+
+
+def _list_stmt(
+    *,
+    flight_id: Optional[str],
+    crew_employee_id: Optional[str],
+    include_removed: bool,
+    after: Optional[int],
+    limit: int,
+    offset: int,
+) -> Select:
+    stmt = select(*_READ_COLUMNS)
+
+    if flight_id:
+        stmt = stmt.where(CrewAssignment.flight_id == flight_id)
+
+    if crew_employee_id:
+        stmt = stmt.where(CrewAssignment.crew_employee_id == crew_employee_id)
+
+    if not include_removed:
+        stmt = stmt.where(CrewAssignment.removed_at.is_(None))
+
+    # keyset: continue after the last id of the previous page
+    if after is not None:
+        stmt = stmt.where(CrewAssignment.id > after)
+
+    return stmt.order_by(CrewAssignment.id).offset(offset).limit(limit)
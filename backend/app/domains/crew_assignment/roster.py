@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Optional
+
+from app.domains.crew_assignment.timeline import CrewTimeline
+
+
+@dataclass(frozen=True)
+class RosterFlight:
+    """A flight on a crew member's active roster with its times parsed once."""
+
+    flight_id: str
+    departure: str
+    arrival: str
+    duty_hrs: float
+    departure_at: Optional[datetime]
+    arrival_at: Optional[datetime]
+
+
+@dataclass
+class CrewRoster:
+    """Active assignments of one crew member, shared by all constraint checks."""
+
+    crew_employee_id: str
+    flights: list[RosterFlight] = field(default_factory=list)
+    timeline: CrewTimeline = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.timeline = CrewTimeline(self.flights)
+
+    @classmethod
+    def from_rows(
+        cls,
+        crew_employee_id: str,
+        rows,
+        parse: Callable[[str], Optional[datetime]],
+    ) -> "CrewRoster":
+        # rows are (flight_id, departure, arrival, duty_hrs) tuples
+        flights = [
+            RosterFlight(
+                flight_id=flight_id,
+                departure=departure,
+                arrival=arrival,
+                duty_hrs=duty_hrs,
+                departure_at=parse(departure),
+                arrival_at=parse(arrival),
+            )
+            for flight_id, departure, arrival, duty_hrs in rows
+        ]
+        return cls(crew_employee_id=crew_employee_id, flights=flights)
+
+    def has_flight(self, flight_id: str) -> bool:
+        return self.timeline.has_flight(flight_id)
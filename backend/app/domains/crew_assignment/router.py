@@ -1,17 +1,29 @@
+from datetime import datetime
+
 from fastapi import APIRouter, Depends, Query, status, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database.engine import get_db_session
+from app.database.engine import get_db_session, get_read_db_session
+from app.domains.export import ExportFormat, export_response
+from app.domains.pagination import NEXT_CURSOR_HEADER, set_next_cursor
+from app.domains.responses import RowListRenderer
 from app.domains.crew_assignment.schemas import (
     AssignmentCreate,
     AssignmentRead,
+    AssignmentValidationBatch,
     AssignmentValidationResult,
     AutoAssignmentResult,
+    EligibilityMatrix,
+    EligibilityRequest,
 )
-from app.domains.crew_assignment.service import CrewAssignmentService
+from app.domains.crew_assignment.service import AsyncCrewAssignmentService, CrewAssignmentService
+from app.domains.crew_assignment.strategies import DEFAULT_LOOKAHEAD, AssignmentStrategy
 
 router = APIRouter(prefix="/assignments", tags=["Crew Assignments"])
 service = CrewAssignmentService()
+read_service = AsyncCrewAssignmentService()
+assignment_rows = RowListRenderer(AssignmentRead)
 
 
 @router.post("", response_model=AssignmentRead, status_code=status.HTTP_201_CREATED)
@@ -37,24 +49,41 @@ def create_assignment(
 
 
 @router.get("", response_model=list[AssignmentRead])
-def list_assignments(
+async def list_assignments(
     flight_id: str | None = Query(default=None),
     crew_employee_id: str | None = Query(default=None),
     include_removed: bool = Query(default=False),
+    after: str | None = Query(
+        default=None, description=f"cursor from the {NEXT_CURSOR_HEADER} header of the previous page"
+    ),
     limit: int = Query(default=100, ge=1, le=500),
     offset: int = Query(default=0, ge=0),
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
 ):
 
-    assignments = service.list_assignments(
+    assignments = await read_service.list_assignments(
         db,
         flight_id=flight_id,
         crew_employee_id=crew_employee_id,
         include_removed=include_removed,
+        after=after,
         limit=limit,
         offset=offset,
     )
-    return [AssignmentRead.model_validate(a) for a in assignments]
+    # rows are AssignmentRead's columns, rendered without a model per row
+    page = assignment_rows.render(assignments)
+    set_next_cursor(page, "assignments", assignments, limit)
+    return page
+
+
+@router.get("/export")
+async def export_assignments(
+    format: ExportFormat = Query(default=ExportFormat.NDJSON),
+    include_removed: bool = Query(default=False),
+    db: AsyncSession = Depends(get_read_db_session),
+):
+    result = await read_service.export_assignments(db, include_removed=include_removed)
+    return export_response(result, "assignments", format)
 
 
 @router.delete("/{assignment_id}", response_model=AssignmentRead)
@@ -76,8 +105,48 @@ def validate_assignment(
     return service.validate_assignment(db, payload.flight_id, payload.crew_employee_id)
 
 
+@router.post("/validate/batch", response_model=list[AssignmentValidationResult])
+def validate_assignments_batch(
+    payload: AssignmentValidationBatch,
+    db: Session = Depends(get_db_session),
+):
+
+    return service.validate_assignments_batch(db, payload.pairs)
+
+
+@router.post("/eligibility", response_model=EligibilityMatrix)
+def get_eligibility_matrix(
+    payload: EligibilityRequest,
+    db: Session = Depends(get_db_session),
+):
+
+    return service.eligibility_matrix(
+        db,
+        flight_ids=payload.flight_ids,
+        crew_ids=payload.crew_ids,
+    )
+
+
 @router.post("/auto", response_model=AutoAssignmentResult)
 def auto_assign_flights(
+    strategy: AssignmentStrategy = Query(default=AssignmentStrategy.GREEDY),
+    time_budget_s: float | None = Query(default=None, gt=0, description="wall-clock budget, greedy finishes the rest"),
+    lookahead: int = Query(default=DEFAULT_LOOKAHEAD, ge=0, le=100, description="flights the sweep looks ahead"),
+    workers: int = Query(default=1, ge=1, le=64, description="processes for partitioned planning, 1 plans serially"),
+    departure_from: datetime | None = Query(default=None, alias="from", description="plan flights departing at or after"),
+    departure_to: datetime | None = Query(default=None, alias="to", description="plan flights departing before"),
+    aircraft: str | None = Query(default=None, description="only plan flights of this aircraft type"),
+    dry_run: bool = Query(default=False, description="return the plan without saving it"),
     db: Session = Depends(get_db_session),
 ):
-    return service.auto_assign(db)
+    return service.auto_assign(
+        db,
+        strategy=strategy,
+        time_budget_s=time_budget_s,
+        lookahead=lookahead,
+        workers=workers,
+        departure_from=departure_from,
+        departure_to=departure_to,
+        aircraft=aircraft,
+        dry_run=dry_run,
+    )
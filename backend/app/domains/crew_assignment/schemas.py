@@ -9,6 +9,11 @@ class AssignmentCreate(BaseModel):
     crew_employee_id: str = Field(min_length=1, max_length=15)
 
 
+class AssignmentValidationBatch(BaseModel):
+
+    pairs: list[AssignmentCreate] = Field(min_length=1, max_length=5000)
+
+
 class AssignmentRead(BaseModel):
 
     id: int
@@ -61,3 +66,28 @@ class AutoAssignmentResult(BaseModel):
     total_flights: int
     total_assigned: int
     total_failed: int
+    strategy: str = "greedy"
+    # share of the flights that were uncovered before the run
+    coverage: float = 0.0
+    # sum of squared crew hours assigned in this run, lower is better balanced
+    objective: float = 0.0
+    budget_exhausted: bool = False
+    elapsed_s: float = 0.0
+    # the plan was returned without writing any assignment
+    dry_run: bool = False
+
+
+class EligibilityRequest(BaseModel):
+
+    flight_ids: Optional[list[str]] = Field(default=None, description="all flights when omitted")
+    crew_ids: Optional[list[str]] = Field(default=None, description="all crew when omitted")
+
+
+class EligibilityMatrix(BaseModel):
+
+    flight_ids: list[str]
+    crew_ids: list[str]
+    violation_bits: dict[str, int]
+    # eligible[i][j] / violations[i][j] refer to flight_ids[i] and crew_ids[j]
+    eligible: list[list[bool]]
+    violations: list[list[int]]
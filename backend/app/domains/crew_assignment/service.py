@@ -1,24 +1,36 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import date, datetime, timedelta
+from typing import Iterable, Optional
 
-from sqlalchemy import select, and_
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
+from app.domains.pagination import decode_cursor
 from app.domains.crew_assignment.models import CrewAssignment
-from app.domains.crew_assignment.repository import CrewAssignmentRepository
+from app.domains.crew_assignment.repository import AsyncCrewAssignmentRepository, CrewAssignmentRepository
+from app.domains.crew_assignment.engine import AutoAssignEngine
+from app.domains.crew_assignment.eligibility import VIOLATION_BITS, build_eligibility_matrix
+from app.domains.crew_assignment.roster import CrewRoster
+from app.domains.crew_assignment.strategies import DEFAULT_LOOKAHEAD, AssignmentStrategy
+from app.domains.crew_assignment.timeline import (
+    CONTEXT_MARGIN,
+    MAX_DAILY_DUTY_HOURS,
+    MIN_REST_HOURS,
+    CrewTimeline,
+)
 from app.domains.crew_assignment.schemas import (
     AssignmentCreate,
     AssignmentValidationResult,
     ValidationError,
     AutoAssignmentResult,
-    AutoAssignmentSuccess,
-    AutoAssignmentFailure,
+    EligibilityMatrix,
 )
 from app.domains.flights.models import Flight
-from app.domains.crew_management.models import CrewMember
+from app.domains.flights.times import as_utc, parse_flight_time
+from app.domains.crew_management.models import CrewMember, with_qualifications
 
 
 class CrewAssignmentService:
@@ -29,14 +41,91 @@ class CrewAssignmentService:
     def validate_assignment(
         self, db: Session, flight_id: str, crew_employee_id: str
     ) -> AssignmentValidationResult:
+
+        crew = db.execute(
+            select(CrewMember).where(CrewMember.id == crew_employee_id).options(with_qualifications())
+        ).scalar_one_or_none()
+
+        flight = None
+        if crew:
+            flight = db.execute(
+                select(Flight).where(Flight.id == flight_id)
+            ).scalar_one_or_none()
+
+        # one range query for the part of the roster any check can see, and
+        # the day's duty total from the ledger
+        roster = None
+        duty_hours = 0.0
+        if crew and flight:
+            start, end = self._context_window([flight])
+            roster = self.load_roster(db, crew_employee_id, start=start, end=end)
+            day = _duty_date(flight)
+            if day:
+                duty_hours = self.repo.get_duty_hours(db, crew_employee_id, day)
+
+        return self._evaluate(flight_id, crew_employee_id, crew, flight, roster, duty_hours)
+
+    def validate_assignments_batch(
+        self, db: Session, pairs: list[AssignmentCreate]
+    ) -> list[AssignmentValidationResult]:
+        """Validate many (flight, crew) pairs against the current rosters.
+
+        Crew, flights and rosters for every referenced id are loaded with one
+        query each. Pairs are validated independently of each other, exactly
+        as repeated calls to ``validate_assignment`` would.
+        """
+        crew_ids = {p.crew_employee_id for p in pairs}
+        flight_ids = {p.flight_id for p in pairs}
+
+        crew_by_id = {
+            c.id: c
+            for c in db.execute(
+                select(CrewMember).where(CrewMember.id.in_(crew_ids)).options(with_qualifications())
+            ).scalars()
+        }
+        flights_by_id = {
+            f.id: f
+            for f in db.execute(
+                select(Flight).where(Flight.id.in_(flight_ids))
+            ).scalars()
+        }
+        start, end = self._context_window(flights_by_id.values())
+        rosters = self.load_rosters(db, list(crew_by_id), start=start, end=end)
+        # (crew, duty date) of every pair whose crew and flight exist, totals in one query
+        duty_days = [
+            (p.crew_employee_id, _duty_date(flights_by_id[p.flight_id]))
+            if p.crew_employee_id in crew_by_id and p.flight_id in flights_by_id
+            else None
+            for p in pairs
+        ]
+        duty_hours = self.repo.get_duty_hours_for(db, [key for key in duty_days if key and key[1]])
+
+        return [
+            self._evaluate(
+                p.flight_id,
+                p.crew_employee_id,
+                crew_by_id.get(p.crew_employee_id),
+                flights_by_id.get(p.flight_id),
+                rosters.get(p.crew_employee_id),
+                duty_hours.get(key, 0.0),
+            )
+            for p, key in zip(pairs, duty_days)
+        ]
+
+    def _evaluate(
+        self,
+        flight_id: str,
+        crew_employee_id: str,
+        crew: Optional[CrewMember],
+        flight: Optional[Flight],
+        roster: Optional[CrewRoster],
+        duty_hours: float,
+    ) -> AssignmentValidationResult:
         
         errors: list[ValidationError] = []
         warnings: list[str] = []
 
         # crew check
-        crew = db.execute(
-            select(CrewMember).where(CrewMember.id == crew_employee_id)
-        ).scalar_one_or_none()
         if not crew:
             errors.append(
                 ValidationError(
@@ -47,9 +136,6 @@ class CrewAssignmentService:
             return AssignmentValidationResult(valid=False, errors=errors)
 
         # flight existssss
-        flight = db.execute(
-            select(Flight).where(Flight.id == flight_id)
-        ).scalar_one_or_none()
         if not flight:
             errors.append(
                 ValidationError(
@@ -60,31 +146,12 @@ class CrewAssignmentService:
             return AssignmentValidationResult(valid=False, errors=errors)
 
         # aircraft check
-        if crew.qualifications:
-            quals = [q.strip() for q in crew.qualifications.split(",")]
-            aircraft_type = flight.aircraft.strip()
-            
-            has_qualification = aircraft_type in quals
-            
-            if not has_qualification:
-                errors.append(
-                    ValidationError(
-                        code="QUALIFICATION_MISMATCH",
-                        message=f"Crew member does not hold required qualification for {flight.aircraft}. "
-                                f"Required: {flight.aircraft}, Has: {crew.qualifications}",
-                    )
-                )
-        else:
-            errors.append(
-                ValidationError(
-                    code="NO_QUALIFICATIONS",
-                    message=f"Crew member has no qualifications recorded",
-                )
-            )
+        qualification_violation = self._check_qualification(crew, flight)
+        if qualification_violation:
+            errors.append(qualification_violation)
 
         # deduplication
-        existing = self.repo.get_by_flight_and_crew(db, flight_id, crew_employee_id)
-        if existing:
+        if roster.has_flight(flight_id):
             errors.append(
                 ValidationError(
                     code="DUPLICATE_ASSIGNMENT",
@@ -94,17 +161,17 @@ class CrewAssignmentService:
             return AssignmentValidationResult(valid=False, errors=errors)
 
         # rest check
-        rest_violation = self._check_rest_period(db, crew_employee_id, flight)
+        rest_violation = self._check_rest_period(roster.timeline, flight)
         if rest_violation:
             errors.append(rest_violation)
 
         # limit on work check
-        duty_limit_violation = self._check_daily_duty_limit(db, crew_employee_id, flight)
+        duty_limit_violation = self._check_daily_duty_limit(duty_hours, flight)
         if duty_limit_violation:
             errors.append(duty_limit_violation)
 
         # overlap check
-        overlap_violation = self._check_no_overlap(db, crew_employee_id, flight)
+        overlap_violation = self._check_no_overlap(roster.timeline, flight)
         if overlap_violation:
             errors.append(overlap_violation)
 
@@ -114,72 +181,105 @@ class CrewAssignmentService:
             warnings=warnings,
         )
 
+    def load_roster(
+        self,
+        db: Session,
+        crew_employee_id: str,
+        *,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> CrewRoster:
+        rows = self.repo.get_roster_rows(db, crew_employee_id, start=start, end=end)
+        return CrewRoster.from_rows(crew_employee_id, rows, parse_flight_time)
+
+    def load_rosters(
+        self,
+        db: Session,
+        crew_employee_ids: list[str],
+        *,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> dict[str, CrewRoster]:
+        rows_by_crew: dict[str, list] = {crew_id: [] for crew_id in crew_employee_ids}
+        rows = self.repo.get_roster_rows_for_crews(db, crew_employee_ids, start=start, end=end)
+        for crew_id, *flight_row in rows:
+            rows_by_crew[crew_id].append(flight_row)
+        return {
+            crew_id: CrewRoster.from_rows(crew_id, rows, parse_flight_time)
+            for crew_id, rows in rows_by_crew.items()
+        }
+
+    def _context_window(
+        self, flights: Iterable[Flight]
+    ) -> tuple[Optional[datetime], Optional[datetime]]:
+        # roster flights outside this range cannot affect any of ``flights``
+        flights = list(flights)
+        if not flights:
+            return None, None
+        return (
+            min(f.departure for f in flights) - CONTEXT_MARGIN,
+            max(f.arrival for f in flights) + CONTEXT_MARGIN,
+        )
+
+    def _check_qualification(
+        self, crew: CrewMember, flight: Flight
+    ) -> Optional[ValidationError]:
+
+        if not crew.qualifications:
+            return ValidationError(
+                code="NO_QUALIFICATIONS",
+                message=f"Crew member has no qualifications recorded",
+            )
+
+        aircraft_type = flight.aircraft.strip()
+
+        if aircraft_type not in crew.qualifications:
+            return ValidationError(
+                code="QUALIFICATION_MISMATCH",
+                message=f"Crew member does not hold required qualification for {flight.aircraft}. "
+                        f"Required: {flight.aircraft}, Has: {', '.join(crew.qualifications)}",
+            )
+
+        return None
+
     def _check_rest_period(
-        self, db: Session, crew_employee_id: str, new_flight: Flight
+        self, timeline: CrewTimeline, new_flight: Flight
     ) -> Optional[ValidationError]:
         
-        new_departure = self._parse_flight_time(new_flight.departure)
+        new_departure = parse_flight_time(new_flight.departure)
         if not new_departure:
             return None
 
-        new_arrival = self._parse_flight_time(new_flight.arrival)
+        new_arrival = parse_flight_time(new_flight.arrival)
         if not new_arrival:
             return None
 
-        assignments = self.repo.get_by_crew_member(db, crew_employee_id)
-        
-        for assignment in assignments:
-            flight = db.execute(
-                select(Flight).where(Flight.id == assignment.flight_id)
-            ).scalar_one_or_none()
-            
-            if flight:
-                last_arrival = self._parse_flight_time(flight.arrival)
-                if last_arrival and new_departure:
-                    if last_arrival < new_departure:
-                        rest_hours = (new_departure - last_arrival).total_seconds() / 3600
-                        if rest_hours < 10:
-                            return ValidationError(
-                                code="INSUFFICIENT_REST",
-                                message=f"Rest period of {rest_hours:.1f} hours is less than required 10 hours. "
-                                        f"Last flight arrived at {flight.arrival}, new flight departs at {new_flight.departure}",
-                            )
+        # the closest earlier arrival gives the shortest rest, nothing else can fail
+        flight = timeline.latest_arrival_before(new_departure)
+        if flight:
+            rest_hours = (new_departure - flight.arrival_at).total_seconds() / 3600
+            if rest_hours < MIN_REST_HOURS:
+                return ValidationError(
+                    code="INSUFFICIENT_REST",
+                    message=f"Rest period of {rest_hours:.1f} hours is less than required 10 hours. "
+                            f"Last flight arrived at {flight.arrival}, new flight departs at {new_flight.departure}",
+                )
 
         return None
 
     # check for date of selected flight if duty_hrs for total flights in that date is more than 8
     def _check_daily_duty_limit(
-        self, db: Session, crew_employee_id: str, new_flight: Flight
+        self, duty_hours: float, new_flight: Flight
     ) -> Optional[ValidationError]:
         
-        new_departure = self._parse_flight_time(new_flight.departure)
-        if not new_departure:
+        flight_date = _duty_date(new_flight)
+        if not flight_date:
             return None
 
-        flight_date = new_departure.date()
-
-        all_assignments = self.repo.get_by_crew_member(db, crew_employee_id)
-        
-        existing_assignments = []
-        for assignment in all_assignments:
-            flight = db.execute(
-                select(Flight).where(Flight.id == assignment.flight_id)
-            ).scalar_one_or_none()
-            if flight:
-                dep = self._parse_flight_time(flight.departure)
-                if dep and dep.date() == flight_date:
-                    existing_assignments.append(assignment)
-
-        # get total
-        total_hours = new_flight.duty_hrs
-        for assignment in existing_assignments:
-            flight = db.execute(
-                select(Flight).where(Flight.id == assignment.flight_id)
-            ).scalar_one_or_none()
-            if flight:
-                total_hours += flight.duty_hrs
+        # get total, duty_hours is what crew_duty_days holds for that date
+        total_hours = new_flight.duty_hrs + duty_hours
 
-        if total_hours > 8:
+        if total_hours > MAX_DAILY_DUTY_HOURS:
             return ValidationError(
                 code="DAILY_DUTY_EXCEEDED",
                 message=f"Adding this flight would exceed the 8-hour daily duty limit. "
@@ -189,54 +289,26 @@ class CrewAssignmentService:
         return None
 
     def _check_no_overlap(
-        self, db: Session, crew_employee_id: str, new_flight: Flight
+        self, timeline: CrewTimeline, new_flight: Flight
     ) -> Optional[ValidationError]:
 
-        new_departure = self._parse_flight_time(new_flight.departure)
-        new_arrival = self._parse_flight_time(new_flight.arrival)
+        new_departure = parse_flight_time(new_flight.departure)
+        new_arrival = parse_flight_time(new_flight.arrival)
         
         if not new_departure or not new_arrival:
             return None
 
-        assignments = self.repo.get_by_crew_member(db, crew_employee_id)
-
-        for assignment in assignments:
-            flight = db.execute(
-                select(Flight).where(Flight.id == assignment.flight_id)
-            ).scalar_one_or_none()
-            
-            if flight:
-                existing_departure = self._parse_flight_time(flight.departure)
-                existing_arrival = self._parse_flight_time(flight.arrival)
-                
-                if existing_departure and existing_arrival:
-                    
-                    if (new_departure < existing_arrival and new_arrival > existing_departure):
-                        return ValidationError(
-                            code="FLIGHT_OVERLAP",
-                            message=f"Crew member is already assigned to flight {flight.id} "
-                                    f"({flight.departure} - {flight.arrival}) which overlaps with "
-                                    f"the new flight ({new_flight.departure} - {new_flight.arrival})",
-                        )
+        flight = timeline.find_overlap(new_departure, new_arrival)
+        if flight:
+            return ValidationError(
+                code="FLIGHT_OVERLAP",
+                message=f"Crew member is already assigned to flight {flight.flight_id} "
+                        f"({flight.departure} - {flight.arrival}) which overlaps with "
+                        f"the new flight ({new_flight.departure} - {new_flight.arrival})",
+            )
 
         return None
 
-    def _parse_flight_time(self, time_str: str) -> Optional[datetime]:
-        
-        if not time_str:
-            return None
-            
-        try:
-            return datetime.fromisoformat(time_str.replace('Z', '+00:00'))
-        except ValueError:
-            pass
-        
-        try:
-            current_year = datetime.now().year
-            return datetime.strptime(f"{current_year}, {time_str}", "%Y, %b %d, %H:%M")
-        except ValueError:
-            return None
-
     def create_assignment(
         self, db: Session, payload: AssignmentCreate
     ) -> tuple[Optional[CrewAssignment], AssignmentValidationResult]:
@@ -301,6 +373,7 @@ class CrewAssignmentService:
         flight_id: Optional[str] = None,
         crew_employee_id: Optional[str] = None,
         include_removed: bool = False,
+        after: str | None = None,
         limit: int = 100,
         offset: int = 0,
     ) -> list[CrewAssignment]:
@@ -310,6 +383,7 @@ class CrewAssignmentService:
             flight_id=flight_id,
             crew_employee_id=crew_employee_id,
             include_removed=include_removed,
+            after=decode_cursor(after, "assignments", int, offset=offset),
             limit=limit,
             offset=offset,
         )
@@ -325,58 +399,107 @@ class CrewAssignmentService:
             )
         return assignment
 
-    def auto_assign(self, db: Session) -> AutoAssignmentResult:
-        all_crew = db.execute(select(CrewMember)).scalars().all()
-        all_flights = db.execute(select(Flight)).scalars().all()
-        
-        assigned_flights = set()
-        crew_hours = {c.id: 0.0 for c in all_crew}
-        
-        assigned = []
-        failed = []
-        
-        for flight in all_flights:
-            existing = db.execute(
-                select(CrewAssignment).where(
-                    and_(
-                        CrewAssignment.flight_id == flight.id,
-                        CrewAssignment.removed_at.is_(None)
-                    )
-                )
-            ).scalar_one_or_none()
-            if existing:
-                assigned_flights.add(flight.id)
-                continue
-            
-            eligible = []
-            for crew in all_crew:
-                validation = self.validate_assignment(db, flight.id, crew.id)
-                if validation.valid:
-                    eligible.append((crew.id, crew_hours[crew.id]))
-            
-            if not eligible:
-                failed.append(AutoAssignmentFailure(flight_id=flight.id, reason="No eligible crew"))
-                continue
-            
-            eligible.sort(key=lambda x: x[1])
-            best_crew = eligible[0][0]
-            
-            assignment = CrewAssignment(
-                flight_id=flight.id,
-                crew_employee_id=best_crew,
-                created_at=datetime.utcnow(),
+    def eligibility_matrix(
+        self,
+        db: Session,
+        *,
+        flight_ids: Optional[list[str]] = None,
+        crew_ids: Optional[list[str]] = None,
+    ) -> EligibilityMatrix:
+
+        flight_stmt = select(Flight)
+        if flight_ids is not None:
+            flight_stmt = flight_stmt.where(Flight.id.in_(flight_ids))
+        crew_stmt = select(CrewMember).options(with_qualifications())
+        if crew_ids is not None:
+            crew_stmt = crew_stmt.where(CrewMember.id.in_(crew_ids))
+
+        flights = db.execute(flight_stmt.order_by(Flight.id)).scalars().all()
+        crew = db.execute(crew_stmt.order_by(CrewMember.id)).scalars().all()
+        start, end = self._context_window(flights)
+        roster_rows = self.repo.get_roster_rows_for_crews(db, [c.id for c in crew], start=start, end=end)
+
+        violations = build_eligibility_matrix(flights, crew, roster_rows, parse_flight_time)
+
+        return EligibilityMatrix(
+            flight_ids=[f.id for f in flights],
+            crew_ids=[c.id for c in crew],
+            violation_bits=VIOLATION_BITS,
+            eligible=(violations == 0).tolist(),
+            violations=violations.tolist(),
+        )
+
+    def auto_assign(
+        self,
+        db: Session,
+        *,
+        strategy: AssignmentStrategy = AssignmentStrategy.GREEDY,
+        time_budget_s: Optional[float] = None,
+        lookahead: int = DEFAULT_LOOKAHEAD,
+        workers: int = 1,
+        departure_from: Optional[datetime] = None,
+        departure_to: Optional[datetime] = None,
+        aircraft: Optional[str] = None,
+        dry_run: bool = False,
+    ) -> AutoAssignmentResult:
+        # naive bounds are UTC, so a naive one can be compared with an aware one
+        departure_from = as_utc(departure_from) if departure_from else None
+        departure_to = as_utc(departure_to) if departure_to else None
+        if departure_from and departure_to and departure_from >= departure_to:
+            from fastapi import HTTPException, status
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="'from' must be before 'to'",
             )
-            db.add(assignment)
-            db.commit()
-            
-            crew_hours[best_crew] += flight.duty_hrs
-            assigned_flights.add(flight.id)
-            assigned.append(AutoAssignmentSuccess(flight_id=flight.id, crew_member_id=best_crew))
-        
-        return AutoAssignmentResult(
-            assigned=assigned,
-            failed=failed,
-            total_flights=len(all_flights),
-            total_assigned=len(assigned),
-            total_failed=len(failed),
+
+        engine = AutoAssignEngine.load(
+            db,
+            self.repo,
+            parse_flight_time,
+            departure_from=departure_from,
+            departure_to=departure_to,
+            aircraft=aircraft,
         )
+        result = engine.run(strategy, time_budget_s=time_budget_s, lookahead=lookahead, workers=workers)
+        if dry_run:
+            result.dry_run = True
+        else:
+            self.repo.bulk_create(db, engine.planned)
+        return result
+
+
+class AsyncCrewAssignmentService:
+    """Read paths of CrewAssignmentService for ``async def`` handlers."""
+
+    def __init__(self) -> None:
+        self.repo = AsyncCrewAssignmentRepository()
+
+    async def list_assignments(
+        self,
+        db: AsyncSession,
+        *,
+        flight_id: Optional[str] = None,
+        crew_employee_id: Optional[str] = None,
+        include_removed: bool = False,
+        after: str | None = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> list[CrewAssignment]:
+        return await self.repo.list(
+            db,
+            flight_id=flight_id,
+            crew_employee_id=crew_employee_id,
+            include_removed=include_removed,
+            after=decode_cursor(after, "assignments", int, offset=offset),
+            limit=limit,
+            offset=offset,
+        )
+
+    async def export_assignments(self, db: AsyncSession, *, include_removed: bool = False) -> AsyncResult:
+        return await self.repo.export(db, include_removed=include_removed)
+
+
+def _duty_date(flight: Flight) -> Optional[date]:
+    # duty is totalled per UTC departure date, as in crew_duty_days
+    departure = parse_flight_time(flight.departure)
+    return departure.date() if departure else None
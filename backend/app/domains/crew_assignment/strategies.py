@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+from enum import Enum
+from typing import TYPE_CHECKING, Callable, Optional
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+from app.domains.crew_assignment.timeline import MAX_DAILY_DUTY_HOURS, MIN_REST_HOURS
+
+if TYPE_CHECKING:
+    from app.domains.crew_assignment.engine import AutoAssignEngine, CrewState, OpenFlight
+
+
+class AssignmentStrategy(str, Enum):
+    GREEDY = "greedy"
+    MATCHING = "matching"
+    SWEEP = "sweep"
+
+
+DEFAULT_LOOKAHEAD = 8
+
+MIN_REST = timedelta(hours=MIN_REST_HOURS)
+
+# flights departing within one minimum rest period of each other can never
+# share a crew member, so one crew member per flight in a window of that
+# length loses nothing inside the window
+MATCHING_WINDOW = MIN_REST
+MATCHING_STEP = timedelta(hours=2)
+
+# how many of the least-loaded eligible crew the sweep compares per flight
+SWEEP_WIDTH = 8
+
+
+def _expired(deadline: Optional[float]) -> bool:
+    return deadline is not None and time.monotonic() > deadline
+
+
+def _chronological(flights: list[OpenFlight]) -> tuple[list[OpenFlight], list[OpenFlight]]:
+    timed = sorted((f for f in flights if f.departure_at), key=lambda f: f.departure_at)
+    untimed = [f for f in flights if not f.departure_at]
+    return timed, untimed
+
+
+def plan_greedy(
+    engine: AutoAssignEngine,
+    flights: list[OpenFlight],
+    deadline: Optional[float],
+    lookahead: int,
+) -> tuple[list[OpenFlight], bool]:
+    """Table order, least hours first. Never stops early, it is the fallback
+    every other strategy hands its remaining flights to.
+
+    Each strategy returns the flights it did not get to and whether it ran
+    out of time budget.
+    """
+    for flight in flights:
+        # sorted() is stable, so ties keep crew order like the old per-flight sort
+        candidates = sorted(engine.qualified_for(flight.aircraft), key=lambda c: c.hours)
+        best = next((c for c in candidates if c.timeline.accepts(flight)), None)
+        if best:
+            engine.assign(flight, best)
+    return [], False
+
+
+def plan_matching(
+    engine: AutoAssignEngine,
+    flights: list[OpenFlight],
+    deadline: Optional[float],
+    lookahead: int,
+) -> tuple[list[OpenFlight], bool]:
+    """Min-cost bipartite matching of flights to crew over a rolling horizon.
+
+    Each step matches every flight departing within one ``MATCHING_WINDOW``
+    but only commits the ones in the first ``MATCHING_STEP``, so early
+    choices see the competition from the flights right behind them. Every
+    eligible edge gets a large bonus so the solver maximises coverage first;
+    among maximum matchings it prefers flights that free their crew early,
+    then crew with fewer hours.
+    """
+    timed, untimed = _chronological(flights)
+    # crew_id -> flight_id -> accepts(), dropped whenever the crew member is assigned
+    eligibility: dict[str, dict[str, bool]] = {}
+
+    def accepts(crew: CrewState, flight: OpenFlight) -> bool:
+        known = eligibility.setdefault(crew.crew_id, {})
+        if flight.flight_id not in known:
+            known[flight.flight_id] = crew.timeline.accepts(flight)
+        return known[flight.flight_id]
+
+    start = 0
+    while start < len(timed):
+        if _expired(deadline):
+            return timed[start:] + untimed, True
+
+        window_start = timed[start].departure_at
+        window = _window(timed, start, window_start + MATCHING_WINDOW)
+        start += len(_window(window, 0, window_start + MATCHING_STEP))
+        batch = [f for f in window if f.flight_id not in engine.covered]
+
+        crew: list[CrewState] = []
+        seen: set[str] = set()
+        for flight in batch:
+            for c in engine.qualified_for(flight.aircraft):
+                if c.crew_id not in seen:
+                    seen.add(c.crew_id)
+                    crew.append(c)
+        if not crew:
+            continue
+
+        column = {c.crew_id: j for j, c in enumerate(crew)}
+        eligible = np.zeros((len(batch), len(crew)), dtype=bool)
+        for i, flight in enumerate(batch):
+            for c in engine.qualified_for(flight.aircraft):
+                if accepts(c, flight):
+                    eligible[i, column[c.crew_id]] = True
+
+        hours = np.array([c.hours for c in crew])
+        frees_at = np.array([
+            (f.arrival_at - window_start).total_seconds() / 3600 if f.arrival_at else 0.0
+            for f in batch
+        ])
+        weight = frees_at[:, None] * (hours.max() + 1.0) + hours[None, :]
+        bonus = (len(batch) + 1) * (weight.max() + 1.0)
+        cost = np.where(eligible, weight - bonus, 0.0)
+
+        rows, cols = linear_sum_assignment(cost)
+        for i, j in zip(rows, cols):
+            if eligible[i, j] and batch[i].departure_at < window_start + MATCHING_STEP:
+                engine.assign(batch[i], crew[j])
+                eligibility.pop(crew[j].crew_id, None)
+
+    return untimed, False
+
+
+def _window(flights: list[OpenFlight], start: int, until) -> list[OpenFlight]:
+    """Flights from ``start`` on, in departure order, that depart before ``until``."""
+    end = start
+    while end < len(flights) and flights[end].departure_at < until:
+        end += 1
+    return flights[start:end]
+
+
+def plan_sweep(
+    engine: AutoAssignEngine,
+    flights: list[OpenFlight],
+    deadline: Optional[float],
+    lookahead: int,
+) -> tuple[list[OpenFlight], bool]:
+    """Chronological sweep that looks ``lookahead`` flights ahead.
+
+    Among the least-loaded eligible crew it picks the one whose assignment
+    blocks the fewest upcoming flights, weighting each blocked flight by how
+    few crew are qualified for its aircraft at all.
+    """
+    timed, untimed = _chronological(flights)
+    supply = _supply(engine, flights)
+
+    for index, flight in enumerate(timed):
+        if _expired(deadline):
+            return timed[index:] + untimed, True
+
+        candidates = sorted(engine.qualified_for(flight.aircraft), key=lambda c: c.hours)
+        shortlist = []
+        for c in candidates:
+            if c.timeline.accepts(flight):
+                shortlist.append(c)
+                if len(shortlist) == SWEEP_WIDTH:
+                    break
+        if not shortlist:
+            continue
+
+        upcoming = [
+            g
+            for g in timed[index + 1 : index + 1 + lookahead]
+            if g.flight_id not in engine.covered and _blocked_by(flight, g)
+        ]
+
+        def damage(c: CrewState) -> float:
+            return sum(
+                1.0 / supply[g.aircraft]
+                for g in upcoming
+                if g.aircraft in c.qualifications
+                and _would_block(c, flight, g)
+                and c.timeline.accepts(g)
+            )
+
+        # min() keeps the first of equal scores, i.e. the least-loaded crew member
+        engine.assign(flight, min(shortlist, key=lambda c: (damage(c), c.hours)))
+
+    return untimed, False
+
+
+def _supply(engine: AutoAssignEngine, flights: list[OpenFlight]) -> dict[str, int]:
+    """Number of crew qualified for each aircraft type in ``flights``."""
+    return {aircraft: len(engine.qualified_for(aircraft)) for aircraft in {f.aircraft for f in flights}}
+
+
+def _blocked_by(flight: OpenFlight, later: OpenFlight) -> bool:
+    """Whether taking ``flight`` can make anybody ineligible for ``later``."""
+    if not flight.arrival_at or not later.departure_at:
+        return False
+    return (
+        later.departure_at - flight.arrival_at < MIN_REST
+        or later.departure_at.date() == flight.departure_at.date()
+    )
+
+
+def _would_block(crew: CrewState, flight: OpenFlight, later: OpenFlight) -> bool:
+    """Whether giving ``flight`` to ``crew`` makes them ineligible for ``later``."""
+    if later.departure_at - flight.arrival_at < MIN_REST:
+        return True
+    total = crew.timeline.duty_hours_on(flight.departure_at.date()) + flight.duty_hrs + later.duty_hrs
+    return total > MAX_DAILY_DUTY_HOURS
+
+
+STRATEGIES: dict[AssignmentStrategy, Callable[..., tuple[list[OpenFlight], bool]]] = {
+    AssignmentStrategy.GREEDY: plan_greedy,
+    AssignmentStrategy.MATCHING: plan_matching,
+    AssignmentStrategy.SWEEP: plan_sweep,
+}
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Iterable, Optional
+
+if TYPE_CHECKING:
+    from app.domains.crew_assignment.roster import RosterFlight
+
+
+MIN_REST_HOURS = 10
+MAX_DAILY_DUTY_HOURS = 8
+
+# rest looks back MIN_REST_HOURS and duty is totalled per departure date, so
+# flights more than a day away from a window can never affect it
+CONTEXT_MARGIN = timedelta(days=1)
+
+# sort key for flights whose departure could not be parsed
+_NO_TIME = datetime.min.replace(tzinfo=timezone.utc)
+
+
+class CrewTimeline:
+    """Sorted index over one crew member's flights.
+
+    Flights are kept ordered by departure and by arrival so that overlap and
+    rest lookups only bisect to the neighbouring flights instead of scanning
+    the whole roster. Daily duty totals are kept per departure date.
+    """
+
+    def __init__(self, flights: Iterable[RosterFlight] = ()) -> None:
+        self._flights: list[RosterFlight] = []
+        self._flight_ids: set[str] = set()
+        self._duty_by_date: dict[date, float] = {}
+
+        # ordered by departure, with a running maximum of arrival so a single
+        # bisect answers "does anything departing before X end after Y"
+        self._departures: list[datetime] = []
+        self._by_departure: list[RosterFlight] = []
+        self._reach: list[tuple[datetime, int]] = []
+
+        # ordered by arrival for the rest period lookup
+        self._arrivals: list[datetime] = []
+        self._by_arrival: list[RosterFlight] = []
+
+        # in departure order every add lands at the end, so the reach list
+        # grows by one entry instead of being rebuilt from the insert point
+        for flight in sorted(flights, key=lambda f: f.departure_at or _NO_TIME):
+            self.add(flight)
+
+    def __len__(self) -> int:
+        return len(self._flight_ids)
+
+    def has_flight(self, flight_id: str) -> bool:
+        return flight_id in self._flight_ids
+
+    def add(self, flight: RosterFlight) -> None:
+        self._flights.append(flight)
+        self._flight_ids.add(flight.flight_id)
+
+        if flight.departure_at:
+            day = flight.departure_at.date()
+            self._duty_by_date[day] = self._duty_by_date.get(day, 0.0) + flight.duty_hrs
+
+        if flight.arrival_at:
+            i = bisect_left(self._arrivals, flight.arrival_at)
+            self._arrivals.insert(i, flight.arrival_at)
+            self._by_arrival.insert(i, flight)
+
+        if flight.departure_at and flight.arrival_at:
+            # after equal departures, so ordered input is only ever appended
+            i = bisect_right(self._departures, flight.departure_at)
+            self._departures.insert(i, flight.departure_at)
+            self._by_departure.insert(i, flight)
+            self._rebuild_reach(i)
+
+    def _rebuild_reach(self, start: int) -> None:
+        del self._reach[start:]
+        for i in range(start, len(self._by_departure)):
+            arrival = self._by_departure[i].arrival_at
+            if i and self._reach[i - 1][0] >= arrival:
+                self._reach.append(self._reach[i - 1])
+            else:
+                self._reach.append((arrival, i))
+
+    def between(self, start: datetime, end: datetime) -> "CrewTimeline":
+        """A smaller timeline holding only what can affect flights inside ``[start, end]``.
+
+        Anything arriving more than ``CONTEXT_MARGIN`` before ``start`` or
+        departing more than that after ``end`` is outside every rest, overlap
+        and duty-date window.
+        """
+        kept = []
+        for f in self._flights:
+            ends, begins = f.arrival_at or f.departure_at, f.departure_at or f.arrival_at
+            if ends and ends >= start - CONTEXT_MARGIN and begins <= end + CONTEXT_MARGIN:
+                kept.append(f)
+        return CrewTimeline(kept)
+
+    def latest_arrival_before(self, moment: datetime) -> Optional[RosterFlight]:
+        """Flight with the latest arrival strictly before ``moment``."""
+        i = bisect_left(self._arrivals, moment)
+        if i == 0:
+            return None
+        return self._by_arrival[i - 1]
+
+    def find_overlap(self, departure: datetime, arrival: datetime) -> Optional[RosterFlight]:
+        """A flight whose block time intersects ``[departure, arrival)``, if any."""
+        i = bisect_left(self._departures, arrival)
+        if i == 0:
+            return None
+        latest_arrival, index = self._reach[i - 1]
+        if latest_arrival > departure:
+            return self._by_departure[index]
+        return None
+
+    def duty_hours_on(self, day: date) -> float:
+        return self._duty_by_date.get(day, 0.0)
+
+    def accepts(self, flight: RosterFlight) -> bool:
+        """Whether ``flight`` passes the duplicate, rest, duty and overlap rules."""
+        if flight.flight_id in self._flight_ids:
+            return False
+
+        departure, arrival = flight.departure_at, flight.arrival_at
+        if departure and arrival:
+            previous = self.latest_arrival_before(departure)
+            if previous and (departure - previous.arrival_at).total_seconds() / 3600 < MIN_REST_HOURS:
+                return False
+            if self.find_overlap(departure, arrival):
+                return False
+
+        if departure and flight.duty_hrs + self.duty_hours_on(departure.date()) > MAX_DAILY_DUTY_HOURS:
+            return False
+
+        return True
@@ -1,21 +1,61 @@
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import ForeignKey, Index, String
+from sqlalchemy.ext.associationproxy import AssociationProxy, association_proxy
+from sqlalchemy.orm import Mapped, mapped_column, relationship, selectinload
 
 from app.domains.models import AppBase
 
 
+class CrewQualification(AppBase):
+    __tablename__ = "crew_qualifications"
+    __table_args__ = (
+        # the primary key serves per-crew lookups, this one serves "who flies A320"
+        Index("ix_crew_qualifications_aircraft_type", "aircraft_type", "crew_id"),
+    )
+
+    crew_id: Mapped[str] = mapped_column(ForeignKey("crew_members.id", ondelete="CASCADE"), primary_key=True)
+    aircraft_type: Mapped[str] = mapped_column(String(20), primary_key=True)
+
+
 class CrewMember(AppBase):
     __tablename__ = "crew_members"
 
     id: Mapped[str] = mapped_column(primary_key=True)
     name: Mapped[str]
     email: Mapped[str]
-    qualifications: Mapped[str | None]
     base: Mapped[str | None]
+    # bumped by every update of the row or its qualifications, the ETag of GET /crew/{id}
+    version: Mapped[int] = mapped_column(default=1, server_default="1")
+    # bumped when the schedule changes: assignments of this crew member, updates to their flights
+    schedule_version: Mapped[int] = mapped_column(default=1, server_default="1")
+
+    # relationships are lazy="raise": queries say what they load, see with_qualifications()
+    qualification_rows: Mapped[list[CrewQualification]] = relationship(
+        cascade="all, delete-orphan",
+        lazy="raise",
+        passive_deletes=True,
+        order_by=CrewQualification.aircraft_type,
+    )
+    # aircraft type codes as a plain list of strings
+    qualifications: AssociationProxy[list[str]] = association_proxy(
+        "qualification_rows",
+        "aircraft_type",
+        creator=lambda aircraft_type: CrewQualification(aircraft_type=aircraft_type),
+    )
 
     # Relationship to CrewAssignment
     assignments = relationship(
         "CrewAssignment",
         back_populates="crew_member",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="raise",
+        passive_deletes=True,
     )
+
+
+def with_qualifications():
+    """Loader option for every query whose crew members are read past their columns.
+
+    A function so that importing this module does not configure the mappers
+    before CrewAssignment exists.
+    """
+    return selectinload(CrewMember.qualification_rows)
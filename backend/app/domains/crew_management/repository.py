@@ -1,23 +1,124 @@
-from typing import Optional, Sequence
+from typing import Iterable, Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import Row, Select, String, delete, func, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
 from sqlalchemy.orm import Session
 
-from app.domains.crew_management.models import CrewMember
+from app.domains.export import EXPORT_BATCH_SIZE
+from app.domains.crew_management.models import CrewMember, CrewQualification, with_qualifications
+
+
+# a crew member's codes in order, empty for none; correlated explicitly since
+# the qualified_for filter joins crew_qualifications into the outer query
+_QUALIFICATIONS = func.array(
+    select(CrewQualification.aircraft_type)
+    .where(CrewQualification.crew_id == CrewMember.id)
+    .order_by(CrewQualification.aircraft_type)
+    .correlate(CrewMember)
+    .scalar_subquery(),
+    type_=ARRAY(String),
+).label("qualifications")
+
+# CrewRead's fields as plain columns, for lists and exports that skip the ORM
+_READ_COLUMNS = (
+    CrewMember.id,
+    CrewMember.name,
+    CrewMember.email,
+    CrewMember.base.label("base_airport"),
+    _QUALIFICATIONS,
+)
 
 
 class CrewRepository:
     def get_by_id(self, db: Session, crew_id: int) -> Optional[CrewMember]:
-        stmt = select(CrewMember).where(CrewMember.id == crew_id)
+        stmt = select(CrewMember).where(CrewMember.id == crew_id).options(with_qualifications())
         return db.execute(stmt).scalar_one_or_none()
 
     def get_by_email(self, db: Session, email: str) -> Optional[CrewMember]:
         stmt = select(CrewMember).where(CrewMember.email == email)
         return db.execute(stmt).scalar_one_or_none()
 
-    def get_by_qualification(self, db: Session, code: str) -> Optional[CrewMember]:
-        stmt = select(CrewMember).where(code.in_(CrewMember.qualifications))
-        return db.execute(stmt).scalar_one_or_none()
+    def get_by_qualification(self, db: Session, code: str) -> Sequence[CrewMember]:
+        stmt = _qualified(select(CrewMember), code).order_by(CrewMember.id).options(with_qualifications())
+        return list(db.execute(stmt).scalars().all())
+
+    def crew_ids_by_qualification(self, db: Session, codes: Iterable[str]) -> dict[str, list[str]]:
+        """Aircraft type -> ids of the crew qualified for it, in one query."""
+        by_type: dict[str, list[str]] = {code: [] for code in codes}
+        if not by_type:
+            return by_type
+        stmt = (
+            select(CrewQualification.aircraft_type, CrewQualification.crew_id)
+            .where(CrewQualification.aircraft_type.in_(by_type))
+            .order_by(CrewQualification.aircraft_type, CrewQualification.crew_id)
+        )
+        for code, crew_id in db.execute(stmt):
+            by_type[code].append(crew_id)
+        return by_type
+
+    def snapshot(self, db: Session, ids: Sequence[str]) -> dict[str, tuple]:
+        """Id -> ``(name, email, base, frozenset of qualifications)`` for the existing ``ids``."""
+        held: dict[str, set[str]] = {}
+        stmt = select(CrewQualification.crew_id, CrewQualification.aircraft_type).where(
+            CrewQualification.crew_id.in_(ids)
+        )
+        for crew_id, code in db.execute(stmt):
+            held.setdefault(crew_id, set()).add(code)
+        stmt = select(CrewMember.id, CrewMember.name, CrewMember.email, CrewMember.base).where(CrewMember.id.in_(ids))
+        return {
+            crew_id: (name, email, base, frozenset(held.get(crew_id, ())))
+            for crew_id, name, email, base in db.execute(stmt)
+        }
+
+    def email_owners(self, db: Session, emails: Sequence[str]) -> dict[str, str]:
+        """Email -> id of the crew member already using it, for the ``emails`` in use."""
+        stmt = select(CrewMember.email, CrewMember.id).where(CrewMember.email.in_(emails))
+        return {email: crew_id for email, crew_id in db.execute(stmt)}
+
+    def upsert_many(self, db: Session, rows: Sequence[dict]) -> None:
+        """Insert or overwrite ``{id, name, email, base}`` rows, without committing."""
+        if not rows:
+            return
+        # executemany of one cached statement, batched by insertmanyvalues
+        table = CrewMember.__table__
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.id],
+            set_={
+                "name": stmt.excluded.name,
+                "email": stmt.excluded.email,
+                "base": stmt.excluded.base,
+                "version": table.c.version + 1,
+            },
+        )
+        db.execute(stmt, list(rows))
+
+    def replace_qualifications(
+        self, db: Session, codes_by_crew: dict[str, Sequence[str]], *, existing: Iterable[str] = ()
+    ) -> None:
+        """Make each crew member's qualifications exactly the given codes, without committing.
+
+        Only the ``existing`` crew can have rows to remove.
+        """
+        stale = [crew_id for crew_id in existing if crew_id in codes_by_crew]
+        if stale:
+            db.execute(delete(CrewQualification).where(CrewQualification.crew_id.in_(stale)))
+        values = [
+            {"crew_id": crew_id, "aircraft_type": code}
+            for crew_id, codes in codes_by_crew.items()
+            for code in dict.fromkeys(codes)
+        ]
+        if values:
+            db.execute(insert(CrewQualification.__table__), values)
+
+    def set_qualifications(self, crew: CrewMember, codes: Iterable[str]) -> None:
+        # diff against the current rows, deleting and re-adding a row with the
+        # same key in one flush would hit the primary key
+        wanted = list(dict.fromkeys(codes))
+        crew.qualification_rows = [q for q in crew.qualification_rows if q.aircraft_type in wanted]
+        held = set(crew.qualifications)
+        crew.qualifications.extend(code for code in wanted if code not in held)
 
     def create(
         self,
@@ -36,14 +137,12 @@ class CrewRepository:
             base=base_airport,
         )
         db.add(crew)
-        db.flush()  # assigns crew.id
-
         if qualification_codes is not None:
-            quals = ", ".join(map(str, qualification_codes))
-            crew.qualifications = quals
+            self.set_qualifications(crew, qualification_codes)
 
         db.commit()
-        db.refresh(crew)
+        # refresh() leaves lazy="raise" relationships unloaded unless named
+        db.refresh(crew, ["qualification_rows"])
         return crew
 
     def update(
@@ -64,11 +163,12 @@ class CrewRepository:
             crew.base = base_airport
 
         if qualification_codes is not None:
-            quals = [self.get_or_create_qualification(db, code) for code in qualification_codes]
-            crew.qualifications = quals
+            self.set_qualifications(crew, qualification_codes)
 
+        crew.version = CrewMember.version + 1
         db.commit()
-        db.refresh(crew)
+        # refresh() leaves lazy="raise" relationships unloaded unless named
+        db.refresh(crew, ["qualification_rows"])
         return crew
 
     def list(
@@ -77,17 +177,80 @@ class CrewRepository:
         *,
         base_airport: Optional[str] = None,
         qualified_for: Optional[str] = None,
+        after: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> Sequence[Row]:
+        stmt = _list_stmt(
+            base_airport=base_airport,
+            qualified_for=qualified_for,
+            after=after,
+            limit=limit,
+            offset=offset,
+        )
+        return list(db.execute(stmt).all())
+
+
+class AsyncCrewRepository:
+    """Read queries of CrewRepository on an AsyncSession."""
+
+    async def get_by_id(self, db: AsyncSession, crew_id: str) -> Optional[CrewMember]:
+        stmt = select(CrewMember).where(CrewMember.id == crew_id).options(with_qualifications())
+        return (await db.execute(stmt)).scalar_one_or_none()
+
+    async def get_version(self, db: AsyncSession, crew_id: str) -> Optional[int]:
+        stmt = select(CrewMember.version).where(CrewMember.id == crew_id)
+        return (await db.execute(stmt)).scalar_one_or_none()
+
+    async def list(
+        self,
+        db: AsyncSession,
+        *,
+        base_airport: Optional[str] = None,
+        qualified_for: Optional[str] = None,
+        after: Optional[str] = None,
         limit: int = 100,
         offset: int = 0,
-    ) -> Sequence[CrewMember]:
-        stmt = select(CrewMember)
+    ) -> Sequence[Row]:
+        stmt = _list_stmt(
+            base_airport=base_airport,
+            qualified_for=qualified_for,
+            after=after,
+            limit=limit,
+            offset=offset,
+        )
+        return list((await db.execute(stmt)).all())
+
+    async def export(self, db: AsyncSession) -> AsyncResult:
+        stmt = select(*_READ_COLUMNS).order_by(CrewMember.id)
+        return await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+
+
+def _list_stmt(
+    *,
+    base_airport: Optional[str],
+    qualified_for: Optional[str],
+    after: Optional[str],
+    limit: int,
+    offset: int,
+) -> Select:
+    stmt = select(*_READ_COLUMNS)
+
+    if base_airport:
+        stmt = stmt.where(CrewMember.base == base_airport.strip().upper())
+
+    if qualified_for:
+        stmt = _qualified(stmt, qualified_for.strip().upper())
+
+    # keyset: continue after the last id of the previous page
+    if after is not None:
+        stmt = stmt.where(CrewMember.id > after)
 
-        if base_airport:
-            stmt = stmt.where(CrewMember.base == base_airport.strip().upper())
+    return stmt.order_by(CrewMember.id).offset(offset).limit(limit)
 
-        if qualified_for:
-            q = qualified_for.strip().upper()
-            stmt = stmt.where(CrewMember.qualifications.contains(q))
 
-        stmt = stmt.offset(offset).limit(limit)
-        return list(db.execute(stmt).scalars().all())
\ No newline at end of file
+def _qualified(stmt: Select, code: str) -> Select:
+    # exact match through ix_crew_qualifications_aircraft_type
+    return stmt.join(CrewQualification, CrewQualification.crew_id == CrewMember.id).where(
+        CrewQualification.aircraft_type == code
+    )
@@ -1,22 +1,47 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database.engine import get_db_session
-from app.domains.crew_management.schemas import CrewCreate, CrewRead, CrewUpdate
-from app.domains.crew_management.service import CrewService
+from app.database.engine import get_db_session, get_read_db_session
+from app.domains.etags import not_modified
+from app.domains.export import ExportFormat, export_response
+from app.domains.pagination import NEXT_CURSOR_HEADER, set_next_cursor
+from app.domains.responses import RowListRenderer
+from app.domains.crew_management.schemas import CrewBulkResult, CrewCreate, CrewRead, CrewUpdate
+from app.domains.crew_management.service import AsyncCrewService, CrewService
 
 router = APIRouter(prefix="/crew", tags=["Crew Management"])
 service = CrewService()
+read_service = AsyncCrewService()
+crew_rows = RowListRenderer(CrewRead)
+
+@router.get("/export")
+async def export_crew(
+    format: ExportFormat = Query(default=ExportFormat.NDJSON),
+    db: AsyncSession = Depends(get_read_db_session),
+):
+    # declared before /{crew_id}, which would otherwise match "export"
+    return export_response(await read_service.export_crew(db), "crew", format)
 
 @router.get("/{crew_id}", response_model=CrewRead)
-def get_crew(crew_id: str, db: Session = Depends(get_db_session)):
-    crew = service.get_crew(db, crew_id)
+async def get_crew(
+    crew_id: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db_session),
+):
+    # the version alone is read first, a client that has it gets a 304 without the qualifications query
+    unchanged = not_modified(request, response, await read_service.get_crew_version(db, crew_id))
+    if unchanged is not None:
+        return unchanged
+    crew = await read_service.get_crew(db, crew_id)
     return CrewRead(
         id=crew.id,
         name=crew.name,
         email=crew.email,
         base_airport=crew.base,
-        qualifications=crew.qualifications.split(",") if crew.qualifications else [],
+        qualifications=list(crew.qualifications),
     )
 
 @router.post("", response_model=CrewRead, status_code=201)
@@ -27,9 +52,22 @@ def create_crew(payload: CrewCreate, db: Session = Depends(get_db_session)):
         name=crew.name,
         email=crew.email,
         base_airport=crew.base,
-        qualifications=crew.qualifications.split(",") if crew.qualifications else [],
+        qualifications=list(crew.qualifications),
     )
 
+@router.post("/bulk", response_model=CrewBulkResult)
+async def bulk_import_crew(
+    request: Request,
+    format: ExportFormat = Query(default=ExportFormat.NDJSON),
+    db: Session = Depends(get_db_session),
+):
+    # the raw body is the file, CSV with a CrewCreate header row or one JSON object per line
+    try:
+        body = (await request.body()).decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="upload must be UTF-8")
+    return await run_in_threadpool(service.bulk_import, db, body, format)
+
 @router.patch("/{crew_id}", response_model=CrewRead)
 def update_crew(crew_id: str, payload: CrewUpdate, db: Session = Depends(get_db_session)):
     crew = service.update_crew(db, crew_id, payload)
@@ -38,32 +76,30 @@ def update_crew(crew_id: str, payload: CrewUpdate, db: Session = Depends(get_db_
         name=crew.name,
         email=crew.email,
         base_airport=crew.base,
-        qualifications=crew.qualifications.split(",") if crew.qualifications else [],
+        qualifications=list(crew.qualifications),
     )
 
 
 @router.get("", response_model=list[CrewRead])
-def list_crew(
+async def list_crew(
     base_airport: str | None = Query(default=None),
     qualified_for: str | None = Query(default=None),
+    after: str | None = Query(
+        default=None, description=f"cursor from the {NEXT_CURSOR_HEADER} header of the previous page"
+    ),
     limit: int = Query(default=100, ge=1, le=500),
     offset: int = Query(default=0, ge=0),
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
 ):
-    rows = service.list_crew(
+    rows = await read_service.list_crew(
         db,
         base_airport=base_airport,
         qualified_for=qualified_for,
+        after=after,
         limit=limit,
         offset=offset,
     )
-    return [
-        CrewRead(
-            id=c.id,
-            name=c.name,
-            email=c.email,
-            base_airport=c.base,
-            qualifications=c.qualifications.split(",") if c.qualifications else [],
-        )
-        for c in rows
-    ]
\ No newline at end of file
+    # rows are CrewRead's columns, rendered without a model per row
+    page = crew_rows.render(rows)
+    set_next_cursor(page, "crew", rows, limit)
+    return page
\ No newline at end of file
@@ -1,12 +1,19 @@
-from typing import List, Optional
+from typing import Annotated, List, Optional
 from pydantic import BaseModel, Field, EmailStr, field_validator
 
+from app.domains.bulk import BulkRowError
+
+# an aircraft type code, as wide as crew_qualifications.aircraft_type
+AircraftType = Annotated[str, Field(min_length=1, max_length=20)]
+
+
 class CrewCreate(BaseModel):
-    id: str = Field(min_length=1, max_length=32)
+    # limits are the column widths, so a row that validates also fits
+    id: str = Field(min_length=1, max_length=10)
     name: str = Field(min_length=1, max_length=64)
-    email: EmailStr
+    email: EmailStr = Field(max_length=100)
     base_airport: str = Field(min_length=3, max_length=3)
-    qualifications: List[str] = Field(default_factory=list)
+    qualifications: List[AircraftType] = Field(default_factory=list)
 
     @field_validator("base_airport")
     @classmethod
@@ -24,9 +31,9 @@ class CrewCreate(BaseModel):
 
 class CrewUpdate(BaseModel):
     name: Optional[str] = Field(default=None, min_length=1, max_length=64)
-    email: Optional[EmailStr] = None
+    email: Optional[EmailStr] = Field(default=None, max_length=100)
     base_airport: Optional[str] = Field(default=None, min_length=3, max_length=3)
-    qualifications: Optional[List[str]] = None  # if provided this replaces list
+    qualifications: Optional[List[AircraftType]] = None  # if provided this replaces list
 
     @field_validator("base_airport")
     @classmethod
@@ -54,4 +61,15 @@ class CrewRead(BaseModel):
     qualifications: List[str]
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class CrewBulkResult(BaseModel):
+    received: int
+    inserted: int
+    updated: int
+    unchanged: int
+    rejected: int
+    # at most MAX_REPORTED_ERRORS entries, ``rejected`` has the full count
+    errors: List[BulkRowError]
+    elapsed_s: float = 0.0
@@ -1,13 +1,24 @@
 from __future__ import annotations
 
+import time
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
-from app.domains.crew_management.repository import CrewRepository
-from app.domains.crew_management.schemas import CrewCreate, CrewUpdate
+from app.domains.pagination import decode_cursor
+from app.domains.bulk import RowErrors, describe_error, read_records
+from app.domains.export import ExportFormat
+from app.domains.crew_management.repository import AsyncCrewRepository, CrewRepository
+from app.domains.crew_management.schemas import CrewBulkResult, CrewCreate, CrewUpdate
 from app.domains.crew_management.models import CrewMember
 
 
+# rows per INSERT ... ON CONFLICT statement in a bulk import
+CREW_BULK_BATCH_SIZE = 1000
+
+
 class CrewService:
     def __init__(self) -> None:
         self.repo = CrewRepository()
@@ -34,6 +45,107 @@ class CrewService:
             qualification_codes=payload.qualifications,
         )
 
+    def bulk_import(self, db: Session, body: str, fmt: ExportFormat) -> CrewBulkResult:
+        """Upsert an uploaded CSV/NDJSON crew list in batches, in one transaction.
+
+        Rows are validated with ``CrewCreate`` and written with
+        ``INSERT ... ON CONFLICT``. Rows matching what is stored are left alone
+        and counted as unchanged. A row whose email belongs to another crew
+        member, or repeats an id or email seen earlier in the upload, is
+        rejected. Without a ``qualifications`` field an existing crew member
+        keeps the stored ones. In CSV they are one comma-separated cell, as
+        in the export.
+        """
+        started = time.perf_counter()
+        errors = RowErrors()
+        received = inserted = updated = unchanged = 0
+        seen: set[str] = set()
+        claimed: dict[str, str] = {}
+        batch: list = []
+
+        def flush() -> None:
+            nonlocal inserted, updated, unchanged
+            added, changed, same = self._upsert_batch(db, batch, errors)
+            inserted, updated, unchanged = inserted + added, updated + changed, unchanged + same
+            batch.clear()
+
+        for line, record in read_records(body, fmt, CrewCreate):
+            received += 1
+            if isinstance(record, str):
+                errors.reject(line, None, [record])
+                continue
+            keep_qualifications = "qualifications" not in record
+            if isinstance(record.get("qualifications"), str):
+                record = {**record, "qualifications": record["qualifications"].split(",")}
+            try:
+                crew = CrewCreate.model_validate(record)
+            except ValidationError as exc:
+                errors.reject(line, record.get("id"), [describe_error(e) for e in exc.errors()])
+                continue
+
+            email = str(crew.email)
+            if crew.id in seen:
+                errors.reject(line, crew.id, ["id repeated in upload, the first row is kept"])
+                continue
+            if claimed.get(email, crew.id) != crew.id:
+                errors.reject(line, crew.id, [f"email already used by {claimed[email]} earlier in the upload"])
+                continue
+            seen.add(crew.id)
+            claimed[email] = crew.id
+
+            batch.append((line, crew, keep_qualifications))
+            if len(batch) == CREW_BULK_BATCH_SIZE:
+                flush()
+        flush()
+        db.commit()
+
+        return CrewBulkResult(
+            received=received,
+            inserted=inserted,
+            updated=updated,
+            unchanged=unchanged,
+            rejected=errors.count,
+            errors=errors.report(),
+            elapsed_s=round(time.perf_counter() - started, 3),
+        )
+
+    def _upsert_batch(self, db: Session, batch: list, errors: RowErrors) -> tuple[int, int, int]:
+        if not batch:
+            return 0, 0, 0
+        current = self.repo.snapshot(db, [crew.id for _, crew, _ in batch])
+        # one set lookup for the whole batch instead of a query per row
+        owners = self.repo.email_owners(db, [str(crew.email) for _, crew, _ in batch])
+
+        rows, qualifications = [], {}
+        inserted = updated = unchanged = 0
+        for line, crew, keep_qualifications in batch:
+            email = str(crew.email)
+            owner = owners.get(email)
+            if owner is not None and owner != crew.id:
+                errors.reject(line, crew.id, [f"email already belongs to crew member {owner}"])
+                continue
+
+            existing = current.get(crew.id)
+            codes = list(dict.fromkeys(crew.qualifications))
+            if keep_qualifications and existing:
+                codes = sorted(existing[3])
+            wanted = (crew.name, email, crew.base_airport, frozenset(codes))
+            if existing == wanted:
+                unchanged += 1
+                continue
+
+            if existing is None:
+                inserted += 1
+            else:
+                updated += 1
+            rows.append({"id": crew.id, "name": crew.name, "email": email, "base": crew.base_airport})
+            if existing is None or existing[3] != wanted[3]:
+                qualifications[crew.id] = codes
+
+        self.repo.upsert_many(db, rows)
+        self.repo.replace_qualifications(db, qualifications, existing=current)
+        return inserted, updated, unchanged
+
     def get_crew(self, db: Session, crew_id: str) -> CrewMember:
         crew = self.repo.get_by_id(db, crew_id)
         if not crew:
@@ -63,6 +175,7 @@ class CrewService:
         *,
         base_airport: str | None,
         qualified_for: str | None,
+        after: str | None = None,
         limit: int,
         offset: int,
     ):
@@ -70,6 +183,48 @@ class CrewService:
             db,
             base_airport=base_airport,
             qualified_for=qualified_for,
+            after=decode_cursor(after, "crew", str, offset=offset),
+            limit=limit,
+            offset=offset,
+        )
+
+
+class AsyncCrewService:
+    """Read paths of CrewService for ``async def`` handlers."""
+
+    def __init__(self) -> None:
+        self.repo = AsyncCrewRepository()
+
+    async def get_crew(self, db: AsyncSession, crew_id: str) -> CrewMember:
+        crew = await self.repo.get_by_id(db, crew_id)
+        if not crew:
+            raise HTTPException(status_code=404, detail="crew member does not exist")
+        return crew
+
+    async def get_crew_version(self, db: AsyncSession, crew_id: str) -> int:
+        version = await self.repo.get_version(db, crew_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="crew member does not exist")
+        return version
+
+    async def list_crew(
+        self,
+        db: AsyncSession,
+        *,
+        base_airport: str | None,
+        qualified_for: str | None,
+        after: str | None = None,
+        limit: int,
+        offset: int,
+    ):
+        return await self.repo.list(
+            db,
+            base_airport=base_airport,
+            qualified_for=qualified_for,
+            after=decode_cursor(after, "crew", str, offset=offset),
             limit=limit,
             offset=offset,
-        )
\ No newline at end of file
+        )
+
+    async def export_crew(self, db: AsyncSession) -> AsyncResult:
+        return await self.repo.export(db)
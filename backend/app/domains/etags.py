@@ -0,0 +1,27 @@
+"""Strong ETags and ``If-None-Match`` for single-entity GETs.
+
+The tag is a version counter stored with the entity and bumped by every write
+that changes its representation, so it can be compared before the response,
+or anything behind it, is built. A matching ``If-None-Match`` gets an empty
+304.
+"""
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+
+def entity_tag(version: int) -> str:
+    return f'"{version}"'
+
+
+def not_modified(request: Request, response: Response, version: int) -> Optional[Response]:
+    """A 304 when the client already has ``version``; otherwise ``None``, with the ETag set on ``response``."""
+    tag = entity_tag(version)
+    header = request.headers.get("if-none-match")
+    if header is not None:
+        # If-None-Match compares weakly, W/"3" matches "3"
+        candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+        if "*" in candidates or tag in candidates:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": tag})
+    response.headers["ETag"] = tag
+    return None
@@ -0,0 +1,115 @@
+"""Roster board: the schedules of many crew members over a time window.
+
+The rows of ``AsyncFlightRepository.roster_board`` come ordered by crew member
+then departure, so schedules are built in one pass: a crew member's schedule
+is complete when the next crew member's first row arrives, and each rest gap
+only needs the previous flight. Each schedule is encoded as soon as it is
+complete and has the shape ``CrewScheduleResponse`` gives it on
+``/flights/schedule/{crew_member_id}``.
+
+A board that fits in one batch of rows is sent as one response. A larger one
+is streamed as the JSON array is produced, a batch of rows at a time, from a
+server-side cursor.
+"""
+from datetime import datetime
+from typing import AsyncIterator, Iterable, Optional, Sequence
+
+import orjson
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncResult
+
+from app.domains.flights.times import as_utc
+from app.domains.responses import ORJSON_OPTIONS
+
+
+BOARD_BATCH_SIZE = 1000
+DEFAULT_WINDOW_DAYS = 7
+MAX_WINDOW_DAYS = 31
+
+_FLIGHT_FIELDS = ("id", "From", "To", "aircraft", "departure", "arrival", "duty_hrs")
+
+
+def rest_gap(arrival: datetime, next_departure: datetime) -> tuple[float, str]:
+    """Rest hours between two flights, and the UTC date the rest ends on."""
+    hours = (next_departure - arrival).total_seconds() / 3600
+    return round(hours, 1), as_utc(next_departure).date().isoformat()
+
+
+class _BoardBuilder:
+    """Groups ordered board rows into encoded crew schedules."""
+
+    def __init__(self) -> None:
+        self._schedule: Optional[dict] = None
+        self._previous: Optional[Row] = None
+
+    def feed(self, rows: Iterable[Row]) -> list[bytes]:
+        """The schedules completed by ``rows``."""
+        done = []
+        for row in rows:
+            if self._schedule is None or row.crew_member_id != self._schedule["crew_member_id"]:
+                if self._schedule is not None:
+                    done.append(self._encode())
+                self._schedule = {"crew_member_id": row.crew_member_id, "schedule": []}
+                self._previous = None
+            if row.id is None:
+                # a crew member with nothing in the window
+                continue
+            items = self._schedule["schedule"]
+            if self._previous is not None:
+                rest_hours, date = rest_gap(self._previous.arrival, row.departure)
+                items.append({"type": "rest", "flight": None, "rest_hours": rest_hours, "date": date})
+            items.append({
+                "type": "flight",
+                "flight": {field: getattr(row, field) for field in _FLIGHT_FIELDS},
+                "rest_hours": None,
+                "date": None,
+            })
+            self._previous = row
+        return done
+
+    def finish(self) -> list[bytes]:
+        return [self._encode()] if self._schedule is not None else []
+
+    def _encode(self) -> bytes:
+        return orjson.dumps(self._schedule, option=ORJSON_OPTIONS)
+
+
+async def board_response(result: AsyncResult) -> Response:
+    partitions = result.partitions()
+    builder = _BoardBuilder()
+    try:
+        first: Sequence[Row] = await anext(partitions, [])
+    except BaseException:
+        await result.close()
+        raise
+    if len(first) < BOARD_BATCH_SIZE:
+        # the whole board was in the first batch
+        await result.close()
+        body = b"[" + b",".join(builder.feed(first) + builder.finish()) + b"]"
+        return Response(body, media_type="application/json")
+    return StreamingResponse(_stream(result, _batches(partitions, builder, first)), media_type="application/json")
+
+
+async def _batches(
+    partitions: AsyncIterator[Sequence[Row]], builder: _BoardBuilder, first: Sequence[Row]
+) -> AsyncIterator[list[bytes]]:
+    yield builder.feed(first)
+    async for rows in partitions:
+        yield builder.feed(rows)
+    yield builder.finish()
+
+
+async def _stream(result: AsyncResult, batches: AsyncIterator[list[bytes]]) -> AsyncIterator[bytes]:
+    try:
+        yield b"["
+        separator = b""
+        async for schedules in batches:
+            if schedules:
+                yield separator + b",".join(schedules)
+                separator = b","
+        yield b"]"
+    finally:
+        # a client that disconnects mid-stream must not leave the cursor open
+        await result.close()
@@ -1,4 +1,6 @@
-from sqlalchemy import String, Float
+from datetime import datetime
+
+from sqlalchemy import DateTime, String, Float, Index, Integer
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.domains.models import AppBase
@@ -6,20 +8,35 @@ from app.domains.models import AppBase
 
 class Flight(AppBase):
     __tablename__ = "flights"
+    __table_args__ = (
+        Index("ix_flights_from_to", "From", "To"),
+        # serves the aircraft ILIKE '%x%' filter, needs pg_trgm
+        Index(
+            "ix_flights_aircraft_trgm",
+            "aircraft",
+            postgresql_using="gin",
+            postgresql_ops={"aircraft": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[str] = mapped_column(String(10), primary_key=True)
     From: Mapped[str] = mapped_column(String(10))
     To: Mapped[str] = mapped_column(String(10))
     aircraft: Mapped[str] = mapped_column(String(20))
-    departure: Mapped[str] = mapped_column(String(50))
-    arrival: Mapped[str] = mapped_column(String(50))
+    departure: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+    arrival: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
     duty_hrs: Mapped[float] = mapped_column("Duty_hrs", Float, primary_key=False)
+    # bumped by every update, the ETag of GET /flights/{id}
+    version: Mapped[int] = mapped_column(Integer, default=1, server_default="1")
 
     # Relationship to CrewAssignment - using string reference to avoid circular import
-    # The actual relationship configuration happens after all models are imported
+    # The actual relationship configuration happens after all models are imported.
+    # Never loaded implicitly, a query that needs it asks with selectinload();
+    # the foreign key cascades deletes without loading it.
     assignments = relationship(
         "CrewAssignment",
         back_populates="flight",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="raise",
+        passive_deletes=True,
     )
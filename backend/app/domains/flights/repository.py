@@ -1,10 +1,26 @@
-from typing import Optional, Sequence
+from datetime import date as Date, datetime, time, timedelta, timezone
+from typing import Iterable, Optional, Sequence
 
-from sqlalchemy import select, and_
+from sqlalchemy import Row, select, and_, text
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
 from sqlalchemy.orm import Session
 
+from app.domains.export import EXPORT_BATCH_SIZE
 from app.domains.flights.models import Flight
 from app.domains.crew_assignment.models import CrewAssignment
+from app.domains.crew_management.models import CrewMember
+
+
+# FlightRead's fields as plain columns, for lists and exports that skip the ORM
+_READ_COLUMNS = (
+    Flight.id,
+    Flight.From,
+    Flight.To,
+    Flight.aircraft,
+    Flight.departure,
+    Flight.arrival,
+    Flight.duty_hrs.label("duty_hrs"),
+)
 
 
 class FlightRepository:
@@ -28,8 +44,8 @@ class FlightRepository:
         From: str,
         To: str,
         aircraft: str,
-        departure: str,
-        arrival: str,
+        departure: datetime,
+        arrival: datetime,
         duty_hrs: float,
     ) -> Flight:
         flight = Flight(
@@ -52,42 +68,207 @@ class FlightRepository:
         *,
         From: Optional[str] = None,
         To: Optional[str] = None,
-        date: Optional[str] = None,
+        date: Optional[Date] = None,
         aircraft: Optional[str] = None,
+        after: Optional[str] = None,
         limit: int = 100,
         offset: int = 0,
+    ) -> Sequence[Row]:
+        stmt = _list_stmt(
+            From=From, To=To, date=date, aircraft=aircraft, after=after, limit=limit, offset=offset
+        )
+        return list(db.execute(stmt).all())
+
+    def get_flights_by_crew_member(
+        self, db: Session, crew_employee_id: str
     ) -> Sequence[Flight]:
-        stmt = select(Flight)
 
-        if From:
-            stmt = stmt.where(Flight.From == From.strip().upper())
+        stmt = _crew_flights_stmt(crew_employee_id)
+        return list(db.execute(stmt).scalars().all())
 
-        if To:
-            stmt = stmt.where(Flight.To == To.strip().upper())
+    def stage(self, db: Session, rows: Iterable[tuple]) -> None:
+        """COPY ``(line, id, From, To, aircraft, departure, arrival, duty_hrs)``
+        tuples into ``flights_staging``, a temp table dropped when the
+        transaction ends. ``rows`` is consumed as it is copied.
+        """
+        db.execute(text("""
+            CREATE TEMP TABLE flights_staging (
+                line INTEGER NOT NULL,
+                id VARCHAR(10) NOT NULL,
+                "From" VARCHAR(10) NOT NULL,
+                "To" VARCHAR(10) NOT NULL,
+                aircraft VARCHAR(20) NOT NULL,
+                departure TIMESTAMPTZ NOT NULL,
+                arrival TIMESTAMPTZ NOT NULL,
+                "Duty_hrs" FLOAT NOT NULL
+            ) ON COMMIT DROP
+        """))
+        cursor = db.connection().connection.driver_connection.cursor()
+        copy_sql = (
+            'COPY flights_staging (line, id, "From", "To", aircraft, departure, arrival, "Duty_hrs") FROM STDIN'
+        )
+        with cursor.copy(copy_sql) as copy:
+            for row in rows:
+                copy.write_row(row)
 
-        if date:
-            # Filter by departure date (contains the date string)
-            stmt = stmt.where(Flight.departure.contains(date.strip()))
+    def drop_staged_duplicates(self, db: Session) -> Sequence[tuple[int, str]]:
+        """Remove every repeat of an id within the upload but the first, as (line, id)."""
+        return [tuple(row) for row in db.execute(text("""
+            DELETE FROM flights_staging AS s
+            USING flights_staging AS first
+            WHERE first.id = s.id AND first.line < s.line
+            RETURNING s.line, s.id
+        """))]
 
-        if aircraft:
-            stmt = stmt.where(Flight.aircraft.ilike(f"%{aircraft.strip()}%"))
+    def staged_conflicts(self, db: Session) -> Sequence[tuple[int, str]]:
+        """Staged rows whose id is already a flight, as (line, id)."""
+        return [tuple(row) for row in db.execute(text("""
+            SELECT s.line, s.id FROM flights_staging AS s JOIN flights AS f ON f.id = s.id
+            ORDER BY s.line
+        """))]
 
-        stmt = stmt.offset(offset).limit(limit)
-        return list(db.execute(stmt).scalars().all())
+    def crews_on_staged(self, db: Session) -> Sequence[str]:
+        """Ids of the crew assigned to a staged flight, whose schedules an upsert changes."""
+        return db.execute(text("""
+            SELECT DISTINCT a.crew_employee_id
+            FROM crew_assignments AS a JOIN flights_staging AS s ON s.id = a.flight_id
+            WHERE a.removed_at IS NULL
+        """)).scalars().all()
 
-    def get_flights_by_crew_member(
-        self, db: Session, crew_employee_id: str
+    def merge_staged(self, db: Session, *, update: bool) -> tuple[int, int]:
+        """Insert the staged rows, updating or skipping existing ids; (inserted, updated)."""
+        columns = ('"From"', '"To"', "aircraft", "departure", "arrival", '"Duty_hrs"')
+        conflict = (
+            "DO UPDATE SET " + ", ".join(f"{c} = EXCLUDED.{c}" for c in columns) + ", version = flights.version + 1"
+            if update
+            else "DO NOTHING"
+        )
+        # xmax is 0 on a freshly inserted tuple and set on one updated in place
+        fresh = db.execute(text(f"""
+            INSERT INTO flights (id, "From", "To", aircraft, departure, arrival, "Duty_hrs")
+            SELECT id, "From", "To", aircraft, departure, arrival, "Duty_hrs" FROM flights_staging
+            ON CONFLICT (id) {conflict}
+            RETURNING xmax = 0
+        """)).scalars().all()
+        inserted = sum(fresh)
+        return inserted, len(fresh) - inserted
+
+
+class AsyncFlightRepository:
+    """Read-only flight queries for ``async def`` handlers, same SQL as FlightRepository."""
+
+    async def get_by_id(self, db: AsyncSession, flight_id: str) -> Optional[Flight]:
+        stmt = select(Flight).where(Flight.id == flight_id)
+        return (await db.execute(stmt)).scalar_one_or_none()
+
+    async def list(
+        self,
+        db: AsyncSession,
+        *,
+        From: Optional[str] = None,
+        To: Optional[str] = None,
+        date: Optional[Date] = None,
+        aircraft: Optional[str] = None,
+        after: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> Sequence[Row]:
+        stmt = _list_stmt(
+            From=From, To=To, date=date, aircraft=aircraft, after=after, limit=limit, offset=offset
+        )
+        return list((await db.execute(stmt)).all())
+
+    async def get_flights_by_crew_member(
+        self, db: AsyncSession, crew_employee_id: str
     ) -> Sequence[Flight]:
+        stmt = _crew_flights_stmt(crew_employee_id)
+        return list((await db.execute(stmt)).scalars().all())
+
+    async def export(self, db: AsyncSession) -> AsyncResult:
+        # streamed from a server-side cursor
+        stmt = select(*_READ_COLUMNS).order_by(Flight.id)
+        return await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+
+    async def roster_board(
+        self, db: AsyncSession, *, start: datetime, end: datetime, base: Optional[str], batch_size: int
+    ) -> AsyncResult:
+        """``crew_member_id`` and FlightRead's columns for every crew member's flights
+        departing in ``[start, end)``, by crew member then departure, streamed
+        ``batch_size`` rows at a time.
+
+        Crew members without flights in the window have one row with null
+        flight columns.
+        """
+        stmt = _roster_board_stmt(start=start, end=end, base=base)
+        return await db.stream(stmt.execution_options(yield_per=batch_size))
+
+
+def _list_stmt(
+    *,
+    From: Optional[str],
+    To: Optional[str],
+    date: Optional[Date],
+    aircraft: Optional[str],
+    after: Optional[str],
+    limit: int,
+    offset: int,
+):
+    stmt = select(*_READ_COLUMNS)
+
+    if From:
+        stmt = stmt.where(Flight.From == From.strip().upper())
+
+    if To:
+        stmt = stmt.where(Flight.To == To.strip().upper())
 
-        stmt = (
-            select(Flight)
-            .join(CrewAssignment, Flight.id == CrewAssignment.flight_id)
-            .where(
-                and_(
-                    CrewAssignment.crew_employee_id == crew_employee_id,
-                    CrewAssignment.removed_at.is_(None),
-                )
+    if date:
+        # departure date in UTC, as a range so the departure index is used
+        day_start = datetime.combine(date, time.min, tzinfo=timezone.utc)
+        stmt = stmt.where(
+            Flight.departure >= day_start,
+            Flight.departure < day_start + timedelta(days=1),
+        )
+
+    if aircraft:
+        stmt = stmt.where(Flight.aircraft.ilike(f"%{aircraft.strip()}%"))
+
+    # keyset: continue after the last id of the previous page
+    if after is not None:
+        stmt = stmt.where(Flight.id > after)
+
+    return stmt.order_by(Flight.id).offset(offset).limit(limit)
+
+
+def _crew_flights_stmt(crew_employee_id: str):
+    return (
+        select(Flight)
+        .join(CrewAssignment, Flight.id == CrewAssignment.flight_id)
+        .where(
+            and_(
+                CrewAssignment.crew_employee_id == crew_employee_id,
+                CrewAssignment.removed_at.is_(None),
             )
-            .order_by(Flight.departure.asc())
         )
-        return list(db.execute(stmt).scalars().all())
+        .order_by(Flight.departure.asc())
+    )
+
+
+def _roster_board_stmt(*, start: datetime, end: datetime, base: Optional[str]):
+    # the window bounds the join, so only its flights are read, through the departure index
+    window = (
+        select(CrewAssignment.crew_employee_id, *_READ_COLUMNS)
+        .join(Flight, Flight.id == CrewAssignment.flight_id)
+        .where(
+            CrewAssignment.removed_at.is_(None),
+            Flight.departure >= start,
+            Flight.departure < end,
+        )
+        .subquery()
+    )
+    stmt = (
+        select(CrewMember.id.label("crew_member_id"), *(window.c[column.name] for column in _READ_COLUMNS))
+        .outerjoin(window, window.c.crew_employee_id == CrewMember.id)
+    )
+    if base:
+        stmt = stmt.where(CrewMember.base == base.strip().upper())
+    return stmt.order_by(CrewMember.id, window.c.departure, window.c.id)
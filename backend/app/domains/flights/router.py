@@ -1,26 +1,80 @@
-from fastapi import APIRouter, Depends, Query
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database.engine import get_db_session
-from app.domains.flights.schemas import FlightCreate, FlightRead, CrewScheduleResponse
-from app.domains.flights.service import FlightService
+from app.database.engine import get_db_session, get_read_db_session
+from app.domains.etags import not_modified
+from app.domains.flights.board import DEFAULT_WINDOW_DAYS, board_response
+from app.domains.export import ExportFormat, export_response
+from app.domains.pagination import NEXT_CURSOR_HEADER, set_next_cursor
+from app.domains.responses import RowListRenderer
+from app.domains.flights.schemas import (
+    BulkConflictPolicy, CrewScheduleResponse, FlightBulkResult, FlightCreate, FlightRead
+)
+from app.domains.flights.service import AsyncFlightService, FlightService
 
 router = APIRouter(prefix="/flights", tags=["Flight Management"])
 service = FlightService()
+# reads run on the event loop (on the replica when there is one), writes stay on the threadpool
+read_service = AsyncFlightService()
+flight_rows = RowListRenderer(FlightRead)
+
+
+@router.get("/schedule", response_model=list[CrewScheduleResponse])
+async def get_roster_board(
+    start: datetime | None = Query(
+        default=None, alias="from", description="start of the window, now when omitted; naive times are UTC"
+    ),
+    end: datetime | None = Query(
+        default=None, alias="to", description=f"end of the window, {DEFAULT_WINDOW_DAYS} days after from when omitted"
+    ),
+    base: str | None = Query(default=None, description="only crew members based at this airport"),
+    db: AsyncSession = Depends(get_read_db_session),
+):
+    # every matching crew member's schedule from one query, declared before /{flight_id}
+    result = await read_service.get_roster_board(db, start=start, end=end, base=base)
+    return await board_response(result)
 
 
 @router.get("/schedule/{crew_member_id}", response_model=CrewScheduleResponse)
-def get_crew_schedule(
+async def get_crew_schedule(
     crew_member_id: str,
-    db: Session = Depends(get_db_session),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db_session),
 ):
+    # checked before the flights are read or the timeline built
+    version = await read_service.get_schedule_version(db, crew_member_id)
+    unchanged = not_modified(request, response, version)
+    if unchanged is not None:
+        return unchanged
+    return await read_service.get_crew_schedule(db, crew_member_id, version)
+
 
-    return service.get_crew_schedule(db, crew_member_id)
+@router.get("/export")
+async def export_flights(
+    format: ExportFormat = Query(default=ExportFormat.NDJSON),
+    db: AsyncSession = Depends(get_read_db_session),
+):
+    # declared before /{flight_id}, which would otherwise match "export"
+    return export_response(await read_service.export_flights(db), "flights", format)
 
 
 @router.get("/{flight_id}", response_model=FlightRead)
-def get_flight(flight_id: str, db: Session = Depends(get_db_session)):
-    flight = service.get_flight(db, flight_id)
+async def get_flight(
+    flight_id: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db_session),
+):
+    # one row either way, the 304 skips building and serialising it
+    flight = await read_service.get_flight(db, flight_id)
+    unchanged = not_modified(request, response, flight.version)
+    if unchanged is not None:
+        return unchanged
     return FlightRead(
         id=flight.id,
         From=flight.From,
@@ -46,34 +100,46 @@ def create_flight(payload: FlightCreate, db: Session = Depends(get_db_session)):
     )
 
 
+@router.post("/bulk", response_model=FlightBulkResult)
+async def bulk_import_flights(
+    request: Request,
+    format: ExportFormat = Query(default=ExportFormat.NDJSON),
+    on_conflict: BulkConflictPolicy = Query(default=BulkConflictPolicy.FAIL),
+    db: Session = Depends(get_db_session),
+):
+    # the raw body is the file, CSV with a FlightCreate header row or one JSON object per line
+    try:
+        body = (await request.body()).decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="upload must be UTF-8")
+    # validation, COPY and the merge block, keep them off the event loop
+    return await run_in_threadpool(service.bulk_import, db, body, format, on_conflict)
+
+
 @router.get("", response_model=list[FlightRead])
-def list_flights(
+async def list_flights(
     From: str | None = Query(default=None),
     To: str | None = Query(default=None),
     date: str | None = Query(default=None, description="filter by DEPARTURE date"),
     aircraft: str | None = Query(default=None, description="filtering by aircraft type or number"),
+    after: str | None = Query(
+        default=None, description=f"cursor from the {NEXT_CURSOR_HEADER} header of the previous page"
+    ),
     limit: int = Query(default=100, ge=1, le=500),
     offset: int = Query(default=0, ge=0),
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
 ):
-    rows = service.list_flights(
+    rows = await read_service.list_flights(
         db,
         From=From,
         To=To,
         date=date,
         aircraft=aircraft,
+        after=after,
         limit=limit,
         offset=offset,
     )
-    return [
-        FlightRead(
-            id=f.id,
-            From=f.From,
-            To=f.To,
-            aircraft=f.aircraft,
-            departure=f.departure,
-            arrival=f.arrival,
-            duty_hrs=f.duty_hrs,
-        )
-        for f in rows
-    ]
+    # rows are FlightRead's columns, rendered without a model per row
+    page = flight_rows.render(rows)
+    set_next_cursor(page, "flights", rows, limit)
+    return page
@@ -0,0 +1,114 @@
+"""In-process cache of crew schedules.
+
+Crew apps poll ``GET /flights/schedule/{crew_member_id}`` far more often than
+rosters change, so built schedules are kept per crew member, at most
+``maxsize`` of them (least recently used go first) and for at most ``ttl_s``.
+
+Writes invalidate the crew they touch once committed: assignment create,
+reactivate, soft delete and bulk create, and flights updated by a bulk upsert.
+A schedule read while an invalidation happens is not stored, so a read that
+raced a write cannot put the old roster back. The cache lives in one process;
+with several workers, or reads on a lagging replica, the TTL bounds how stale
+another worker's copy can be.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+from app.domains.flights.schemas import CrewScheduleResponse
+
+
+class ScheduleCacheSettings(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="schedule_cache_")
+
+    # crew members whose schedule is kept, 0 disables the cache
+    maxsize: int = 10000
+    ttl_s: float = 60.0
+
+
+class ScheduleCache:
+    """Bounded LRU of ``CrewScheduleResponse`` by crew member id, with expiry.
+
+    An entry can carry the crew member's ``schedule_version`` it was built
+    for; a lookup for another version misses.
+    """
+
+    def __init__(self, maxsize: int, ttl_s: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.maxsize = maxsize
+        self.ttl_s = ttl_s
+        self._clock = clock
+        # handlers on the event loop read it, sync write handlers in the threadpool invalidate it
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, Optional[int], CrewScheduleResponse]] = OrderedDict()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def generation(self) -> int:
+        """Token to take before reading a schedule from the database, for ``put``."""
+        with self._lock:
+            return self._generation
+
+    def get(self, crew_id: str, version: Optional[int] = None) -> Optional[CrewScheduleResponse]:
+        with self._lock:
+            entry = self._entries.get(crew_id)
+            if entry is not None and entry[0] > self._clock():
+                if version is None or entry[1] == version:
+                    self._entries.move_to_end(crew_id)
+                    self.hits += 1
+                    return entry[2]
+            elif entry is not None:
+                del self._entries[crew_id]
+            self.misses += 1
+            return None
+
+    def put(
+        self, crew_id: str, schedule: CrewScheduleResponse, generation: int, version: Optional[int] = None
+    ) -> None:
+        """Store ``schedule`` unless something was invalidated since ``generation`` was taken."""
+        with self._lock:
+            if self.maxsize <= 0 or generation != self._generation:
+                return
+            self._entries[crew_id] = (self._clock() + self.ttl_s, version, schedule)
+            self._entries.move_to_end(crew_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, crew_ids: Iterable[str]) -> None:
+        with self._lock:
+            self._generation += 1
+            for crew_id in crew_ids:
+                if self._entries.pop(crew_id, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_s": self.ttl_s,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+_SETTINGS = ScheduleCacheSettings()
+SCHEDULE_CACHE = ScheduleCache(_SETTINGS.maxsize, _SETTINGS.ttl_s)
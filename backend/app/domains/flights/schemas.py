@@ -1,16 +1,36 @@
+from datetime import datetime
+from enum import Enum
 from typing import List, Optional
 from pydantic import BaseModel, Field, field_validator
 
+from app.domains.bulk import BulkRowError
+from app.domains.flights.times import as_utc, parse_flight_time
+
 
 class FlightCreate(BaseModel):
     id: str = Field(min_length=1, max_length=10)
     From: str = Field(min_length=3, max_length=3)
     To: str = Field(min_length=3, max_length=3)
-    aircraft: str
-    departure: str
-    arrival: str
+    # the width of flights.aircraft, wider values would abort the bulk COPY
+    aircraft: str = Field(min_length=1, max_length=20)
+    departure: datetime
+    arrival: datetime
     duty_hrs: float
 
+    @field_validator("departure", "arrival", mode="before")
+    @classmethod
+    def accept_legacy_time(cls, v):
+        # ISO-8601 and the legacy "Feb 1, 06:00"; anything else is left for
+        # the datetime field to reject
+        if isinstance(v, str):
+            return parse_flight_time(v) or v
+        return v
+
+    @field_validator("departure", "arrival")
+    @classmethod
+    def assume_utc(cls, v: datetime) -> datetime:
+        return as_utc(v)
+
     @field_validator("From", "To")
     @classmethod
     def validate_iata(cls, v: str) -> str:
@@ -20,13 +40,31 @@ class FlightCreate(BaseModel):
         return v
 
 
+class BulkConflictPolicy(str, Enum):
+    # what to do with an uploaded flight whose id already exists
+    SKIP = "skip"
+    UPSERT = "upsert"
+    FAIL = "fail"
+
+
+class FlightBulkResult(BaseModel):
+    received: int
+    inserted: int
+    updated: int
+    skipped: int
+    rejected: int
+    # at most MAX_REPORTED_ERRORS entries, ``rejected`` has the full count
+    errors: List[BulkRowError]
+    elapsed_s: float = 0.0
+
+
 class FlightRead(BaseModel):
     id: str
     From: str
     To: str
     aircraft: str
-    departure: str
-    arrival: str
+    departure: datetime
+    arrival: datetime
     duty_hrs: float
 
     class Config:
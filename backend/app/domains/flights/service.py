@@ -1,16 +1,28 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Optional
+import time
+from datetime import date as Date, datetime, timedelta, timezone
+from typing import Optional, Sequence
 
+from pydantic import ValidationError
+
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
-from app.domains.flights.repository import FlightRepository
+from app.domains.bulk import MAX_REPORTED_ERRORS, BulkRowError, RowErrors, describe_error, read_records
+from app.domains.export import ExportFormat
+from app.domains.pagination import decode_cursor
+from app.domains.flights.board import BOARD_BATCH_SIZE, DEFAULT_WINDOW_DAYS, MAX_WINDOW_DAYS, rest_gap
+from app.domains.flights.repository import AsyncFlightRepository, FlightRepository
+from app.domains.crew_assignment.repository import CrewAssignmentRepository
 from app.domains.flights.schemas import (
-    FlightCreate, ScheduleItem, CrewScheduleResponse, FlightRead
+    BulkConflictPolicy, FlightBulkResult,
+    FlightCreate, ScheduleItem, CrewScheduleResponse, FlightRead,
 )
 from app.domains.flights.models import Flight
+from app.domains.flights.schedule_cache import SCHEDULE_CACHE
+from app.domains.flights.times import as_utc, parse_flight_date
 from app.domains.crew_management.models import CrewMember
 from sqlalchemy import select
 
@@ -38,6 +50,80 @@ class FlightService:
             duty_hrs=payload.duty_hrs,
         )
 
+    def bulk_import(
+        self,
+        db: Session,
+        body: str,
+        fmt: ExportFormat,
+        on_conflict: BulkConflictPolicy,
+    ) -> FlightBulkResult:
+        """Validate, COPY and merge an uploaded CSV/NDJSON schedule in one transaction.
+
+        Rows failing ``FlightCreate`` are reported and left out, the rest are
+        loaded. Ids repeated in the upload keep their first row. With
+        ``on_conflict=fail`` any id that already exists aborts the whole upload.
+        """
+        started = time.perf_counter()
+        errors = RowErrors()
+        received = 0
+
+        def valid_rows():
+            nonlocal received
+            # validated as COPY pulls them rather than collected first; the body itself is read whole
+            for line, record in read_records(body, fmt, FlightCreate):
+                received += 1
+                if isinstance(record, str):
+                    errors.reject(line, None, [record])
+                    continue
+                try:
+                    flight = FlightCreate.model_validate(record)
+                except ValidationError as exc:
+                    errors.reject(line, record.get("id"), [describe_error(e) for e in exc.errors()])
+                    continue
+                yield (
+                    line, flight.id, flight.From, flight.To, flight.aircraft,
+                    flight.departure, flight.arrival, flight.duty_hrs,
+                )
+
+        self.repo.stage(db, valid_rows())
+        for line, flight_id in self.repo.drop_staged_duplicates(db):
+            errors.reject(line, flight_id, ["id repeated in upload, the first row is kept"])
+
+        conflicts = self.repo.staged_conflicts(db)
+        if conflicts and on_conflict is BulkConflictPolicy.FAIL:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={
+                    "message": f"{len(conflicts)} flight id(s) already exist, nothing was imported",
+                    "errors": [
+                        BulkRowError(line=line, id=flight_id, errors=["flight id already exists"]).model_dump()
+                        for line, flight_id in conflicts[:MAX_REPORTED_ERRORS]
+                    ],
+                },
+            )
+
+        # flights that already exist can only change with upsert, their crews'
+        # schedules and duty days with them
+        update = on_conflict is BulkConflictPolicy.UPSERT
+        affected_crew = self.repo.crews_on_staged(db) if update and conflicts else []
+        inserted, updated = self.repo.merge_staged(db, update=update)
+        assignments = CrewAssignmentRepository()
+        assignments.rebuild_duty_days(db, affected_crew)
+        assignments.touch_schedules(db, affected_crew)
+        db.commit()
+        SCHEDULE_CACHE.invalidate(affected_crew)
+
+        return FlightBulkResult(
+            received=received,
+            inserted=inserted,
+            updated=updated,
+            skipped=len(conflicts) if on_conflict is BulkConflictPolicy.SKIP else 0,
+            rejected=errors.count,
+            errors=errors.report(),
+            elapsed_s=round(time.perf_counter() - started, 3),
+        )
+
     def get_flight(self, db: Session, flight_id: str) -> Flight:
         flight = self.repo.get_by_id(db, flight_id)
         if not flight:
@@ -52,6 +138,7 @@ class FlightService:
         To: str | None,
         date: str | None,
         aircraft: str | None,
+        after: str | None = None,
         limit: int,
         offset: int,
     ):
@@ -59,59 +146,161 @@ class FlightService:
             db,
             From=From,
             To=To,
-            date=date,
+            date=_flight_date(date) if date else None,
             aircraft=aircraft,
+            after=decode_cursor(after, "flights", str, offset=offset),
             limit=limit,
             offset=offset,
         )
 
-    def _parse_flight_time(self, time_str: str) -> Optional[datetime]:
-        
-        try:
-            current_year = datetime.now().year
-            parsed = datetime.strptime(f"{current_year}, {time_str}", "%Y, %b %d, %H:%M")
-            return parsed
-        except ValueError:
-            return None
-
     def get_crew_schedule(self, db: Session, crew_member_id: str) -> CrewScheduleResponse:
-
-        crew = db.execute(
-            select(CrewMember).where(CrewMember.id == crew_member_id)
+        # cached per schedule_version, like AsyncFlightService.get_crew_schedule
+        version = db.execute(
+            select(CrewMember.schedule_version).where(CrewMember.id == crew_member_id)
         ).scalar_one_or_none()
-        
-        if not crew:
+
+        if version is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Crew member {crew_member_id} not found",
             )
 
+        cached = SCHEDULE_CACHE.get(crew_member_id, version)
+        if cached is not None:
+            return cached
+        generation = SCHEDULE_CACHE.generation()
+
         flights = self.repo.get_flights_by_crew_member(db, crew_member_id)
-        
-        schedule: list[ScheduleItem] = []
-        
-        for i, flight in enumerate(flights):
+        schedule = _build_schedule(crew_member_id, flights)
+        SCHEDULE_CACHE.put(crew_member_id, schedule, generation, version)
+        return schedule
+
+
+class AsyncFlightService:
+    """Read paths of FlightService for ``async def`` handlers."""
+
+    def __init__(self) -> None:
+        self.repo = AsyncFlightRepository()
+
+    async def get_flight(self, db: AsyncSession, flight_id: str) -> Flight:
+        flight = await self.repo.get_by_id(db, flight_id)
+        if not flight:
+            raise HTTPException(status_code=404, detail="flight does not exist")
+        return flight
+
+    async def list_flights(
+        self,
+        db: AsyncSession,
+        *,
+        From: str | None,
+        To: str | None,
+        date: str | None,
+        aircraft: str | None,
+        after: str | None = None,
+        limit: int,
+        offset: int,
+    ):
+        return await self.repo.list(
+            db,
+            From=From,
+            To=To,
+            date=_flight_date(date) if date else None,
+            aircraft=aircraft,
+            after=decode_cursor(after, "flights", str, offset=offset),
+            limit=limit,
+            offset=offset,
+        )
+
+    async def export_flights(self, db: AsyncSession) -> AsyncResult:
+        return await self.repo.export(db)
+
+    async def get_schedule_version(self, db: AsyncSession, crew_member_id: str) -> int:
+        """The crew member's schedule_version, one primary key lookup; 404 for unknown crew."""
+        version = (
+            await db.execute(select(CrewMember.schedule_version).where(CrewMember.id == crew_member_id))
+        ).scalar_one_or_none()
+        if version is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Crew member {crew_member_id} not found",
+            )
+        return version
+
+    async def get_crew_schedule(
+        self, db: AsyncSession, crew_member_id: str, version: Optional[int] = None
+    ) -> CrewScheduleResponse:
+        # ``version`` is passed by callers that have read it already
+        if version is None:
+            version = await self.get_schedule_version(db, crew_member_id)
+        cached = SCHEDULE_CACHE.get(crew_member_id, version)
+        if cached is not None:
+            return cached
+        # taken before reading, a write committed meanwhile keeps this result out of the cache
+        generation = SCHEDULE_CACHE.generation()
+
+        flights = await self.repo.get_flights_by_crew_member(db, crew_member_id)
+        schedule = _build_schedule(crew_member_id, flights)
+        SCHEDULE_CACHE.put(crew_member_id, schedule, generation, version)
+        return schedule
+
+    async def get_roster_board(
+        self,
+        db: AsyncSession,
+        *,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        base: Optional[str],
+    ) -> AsyncResult:
+        """Rows of every crew member's flights departing in the window, for ``board_response``.
+
+        The window starts now and lasts ``DEFAULT_WINDOW_DAYS`` unless given,
+        naive times are UTC, and it may span at most ``MAX_WINDOW_DAYS``.
+        """
+        start = as_utc(start) if start else datetime.now(timezone.utc)
+        end = as_utc(end) if end else start + timedelta(days=DEFAULT_WINDOW_DAYS)
+        if end <= start:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="to must be after from",
+            )
+        if end - start > timedelta(days=MAX_WINDOW_DAYS):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"the window can span at most {MAX_WINDOW_DAYS} days",
+            )
+        return await self.repo.roster_board(db, start=start, end=end, base=base, batch_size=BOARD_BATCH_SIZE)
+
+
+def _flight_date(date_str: str) -> Date:
+    parsed = parse_flight_date(date_str)
+    if parsed is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date must be YYYY-MM-DD or like 'Feb 1'",
+        )
+    return parsed
+
+
+def _build_schedule(crew_member_id: str, flights: Sequence[Flight]) -> CrewScheduleResponse:
+    # flights in departure order, with the rest between each pair
+    schedule: list[ScheduleItem] = []
+
+    for i, flight in enumerate(flights):
+        schedule.append(ScheduleItem(
+            type="flight",
+            flight=FlightRead.model_validate(flight),
+        ))
+
+        if i < len(flights) - 1:
+            rest_hours, date = rest_gap(flight.arrival, flights[i + 1].departure)
+
             schedule.append(ScheduleItem(
-                type="flight",
-                flight=FlightRead.model_validate(flight),
+                type="rest",
+                rest_hours=rest_hours,
+                date=date,
             ))
-            
-            if i < len(flights) - 1:
-                next_flight = flights[i + 1]
-                current_arrival = self._parse_flight_time(flight.arrival)
-                next_departure = self._parse_flight_time(next_flight.departure)
-                
-                if current_arrival and next_departure:
-                    rest_hours = (next_departure - current_arrival).total_seconds() / 3600
-                    date_str = next_flight.departure.split(",")[0].strip()
-                    
-                    schedule.append(ScheduleItem(
-                        type="rest",
-                        rest_hours=round(rest_hours, 1),
-                        date=date_str,
-                    ))
-
-        return CrewScheduleResponse(
-            crew_member_id=crew_member_id,
-            schedule=schedule,
-        )
+
+    return CrewScheduleResponse(
+        crew_member_id=crew_member_id,
+        schedule=schedule,
+    )
@@ -0,0 +1,98 @@
+"""Parsing of flight times, shared by every domain.
+
+Flight times are ``TIMESTAMPTZ`` in the database, but the API still accepts
+the legacy text form ``"Feb 1, 06:00"`` next to ISO-8601. Everything here
+returns timezone-aware UTC datetimes. Legacy values carry no year and are
+read in ``legacy_year()``, the current UTC year, everywhere.
+
+Text is parsed through a bounded LRU cache keyed on the raw string, because
+the same few values are parsed over and over inside validation loops.
+"""
+from __future__ import annotations
+
+import re
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import Optional, Union
+
+
+PARSE_CACHE_SIZE = 4096
+
+_MONTHS = {
+    name: number
+    for number, name in enumerate(
+        ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"),
+        start=1,
+    )
+}
+_LEGACY_TIME = re.compile(r"^([A-Za-z]{3})\s+(\d{1,2}),\s*(\d{1,2}):(\d{2})$")
+_LEGACY_DATE = re.compile(r"^([A-Za-z]{3})\s+(\d{1,2})$")
+
+
+def legacy_year() -> int:
+    """Year assumed for legacy values, which do not carry one."""
+    return datetime.now(timezone.utc).year
+
+
+def as_utc(moment: datetime) -> datetime:
+    """``moment`` in UTC; naive values are taken to be UTC already."""
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+def parse_flight_time(value: Union[str, datetime, None]) -> Optional[datetime]:
+    """ISO-8601 or legacy ``"Feb 1, 06:00"`` text as a UTC datetime, ``None`` when unparseable."""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return as_utc(value)
+    return _parse_time_text(value, legacy_year())
+
+
+def parse_flight_date(value: str) -> Optional[date]:
+    """ISO ``YYYY-MM-DD`` or legacy ``"Feb 1"`` text as a date, ``None`` when unparseable."""
+    return _parse_date_text(value, legacy_year())
+
+
+def parse_cache_info():
+    return _parse_time_text.cache_info()
+
+
+# the year is part of the cache key so cached legacy values roll over on 1 January
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_time_text(value: str, year: int) -> Optional[datetime]:
+    value = value.strip()
+    if value[:1].isdigit():
+        try:
+            return as_utc(datetime.fromisoformat(value))
+        except ValueError:
+            return None
+
+    match = _LEGACY_TIME.match(value)
+    if not match:
+        return None
+    month, day, hour, minute = match.groups()
+    try:
+        return datetime(year, _MONTHS[month.lower()], int(day), int(hour), int(minute), tzinfo=timezone.utc)
+    except (KeyError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_date_text(value: str, year: int) -> Optional[date]:
+    value = value.strip()
+    if value[:1].isdigit():
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            return None
+
+    match = _LEGACY_DATE.match(value)
+    if not match:
+        return None
+    month, day = match.groups()
+    try:
+        return date(year, _MONTHS[month.lower()], int(day))
+    except (KeyError, ValueError):
+        return None
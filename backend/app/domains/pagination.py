@@ -0,0 +1,46 @@
+"""Opaque keyset cursors for the list endpoints.
+
+Lists are ordered by primary key. A cursor holds the key of the last row of a
+page, the next page is ``WHERE id > key`` and starts from the index instead of
+reading and discarding ``offset`` rows. Cursors are base64 JSON tagged with the
+list they belong to, so one from ``/crew`` is rejected by ``/flights``.
+"""
+import base64
+import binascii
+import json
+from typing import Any, Optional, Sequence
+
+from fastapi import HTTPException, Response, status
+
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(kind: str, key: Any) -> str:
+    payload = json.dumps([kind, key], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], kind: str, key_type: type, *, offset: int = 0) -> Any:
+    """Key stored in ``cursor``, ``None`` without one; 400 when it is not a ``kind`` cursor."""
+    if cursor is None:
+        return None
+    if offset:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="use either after or offset, not both",
+        )
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        tag, key = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        tag, key = None, None
+    if tag != kind or not isinstance(key, key_type):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="invalid cursor")
+    return key
+
+
+def set_next_cursor(response: Response, kind: str, rows: Sequence, limit: int) -> None:
+    # a short page is the last one; a full page may be too, then the next one is empty
+    if rows and len(rows) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(kind, rows[-1].id)
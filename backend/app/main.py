@@ -1,4 +1,10 @@
+import time
+
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+
+from app.database.engine import ASYNC_DB_ENGINE, ASYNC_REPLICA_ENGINE, DB_ENGINE, REPLICA_ROUTER, pool_status
 
 # Import models first to avoid circular import issues with SQLAlchemy relationships
 # This ensures all models are registered before relationships are configured
@@ -9,6 +15,7 @@ from app.domains.crew_assignment.models import CrewAssignment
 from app.domains.crew_management.router import router as crew_router
 from app.domains.flights.router import router as flight_router
 from app.domains.crew_assignment.router import router as assignment_router
+from app.domains.flights.schedule_cache import SCHEDULE_CACHE
 
 app = FastAPI(
     title="Crewboard Project",
@@ -28,6 +35,39 @@ app.include_router(assignment_router)
 async def health_check():
     return {"status": 200}
 
+@app.get("/health/db")
+def database_health_check():
+    # pool numbers are read before the ping so the ping's own checkout is not counted
+    pool = pool_status(DB_ENGINE)
+    async_pool = pool_status(ASYNC_DB_ENGINE)
+    replica = REPLICA_ROUTER.status()
+    if ASYNC_REPLICA_ENGINE is not None:
+        replica["pool"] = pool_status(ASYNC_REPLICA_ENGINE)
+    started = time.perf_counter()
+    try:
+        with DB_ENGINE.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        reachable = True
+    except Exception:
+        reachable = False
+    code = 200 if reachable else 503
+    return JSONResponse(
+        status_code=code,
+        content={
+            "status": code,
+            "reachable": reachable,
+            "ping_ms": round((time.perf_counter() - started) * 1000, 2),
+            "pool": pool,
+            "async_pool": async_pool,
+            # the replica does not affect the status code, reads fall back to the primary
+            "replica": replica,
+        },
+    )
+
+@app.get("/health/cache")
+async def cache_health_check():
+    return {"schedule": SCHEDULE_CACHE.stats()}
+
 @app.get("/")
 async def root():
     return {"message": "Welcome on board"}
@@ -0,0 +1,71 @@
+"""Time the serialisation of a flights list page, before and after the row renderer.
+
+    python -m benchmarks.list_responses [ROWS] [REPEAT]
+
+Rows come from the database (``generate_series``, nothing is read from the
+tables) so they are the psycopg values a list query returns. Each path is
+timed from the fetched rows to the response body:
+
+* ``models + response_model``: a ``FlightRead`` per row, then FastAPI's
+  validation against ``list[FlightRead]`` and its pydantic JSON encoding
+* ``models + stdlib json``: the same, dumped to Python and encoded by
+  ``json.dumps``, as FastAPI does when the route has a response class
+* ``row renderer``: ``RowListRenderer``, one ``TypeAdapter`` validation and orjson
+"""
+import asyncio
+import json
+import sys
+import timeit
+
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from sqlalchemy import text
+
+from app.database.engine import DB_ENGINE
+from app.domains.flights.schemas import FlightRead
+from app.domains.responses import RowListRenderer
+
+
+ROWS_SQL = text("""
+    SELECT 'B' || n AS id, 'FRA' AS "From", 'LIS' AS "To", 'A320' AS aircraft,
+           timestamptz '2026-03-01 06:00Z' + n * interval '1 hour' AS departure,
+           timestamptz '2026-03-01 09:15Z' + n * interval '1 hour' AS arrival,
+           3.25::float8 AS duty_hrs
+    FROM generate_series(1, :rows) AS n
+""")
+
+
+def main(rows: int = 500, repeat: int = 200) -> None:
+    with DB_ENGINE.connect() as conn:
+        page = conn.execute(ROWS_SQL, {"rows": rows}).all()
+
+    field = create_model_field(name="Response_list_flights", type_=list[FlightRead], mode="serialization")
+    renderer = RowListRenderer(FlightRead)
+    loop = asyncio.new_event_loop()
+
+    def models(dump_json: bool) -> bytes:
+        content = loop.run_until_complete(serialize_response(
+            field=field,
+            response_content=[FlightRead(**row._mapping) for row in page],
+            dump_json=dump_json,
+        ))
+        return content if dump_json else json.dumps(content).encode()
+
+    paths = {
+        "models + response_model": lambda: models(True),
+        "models + stdlib json": lambda: models(False),
+        "row renderer": lambda: renderer.render(page).body,
+    }
+    bodies = {name: json.loads(path()) for name, path in paths.items()}
+    assert all(body == bodies["row renderer"] for body in bodies.values()), "paths disagree"
+
+    print(f"{rows} rows, best of 5 x {repeat}")
+    baseline = None
+    for name, path in paths.items():
+        ms = min(timeit.repeat(path, number=repeat, repeat=5)) / repeat * 1000
+        baseline = baseline or ms
+        print(f"  {name:<24} {ms:8.3f} ms  x{baseline / ms:.1f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,49 @@
+from alembic import context
+from sqlalchemy import engine_from_config, pool
+
+# Import every model so autogenerate sees the whole schema
+from app.database.engine import DB_URL
+from app.domains.models import AppBase
+from app.domains.crew_management.models import CrewMember  # noqa: F401
+from app.domains.flights.models import Flight  # noqa: F401
+from app.domains.crew_assignment.models import CrewAssignment  # noqa: F401
+
+config = context.config
+target_metadata = AppBase.metadata
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=DB_URL.render_as_string(hide_password=False),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    # a connection handed in through config.attributes (seed.py, tests) wins over DB_URL
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    connectable = engine_from_config(
+        {"sqlalchemy.url": DB_URL.render_as_string(hide_password=False)},
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+    with connectable.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
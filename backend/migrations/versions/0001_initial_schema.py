@@ -0,0 +1,61 @@
+"""initial schema
+
+The tables as seed.py used to create them. Everything is IF NOT EXISTS so a
+database created by the old seed script can be stamped forward by simply
+running ``alembic upgrade head``.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS crew_members (
+            id VARCHAR(10) PRIMARY KEY,
+            Name VARCHAR(100) NOT NULL,
+            Email VARCHAR(100) NOT NULL,
+            Qualifications VARCHAR(255),
+            Base VARCHAR(10)
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS flights (
+            id VARCHAR(10) PRIMARY KEY,
+            "From" VARCHAR(10) NOT NULL,
+            "To" VARCHAR(10) NOT NULL,
+            Aircraft VARCHAR(20) NOT NULL,
+            Departure VARCHAR(50) NOT NULL,
+            Arrival VARCHAR(50) NOT NULL,
+            "Duty_hrs" FLOAT NOT NULL
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS crew_assignments (
+            id BIGSERIAL PRIMARY KEY,
+
+            flight_id VARCHAR(10) NOT NULL REFERENCES flights(id) ON DELETE CASCADE,
+            crew_employee_id VARCHAR(10) NOT NULL REFERENCES crew_members(id) ON DELETE CASCADE,
+
+            created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            removed_at TIMESTAMPTZ NULL,
+
+            CONSTRAINT uq_flight_crew UNIQUE (flight_id, crew_employee_id)
+        )
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS crew_assignments")
+    op.execute("DROP TABLE IF EXISTS flights")
+    op.execute("DROP TABLE IF EXISTS crew_members")
@@ -0,0 +1,103 @@
+"""flight departure/arrival as TIMESTAMPTZ
+
+Converts the free-text ``flights.departure`` / ``flights.arrival`` columns to
+``TIMESTAMPTZ`` with B-tree indexes.
+
+ISO-8601 values are cast in SQL. Legacy values such as ``"Feb 1, 06:00"``
+carry no year and no zone; they are read as UTC in the year given with
+``alembic -x legacy_year=2026 upgrade head`` (the current UTC year when not
+given). Any value that matches neither format aborts the migration and lists
+the offending flight ids, nothing is guessed.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+LEGACY_FORMAT = "%Y, %b %d, %H:%M"
+ISO_PATTERN = r"^\d{4}-\d{2}-\d{2}"
+BATCH_SIZE = 5000
+
+
+def _legacy_year() -> int:
+    value = context.get_x_argument(as_dictionary=True).get("legacy_year")
+    return int(value) if value else datetime.now(timezone.utc).year
+
+
+def _parse_legacy(value: str, year: int) -> datetime:
+    return datetime.strptime(f"{year}, {value.strip()}", LEGACY_FORMAT).replace(tzinfo=timezone.utc)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    # naive ISO strings are cast in the session zone, pin it so they read as UTC
+    conn.execute(sa.text("SET LOCAL timezone = 'UTC'"))
+
+    op.add_column("flights", sa.Column("departure_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("flights", sa.Column("arrival_at", sa.DateTime(timezone=True), nullable=True))
+
+    for column in ("departure", "arrival"):
+        conn.execute(sa.text(
+            f"UPDATE flights SET {column}_at = {column}::timestamptz WHERE {column} ~ :iso"
+        ), {"iso": ISO_PATTERN})
+
+    year = _legacy_year()
+    legacy = conn.execute(sa.text(
+        "SELECT id, departure, arrival, departure_at, arrival_at FROM flights "
+        "WHERE departure_at IS NULL OR arrival_at IS NULL"
+    )).all()
+
+    updates, unparseable = [], []
+    for flight_id, departure, arrival, departure_at, arrival_at in legacy:
+        try:
+            updates.append({
+                "id": flight_id,
+                "departure_at": departure_at or _parse_legacy(departure, year),
+                "arrival_at": arrival_at or _parse_legacy(arrival, year),
+            })
+        except ValueError:
+            unparseable.append(flight_id)
+
+    if unparseable:
+        raise RuntimeError(
+            "flights with unparseable departure/arrival, fix them and re-run: "
+            + ", ".join(sorted(unparseable))
+        )
+
+    for start in range(0, len(updates), BATCH_SIZE):
+        conn.execute(
+            sa.text("UPDATE flights SET departure_at = :departure_at, arrival_at = :arrival_at WHERE id = :id"),
+            updates[start:start + BATCH_SIZE],
+        )
+
+    op.drop_column("flights", "departure")
+    op.drop_column("flights", "arrival")
+    op.alter_column("flights", "departure_at", new_column_name="departure", nullable=False)
+    op.alter_column("flights", "arrival_at", new_column_name="arrival", nullable=False)
+    op.create_index("ix_flights_departure", "flights", ["departure"])
+    op.create_index("ix_flights_arrival", "flights", ["arrival"])
+
+
+def downgrade() -> None:
+    # the legacy text format is lost, values come back as ISO-8601 UTC strings
+    op.drop_index("ix_flights_arrival", table_name="flights")
+    op.drop_index("ix_flights_departure", table_name="flights")
+    for column in ("departure", "arrival"):
+        op.alter_column(
+            "flights",
+            column,
+            type_=sa.String(50),
+            postgresql_using=f"to_char({column} AT TIME ZONE 'UTC', 'YYYY-MM-DD\"T\"HH24:MI:SS\"Z\"')",
+        )
@@ -0,0 +1,73 @@
+"""partial and composite indexes for the hot queries
+
+- ``crew_assignments (crew_employee_id) WHERE removed_at IS NULL`` for roster
+  and schedule lookups, which otherwise scan the table because
+  ``uq_flight_crew`` is led by ``flight_id``
+- ``crew_assignments (flight_id) WHERE removed_at IS NULL``, smaller than the
+  unique constraint and only holding live rows
+- ``flights ("From", "To")`` for the route filters of ``GET /flights``
+- a ``pg_trgm`` GIN index on ``flights.aircraft`` for the ``ILIKE '%x%'`` filter
+
+``pg_trgm`` ships with the stock postgres images. On a server without it the
+trigram index is skipped with a warning and the rest still applies; once the
+extension is installed, downgrade to 0002 and upgrade again to add it.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+log = logging.getLogger("alembic.runtime.migration")
+
+
+def _trgm_available(conn) -> bool:
+    return conn.execute(sa.text(
+        "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'"
+    )).first() is not None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_crew_assignments_active_crew",
+        "crew_assignments",
+        ["crew_employee_id"],
+        postgresql_where=sa.text("removed_at IS NULL"),
+    )
+    op.create_index(
+        "ix_crew_assignments_active_flight",
+        "crew_assignments",
+        ["flight_id"],
+        postgresql_where=sa.text("removed_at IS NULL"),
+    )
+    op.create_index("ix_flights_from_to", "flights", ["From", "To"])
+
+    if not _trgm_available(op.get_bind()):
+        log.warning("pg_trgm is not available, skipping ix_flights_aircraft_trgm")
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_flights_aircraft_trgm",
+        "flights",
+        ["aircraft"],
+        postgresql_using="gin",
+        postgresql_ops={"aircraft": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    # the extension is left installed, other objects may depend on it
+    op.execute("DROP INDEX IF EXISTS ix_flights_aircraft_trgm")
+    op.drop_index("ix_flights_from_to", table_name="flights")
+    op.drop_index("ix_crew_assignments_active_flight", table_name="crew_assignments")
+    op.drop_index("ix_crew_assignments_active_crew", table_name="crew_assignments")
@@ -0,0 +1,53 @@
+"""crew qualifications as rows
+
+Moves the comma-separated ``crew_members.qualifications`` string into
+``crew_qualifications (crew_id, aircraft_type)``, one row per type, with an
+``(aircraft_type, crew_id)`` index for lookups by aircraft type. Codes are
+trimmed and empty entries dropped, matching how the string used to be read.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "crew_qualifications",
+        sa.Column("crew_id", sa.String(10), sa.ForeignKey("crew_members.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("aircraft_type", sa.String(20), primary_key=True),
+    )
+    op.create_index("ix_crew_qualifications_aircraft_type", "crew_qualifications", ["aircraft_type", "crew_id"])
+
+    op.execute("""
+        INSERT INTO crew_qualifications (crew_id, aircraft_type)
+        SELECT DISTINCT id, trim(code)
+        FROM crew_members, unnest(string_to_array(qualifications, ',')) AS code
+        WHERE trim(code) <> ''
+    """)
+    op.drop_column("crew_members", "qualifications")
+
+
+def downgrade() -> None:
+    op.add_column("crew_members", sa.Column("qualifications", sa.String(255), nullable=True))
+    op.execute("""
+        UPDATE crew_members SET qualifications = q.codes
+        FROM (
+            SELECT crew_id, string_agg(aircraft_type, ',' ORDER BY aircraft_type) AS codes
+            FROM crew_qualifications
+            GROUP BY crew_id
+        ) AS q
+        WHERE q.crew_id = crew_members.id
+    """)
+    op.drop_index("ix_crew_qualifications_aircraft_type", table_name="crew_qualifications")
+    op.drop_table("crew_qualifications")
@@ -0,0 +1,42 @@
+"""crew duty day ledger
+
+``crew_duty_days (crew_id, duty_date, total_hours)`` holds the duty hours of
+each crew member's active assignments per UTC departure date, for the daily
+duty limit. It is filled here from the current assignments and kept up to
+date by the application from then on.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "crew_duty_days",
+        sa.Column("crew_id", sa.String(10), sa.ForeignKey("crew_members.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("duty_date", sa.Date, primary_key=True),
+        sa.Column("total_hours", sa.Numeric(8, 3), nullable=False),
+    )
+
+    op.execute("""
+        INSERT INTO crew_duty_days (crew_id, duty_date, total_hours)
+        SELECT a.crew_employee_id, (f.departure AT TIME ZONE 'UTC')::date, sum(f."Duty_hrs"::numeric)
+        FROM crew_assignments AS a JOIN flights AS f ON f.id = a.flight_id
+        WHERE a.removed_at IS NULL
+        GROUP BY 1, 2
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table("crew_duty_days")
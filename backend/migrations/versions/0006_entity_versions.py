@@ -0,0 +1,33 @@
+"""entity versions for ETags
+
+``flights.version`` and ``crew_members.version`` count changes to the row
+(and, for crew, to its qualifications). ``crew_members.schedule_version``
+counts changes to the crew member's schedule: assignments made or removed and
+updates to assigned flights. They start at 1 and only ever go up.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("flights", sa.Column("version", sa.Integer, nullable=False, server_default="1"))
+    op.add_column("crew_members", sa.Column("version", sa.Integer, nullable=False, server_default="1"))
+    op.add_column("crew_members", sa.Column("schedule_version", sa.Integer, nullable=False, server_default="1"))
+
+
+def downgrade() -> None:
+    op.drop_column("crew_members", "schedule_version")
+    op.drop_column("crew_members", "version")
+    op.drop_column("flights", "version")
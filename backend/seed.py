@@ -1,4 +1,8 @@
 from datetime import datetime
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
 from sqlalchemy import create_engine, text, URL
 from dotenv import load_dotenv
 import os
@@ -6,49 +10,11 @@ import os
 load_dotenv()
 
 def create_tables(engine):
-    
-    with engine.connect() as conn:
-        # Create crew_members table
-        conn.execute(text("""
-            CREATE TABLE IF NOT EXISTS crew_members (
-                id VARCHAR(10) PRIMARY KEY,
-                Name VARCHAR(100) NOT NULL,
-                Email VARCHAR(100) NOT NULL,
-                Qualifications VARCHAR(255),
-                Base VARCHAR(10)
-            )
-        """))
-        
-        # Create flights table
-        conn.execute(text("""
-            CREATE TABLE IF NOT EXISTS flights (
-                id VARCHAR(10) PRIMARY KEY,
-                "From" VARCHAR(10) NOT NULL,
-                "To" VARCHAR(10) NOT NULL,
-                Aircraft VARCHAR(20) NOT NULL,
-                Departure VARCHAR(50) NOT NULL,
-                Arrival VARCHAR(50) NOT NULL,
-                "Duty_hrs" FLOAT NOT NULL
-            )
-        """))
-
-        # Create assignments table
-
-        conn.execute(text("""
-            CREATE TABLE IF NOT EXISTS crew_assignments (
-                id BIGSERIAL PRIMARY KEY,
-
-                flight_id VARCHAR(10) NOT NULL REFERENCES flights(id) ON DELETE CASCADE,
-                crew_employee_id VARCHAR(10) NOT NULL REFERENCES crew_members(id) ON DELETE CASCADE,
-
-                created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
-                removed_at TIMESTAMPTZ NULL,
-
-                CONSTRAINT uq_flight_crew UNIQUE (flight_id, crew_employee_id)
-            );
-        """))
-    
-        conn.commit()
+    # the schema is owned by the alembic migrations in migrations/
+    config = Config(str(Path(__file__).with_name("alembic.ini")))
+    with engine.begin() as conn:
+        config.attributes["connection"] = conn
+        command.upgrade(config, "head")
 
 
 def seed_crew_members(engine):
@@ -65,26 +31,35 @@ def seed_crew_members(engine):
         for member in crew_members:
             conn.execute(
                 text("""
-                    INSERT INTO crew_members (id, Name, Email, Qualifications, Base)
-                    VALUES (:id, :Name, :Email, :Qualifications, :Base)
+                    INSERT INTO crew_members (id, Name, Email, Base)
+                    VALUES (:id, :Name, :Email, :Base)
                     ON CONFLICT (id) DO NOTHING
                 """),
                 member
             )
+            for code in member["Qualifications"].split(","):
+                conn.execute(
+                    text("""
+                        INSERT INTO crew_qualifications (crew_id, aircraft_type)
+                        VALUES (:id, :code)
+                        ON CONFLICT DO NOTHING
+                    """),
+                    {"id": member["id"], "code": code.strip()},
+                )
         conn.commit()
 
 
 def seed_flights(engine):
     
     flights = [
-        {"id": "F1", "From": "FRA", "To": "LIS", "Aircraft": "A320", "Departure": "Feb 1, 06:00", "Arrival": "Feb 1, 08:30", "Duty_hrs": 2.5},
-        {"id": "F2", "From": "FRA", "To": "ARN", "Aircraft": "B737", "Departure": "Feb 1, 07:00", "Arrival": "Feb 1, 09:30", "Duty_hrs": 2.5},
-        {"id": "F3", "From": "LIS", "To": "FRA", "Aircraft": "A320", "Departure": "Feb 1, 14:00", "Arrival": "Feb 1, 16:30", "Duty_hrs": 2.5},
-        {"id": "F4", "From": "ARN", "To": "VIE", "Aircraft": "E190", "Departure": "Feb 1, 20:00", "Arrival": "Feb 1, 22:30", "Duty_hrs": 2.5},
-        {"id": "F5", "From": "FRA", "To": "WAW", "Aircraft": "B737", "Departure": "Feb 2, 06:00", "Arrival": "Feb 2, 08:00", "Duty_hrs": 2.0},
-        {"id": "F6", "From": "VIE", "To": "FRA", "Aircraft": "A320", "Departure": "Feb 2, 12:00", "Arrival": "Feb 2, 13:30", "Duty_hrs": 1.5},
-        {"id": "F7", "From": "WAW", "To": "ARN", "Aircraft": "E190", "Departure": "Feb 3, 08:00", "Arrival": "Feb 3, 10:00", "Duty_hrs": 2.0},
-        {"id": "F8", "From": "FRA", "To": "LIS", "Aircraft": "B737", "Departure": "Feb 3, 13:00", "Arrival": "Feb 3, 15:30", "Duty_hrs": 2.5},
+        {"id": "F1", "From": "FRA", "To": "LIS", "Aircraft": "A320", "Departure": "2026-02-01T06:00:00Z", "Arrival": "2026-02-01T08:30:00Z", "Duty_hrs": 2.5},
+        {"id": "F2", "From": "FRA", "To": "ARN", "Aircraft": "B737", "Departure": "2026-02-01T07:00:00Z", "Arrival": "2026-02-01T09:30:00Z", "Duty_hrs": 2.5},
+        {"id": "F3", "From": "LIS", "To": "FRA", "Aircraft": "A320", "Departure": "2026-02-01T14:00:00Z", "Arrival": "2026-02-01T16:30:00Z", "Duty_hrs": 2.5},
+        {"id": "F4", "From": "ARN", "To": "VIE", "Aircraft": "E190", "Departure": "2026-02-01T20:00:00Z", "Arrival": "2026-02-01T22:30:00Z", "Duty_hrs": 2.5},
+        {"id": "F5", "From": "FRA", "To": "WAW", "Aircraft": "B737", "Departure": "2026-02-02T06:00:00Z", "Arrival": "2026-02-02T08:00:00Z", "Duty_hrs": 2.0},
+        {"id": "F6", "From": "VIE", "To": "FRA", "Aircraft": "A320", "Departure": "2026-02-02T12:00:00Z", "Arrival": "2026-02-02T13:30:00Z", "Duty_hrs": 1.5},
+        {"id": "F7", "From": "WAW", "To": "ARN", "Aircraft": "E190", "Departure": "2026-02-03T08:00:00Z", "Arrival": "2026-02-03T10:00:00Z", "Duty_hrs": 2.0},
+        {"id": "F8", "From": "FRA", "To": "LIS", "Aircraft": "B737", "Departure": "2026-02-03T13:00:00Z", "Arrival": "2026-02-03T15:30:00Z", "Duty_hrs": 2.5},
     ]
     
     with engine.connect() as conn:
@@ -10,6 +10,9 @@ import pytest
 from sqlalchemy import create_engine, URL, text
 from sqlalchemy.orm import sessionmaker, Session
 
+from app.domains.crew_assignment.repository import CrewAssignmentRepository
+from app.domains.flights.schedule_cache import SCHEDULE_CACHE
+
 
 TEST_DB_URL = URL.create(
     "postgresql+psycopg",
@@ -41,12 +44,22 @@ def setup_test_data(db_session: Session):
     db_session.commit()
 
     db_session.execute(text("""
-        INSERT INTO crew_members (id, name, email, qualifications, base) VALUES
-        ('E0001', 'Alice Meyer', 'alice.meyer@example.com', 'A320', 'FRA'),
-        ('E0002', 'Bob Khan', 'bob.khan@example.com', 'A320', 'FRA'),
-        ('E0003', 'Carla Silva', 'carla.silva@example.com', 'B737', 'LIS'),
-        ('E0004', 'Dan Novak', 'dan.novak@example.com', 'A320,B737', 'FRA'),
-        ('E0005', 'Eve Ionescu', 'eve.ionescu@example.com', 'E190', 'FRA')
+        INSERT INTO crew_members (id, name, email, base) VALUES
+        ('E0001', 'Alice Meyer', 'alice.meyer@example.com', 'FRA'),
+        ('E0002', 'Bob Khan', 'bob.khan@example.com', 'FRA'),
+        ('E0003', 'Carla Silva', 'carla.silva@example.com', 'LIS'),
+        ('E0004', 'Dan Novak', 'dan.novak@example.com', 'FRA'),
+        ('E0005', 'Eve Ionescu', 'eve.ionescu@example.com', 'FRA')
+    """))
+
+    db_session.execute(text("""
+        INSERT INTO crew_qualifications (crew_id, aircraft_type) VALUES
+        ('E0001', 'A320'),
+        ('E0002', 'A320'),
+        ('E0003', 'B737'),
+        ('E0004', 'A320'),
+        ('E0004', 'B737'),
+        ('E0005', 'E190')
     """))
 
     db_session.execute(text("""
@@ -75,7 +88,10 @@ def setup_test_data(db_session: Session):
         ('FO030', 'E0004', '2026-02-25T09:20:00Z')
     """))
     
+    # the fixture rewrites every table behind the repositories' backs
+    CrewAssignmentRepository().rebuild_duty_days(db_session)
     db_session.commit()
+    SCHEDULE_CACHE.clear()
     
     yield
     
@@ -1,5 +1,6 @@
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import text
 from app.main import app
 
 client = TestClient(app)
@@ -52,3 +53,812 @@ class TestAutoAssign:
         for assignment in data["assigned"]:
             assert "flight_id" in assignment
             assert "crew_member_id" in assignment
+
+    def test_auto_assign_persists_planned_rows(self, db_session):
+        data = client.post("/assignments/auto").json()
+
+        planned = {(a["flight_id"], a["crew_member_id"]) for a in data["assigned"]}
+        stored = {
+            (a["flight_id"], a["crew_employee_id"])
+            for a in client.get("/assignments", params={"limit": 500}).json()
+        }
+        assert planned <= stored
+        assert len(stored) == 4 + len(planned)
+
+        # everything is covered or failed now, a second run plans nothing new
+        again = client.post("/assignments/auto").json()
+        assert again["total_assigned"] == 0
+
+    def test_auto_assign_strategies(self, db_session):
+        fixture_ids = {a["id"] for a in client.get("/assignments", params={"limit": 500}).json()}
+
+        def remove_planned():
+            # through the API, so the duty ledger and schedule versions follow
+            for assignment in client.get("/assignments", params={"limit": 500}).json():
+                if assignment["id"] not in fixture_ids:
+                    assert client.delete(f"/assignments/{assignment['id']}").status_code == 200
+
+        greedy = client.post("/assignments/auto", params={"strategy": "greedy"}).json()
+        remove_planned()
+
+        for strategy in ("matching", "sweep"):
+            data = client.post("/assignments/auto", params={"strategy": strategy}).json()
+            assert data["strategy"] == strategy
+            assert data["total_assigned"] >= greedy["total_assigned"]
+            remove_planned()
+
+        ledger = TestDutyLedger()
+        assert ledger.ledger(db_session) == ledger.rebuilt(db_session)
+
+    def test_bulk_create_past_the_parameter_limit(self, db_session):
+        from app.domains.crew_assignment.repository import CrewAssignmentRepository
+
+        # three parameters a row would be 66k, libpq takes at most 65535
+        count = 22000
+        db_session.execute(text("""
+            INSERT INTO flights (id, "From", "To", aircraft, departure, arrival, "Duty_hrs")
+            SELECT 'P' || n, 'FRA', 'LIS', 'A320',
+                   timestamptz '2027-01-01Z' + n * interval '1 day',
+                   timestamptz '2027-01-01 02:00Z' + n * interval '1 day', 2.0
+            FROM generate_series(1, :count) AS n
+        """), {"count": count})
+        db_session.commit()
+
+        pairs = [(f"P{n}", "E0005") for n in range(1, count + 1)]
+        CrewAssignmentRepository().bulk_create(db_session, pairs)
+        active = db_session.execute(text(
+            "SELECT count(*) FROM crew_assignments WHERE crew_employee_id = 'E0005' AND removed_at IS NULL"
+        )).scalar_one()
+        duty_days = db_session.execute(text(
+            "SELECT count(*) FROM crew_duty_days WHERE crew_id = 'E0005'"
+        )).scalar_one()
+        db_session.rollback()
+        assert (active, duty_days) == (count, count)
+
+    def test_auto_assign_rejects_unknown_strategy(self, db_session):
+        response = client.post("/assignments/auto", params={"strategy": "random"})
+        assert response.status_code == 422
+
+    def test_auto_assign_window_and_aircraft(self, db_session):
+        data = client.post(
+            "/assignments/auto",
+            params={"from": "2026-03-05T00:00:00Z", "to": "2026-03-06T00:00:00Z", "aircraft": "A320"},
+        ).json()
+
+        assert data["total_flights"] == 3
+        assert {a["flight_id"] for a in data["assigned"]} <= {"AA200", "AA201", "AA203"}
+
+    def test_auto_assign_window_sees_rosters_around_it(self, db_session):
+        # FD021 (E0002) arrives 09:30, so E0002 lacks rest for FD022 at 12:00
+        # even though FD021 departs before the window
+        data = client.post(
+            "/assignments/auto",
+            params={"from": "2026-03-04T10:00:00Z", "to": "2026-03-04T23:00:00Z", "dry_run": True},
+        ).json()
+
+        assert data["total_flights"] == 1
+        assert [a["flight_id"] for a in data["assigned"]] == ["FD022"]
+        assert data["assigned"][0]["crew_member_id"] != "E0002"
+
+    def test_auto_assign_dry_run_writes_nothing(self, db_session):
+        before = client.get("/assignments", params={"limit": 500}).json()
+        data = client.post("/assignments/auto", params={"dry_run": True}).json()
+
+        assert data["dry_run"] is True
+        assert data["total_assigned"] > 0
+        assert client.get("/assignments", params={"limit": 500}).json() == before
+
+    def test_auto_assign_rejects_inverted_window(self, db_session):
+        response = client.post(
+            "/assignments/auto",
+            params={"from": "2026-03-06T00:00:00Z", "to": "2026-03-05T00:00:00Z"},
+        )
+        assert response.status_code == 400
+
+    def test_auto_assign_window_mixes_naive_and_aware(self, db_session):
+        # the naive bound is read as UTC
+        data = client.post(
+            "/assignments/auto",
+            params={"from": "2026-03-05T00:00:00", "to": "2026-03-06T00:00:00Z", "aircraft": "A320", "dry_run": True},
+        ).json()
+        assert data["total_flights"] == 3
+
+        response = client.post(
+            "/assignments/auto",
+            params={"from": "2026-03-06T00:00:00Z", "to": "2026-03-05T00:00:00"},
+        )
+        assert response.status_code == 400
+
+
+class TestBatchValidation:
+    def test_batch_matches_single_validation(self, db_session):
+        pairs = [
+            {"flight_id": "FQ001", "crew_employee_id": "E0001"},
+            {"flight_id": "FQ001", "crew_employee_id": "E0003"},
+            {"flight_id": "FR011", "crew_employee_id": "E0001"},
+            {"flight_id": "FD022", "crew_employee_id": "E0002"},
+            {"flight_id": "FO031", "crew_employee_id": "E0004"},
+            {"flight_id": "FR010", "crew_employee_id": "E0001"},
+            {"flight_id": "NOPE", "crew_employee_id": "E0001"},
+            {"flight_id": "FQ001", "crew_employee_id": "E9999"},
+        ]
+        response = client.post("/assignments/validate/batch", json={"pairs": pairs})
+        assert response.status_code == 200
+        results = response.json()
+        assert len(results) == len(pairs)
+
+        for pair, result in zip(pairs, results):
+            single = client.post("/assignments/validate", json=pair).json()
+            assert result["valid"] == single["valid"]
+            assert [e["code"] for e in result["errors"]] == [e["code"] for e in single["errors"]]
+
+
+class TestEligibilityMatrix:
+    def test_matrix_matches_single_validation(self, db_session):
+        response = client.post("/assignments/eligibility", json={})
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["flight_ids"]) == 14
+        assert len(data["crew_ids"]) == 5
+
+        bits = data["violation_bits"]
+        for i, flight_id in enumerate(data["flight_ids"]):
+            for j, crew_id in enumerate(data["crew_ids"]):
+                single = client.post(
+                    "/assignments/validate",
+                    json={"flight_id": flight_id, "crew_employee_id": crew_id},
+                ).json()
+                expected = sum(bits[e["code"]] for e in single["errors"])
+                assert data["violations"][i][j] == expected, (flight_id, crew_id)
+                assert data["eligible"][i][j] == single["valid"]
+
+
+class TestFlightTimes:
+    def test_create_accepts_legacy_and_iso_times(self, db_session):
+        legacy = client.post("/flights", json={
+            "id": "LG100", "From": "FRA", "To": "LIS", "aircraft": "A320",
+            "departure": "Feb 2, 06:00", "arrival": "Feb 2, 08:30", "duty_hrs": 2.5,
+        })
+        iso = client.post("/flights", json={
+            "id": "LG101", "From": "FRA", "To": "LIS", "aircraft": "A320",
+            "departure": "2026-03-07T06:00:00Z", "arrival": "2026-03-07T08:30:00Z", "duty_hrs": 2.5,
+        })
+        assert legacy.status_code == 201
+        assert legacy.json()["departure"].endswith("-02-02T06:00:00Z")
+        assert iso.status_code == 201
+        assert iso.json()["arrival"] == "2026-03-07T08:30:00Z"
+
+    def test_create_rejects_unparseable_time(self, db_session):
+        response = client.post("/flights", json={
+            "id": "LG102", "From": "FRA", "To": "LIS", "aircraft": "A320",
+            "departure": "soon", "arrival": "Feb 2, 08:30", "duty_hrs": 2.5,
+        })
+        assert response.status_code == 422
+
+    def test_schedule_is_chronological(self, db_session):
+        # "Feb 10" sorts before "Feb 9" as text
+        for flight_id, day in (("LG110", 10), ("LG109", 9)):
+            client.post("/flights", json={
+                "id": flight_id, "From": "FRA", "To": "LIS", "aircraft": "E190",
+                "departure": f"Feb {day}, 06:00", "arrival": f"Feb {day}, 08:00", "duty_hrs": 2.0,
+            })
+            client.post("/assignments", json={"flight_id": flight_id, "crew_employee_id": "E0005"})
+
+        schedule = client.get("/flights/schedule/E0005").json()["schedule"]
+        assert [item["flight"]["id"] for item in schedule if item["type"] == "flight"] == ["LG109", "LG110"]
+        assert schedule[1]["rest_hours"] == 22.0
+        assert schedule[1]["date"].endswith("-02-10")
+
+    def test_list_filters_by_departure_date(self, db_session):
+        ids = {f["id"] for f in client.get("/flights", params={"date": "2026-03-04"}).json()}
+        assert ids == {"FD020", "FD021", "FD022"}
+        assert client.get("/flights", params={"date": "not a date"}).status_code == 400
+
+
+class TestCrewQualifications:
+    def test_create_and_replace_qualifications(self, db_session):
+        created = client.post("/crew", json={
+            "id": "E0100", "name": "Nia Park", "email": "nia.park@example.com",
+            "base_airport": "fra", "qualifications": ["b737", "A320", "A320"],
+        })
+        assert created.status_code == 201
+        assert created.json()["qualifications"] == ["A320", "B737"]
+
+        updated = client.patch("/crew/E0100", json={"qualifications": ["B737", "E190"]})
+        assert updated.status_code == 200
+        assert updated.json()["qualifications"] == ["B737", "E190"]
+        assert client.get("/crew/E0100").json()["qualifications"] == ["B737", "E190"]
+
+    def test_qualification_wider_than_the_column_is_rejected(self, db_session):
+        created = client.post("/crew", json={
+            "id": "E0100", "name": "Nia Park", "email": "nia.park@example.com",
+            "base_airport": "FRA", "qualifications": ["A" * 21],
+        })
+        assert created.status_code == 422
+        updated = client.patch("/crew/E0001", json={"qualifications": ["A320", "A" * 21]})
+        assert updated.status_code == 422
+        assert client.get("/crew/E0001").json()["qualifications"] == ["A320"]
+
+    def test_qualified_for_is_an_exact_match(self, db_session):
+        db_session.execute(text("INSERT INTO crew_members (id, name, email, base) VALUES ('E0101', 'Ola', 'ola@example.com', 'FRA')"))
+        db_session.execute(text("INSERT INTO crew_qualifications (crew_id, aircraft_type) VALUES ('E0101', 'A3200')"))
+        db_session.commit()
+
+        ids = {c["id"] for c in client.get("/crew", params={"qualified_for": "a320"}).json()}
+        assert ids == {"E0001", "E0002", "E0004"}
+
+    def test_repository_lookups(self, db_session):
+        from app.domains.crew_management.repository import CrewRepository
+
+        repo = CrewRepository()
+        assert [c.id for c in repo.get_by_qualification(db_session, "B737")] == ["E0003", "E0004"]
+        assert repo.crew_ids_by_qualification(db_session, ["B737", "A350"]) == {
+            "B737": ["E0003", "E0004"],
+            "A350": [],
+        }
+
+
+class TestAsyncReads:
+    def test_reads_match_the_sync_repositories(self, db_session):
+        from app.domains.flights.repository import FlightRepository
+        from app.domains.crew_management.repository import CrewRepository
+
+        flights = client.get("/flights", params={"limit": 500}).json()
+        assert {f["id"] for f in flights} == {f.id for f in FlightRepository().list(db_session, limit=500)}
+        crew = client.get("/crew", params={"limit": 500}).json()
+        assert {c["id"] for c in crew} == {c.id for c in CrewRepository().list(db_session, limit=500)}
+
+        assert client.get("/flights/FQ001").json()["id"] == "FQ001"
+        assert client.get("/crew/E0001").json()["id"] == "E0001"
+
+    def test_reads_see_sync_writes(self, db_session):
+        client.post("/assignments", json={"flight_id": "FQ001", "crew_employee_id": "E0001"})
+        listed = client.get("/assignments", params={"crew_employee_id": "E0001"}).json()
+        assert "FQ001" in {a["flight_id"] for a in listed}
+        schedule = client.get("/flights/schedule/E0001").json()["schedule"]
+        assert "FQ001" in {item["flight"]["id"] for item in schedule if item["type"] == "flight"}
+
+    def test_missing_rows_are_404(self, db_session):
+        assert client.get("/flights/NOPE").status_code == 404
+        assert client.get("/crew/NOPE").status_code == 404
+        assert client.get("/flights/schedule/NOPE").status_code == 404
+
+
+class TestLoadingProfiles:
+    def count_queries(self, path):
+        from sqlalchemy import event
+        from app.database.engine import ASYNC_DB_ENGINE, ASYNC_REPLICA_ENGINE
+
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            # the replica lag check is not part of the request
+            if "pg_is_in_recovery" not in statement:
+                statements.append(statement)
+
+        engines = [e.sync_engine for e in (ASYNC_DB_ENGINE, ASYNC_REPLICA_ENGINE) if e is not None]
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", record)
+        try:
+            assert client.get(path).status_code == 200
+        finally:
+            for engine in engines:
+                event.remove(engine, "before_cursor_execute", record)
+        return len(statements)
+
+    @pytest.mark.parametrize("path", ["/flights", "/crew", "/assignments?include_removed=true"])
+    def test_list_pages_are_one_query(self, db_session, path):
+        assert self.count_queries(path) == 1
+
+    def test_filtered_crew_rows_keep_every_qualification(self, db_session):
+        crew = {c["id"]: c for c in client.get("/crew", params={"qualified_for": "B737"}).json()}
+        assert crew["E0004"]["qualifications"] == ["A320", "B737"]
+
+    def test_relationships_are_never_loaded_implicitly(self, db_session):
+        from sqlalchemy.exc import InvalidRequestError
+        from app.domains.flights.models import Flight
+        from app.domains.crew_management.repository import CrewRepository
+
+        flight = db_session.get(Flight, "FQ001")
+        with pytest.raises(InvalidRequestError):
+            flight.assignments
+        # loaded by the repository's profile
+        assert CrewRepository().get_by_id(db_session, "E0004").qualifications == ["A320", "B737"]
+
+
+class TestCursorPagination:
+    def walk(self, path, limit, **params):
+        ids, cursor, pages = [], None, 0
+        while True:
+            response = client.get(path, params={**params, "limit": limit, **({"after": cursor} if cursor else {})})
+            assert response.status_code == 200
+            ids += [row["id"] for row in response.json()]
+            pages += 1
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                return ids, pages
+
+    def test_walks_every_row_once_in_key_order(self, db_session):
+        flights, pages = self.walk("/flights", 4)
+        assert flights == sorted(f["id"] for f in client.get("/flights").json())
+        assert len(flights) == 14 and pages == 4
+
+        crew, _ = self.walk("/crew", 2)
+        assert crew == ["E0001", "E0002", "E0003", "E0004", "E0005"]
+
+        assignments, _ = self.walk("/assignments", 3)
+        assert assignments == sorted(a["id"] for a in client.get("/assignments").json())
+        assert len(assignments) == 4
+
+    def test_cursor_keeps_filters(self, db_session):
+        flights, _ = self.walk("/flights", 2, From="FRA", aircraft="A320")
+        expected = client.get("/flights", params={"From": "FRA", "aircraft": "A320"}).json()
+        assert flights == sorted(f["id"] for f in expected)
+
+    def test_offset_still_works(self, db_session):
+        first = client.get("/flights", params={"limit": 3}).json()
+        second = client.get("/flights", params={"limit": 3, "offset": 3}).json()
+        cursor = client.get("/flights", params={"limit": 3}).headers["X-Next-Cursor"]
+        assert second == client.get("/flights", params={"limit": 3, "after": cursor}).json()
+        assert {f["id"] for f in first}.isdisjoint(f["id"] for f in second)
+
+    def test_bad_cursors_are_rejected(self, db_session):
+        crew_cursor = client.get("/crew", params={"limit": 1}).headers["X-Next-Cursor"]
+        assert client.get("/flights", params={"after": crew_cursor}).status_code == 400
+        assert client.get("/assignments", params={"after": crew_cursor}).status_code == 400
+        assert client.get("/crew", params={"after": "not-a-cursor"}).status_code == 400
+        assert client.get("/crew", params={"after": crew_cursor, "offset": 1}).status_code == 400
+
+
+class TestExport:
+    def test_ndjson_matches_the_list_endpoints(self, db_session):
+        import json
+
+        response = client.get("/flights/export")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        exported = [json.loads(line) for line in response.text.splitlines()]
+        listed = sorted(client.get("/flights").json(), key=lambda f: f["id"])
+        assert [f["id"] for f in exported] == [f["id"] for f in listed]
+        assert exported[0].keys() == listed[0].keys()
+
+        crew = [json.loads(line) for line in client.get("/crew/export").text.splitlines()]
+        assert {c["id"]: c["qualifications"] for c in crew}["E0004"] == ["A320", "B737"]
+
+    def test_csv_has_a_header_and_one_line_per_row(self, db_session):
+        import csv, io
+
+        response = client.get("/assignments/export", params={"format": "csv"})
+        assert response.status_code == 200
+        assert response.headers["content-disposition"] == 'attachment; filename="assignments.csv"'
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 4
+        assert rows[0].keys() == {"id", "flight_id", "crew_employee_id", "created_at", "removed_at"}
+
+    def test_streams_in_batches(self, db_session):
+        import asyncio
+        from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+        from sqlalchemy.pool import NullPool
+        from app.domains.export import EXPORT_BATCH_SIZE
+        from app.domains.flights.repository import AsyncFlightRepository
+
+        total = EXPORT_BATCH_SIZE * 2 + 5
+        db_session.execute(
+            text("""
+                INSERT INTO flights (id, "From", "To", aircraft, departure, arrival, "Duty_hrs")
+                SELECT 'X' || n, 'FRA', 'LIS', 'A320', now(), now() + interval '1 hour', 1.0
+                FROM generate_series(1, :n) AS n
+            """),
+            {"n": total},
+        )
+        db_session.commit()
+
+        async def partition_sizes():
+            engine = create_async_engine(db_session.get_bind().url, poolclass=NullPool)
+            try:
+                async with AsyncSession(engine) as db:
+                    result = await AsyncFlightRepository().export(db)
+                    return [len(rows) async for rows in result.partitions()]
+            finally:
+                await engine.dispose()
+
+        sizes = asyncio.run(partition_sizes())
+        assert max(sizes) == EXPORT_BATCH_SIZE
+        assert sum(sizes) == total + 14
+        assert len(client.get("/flights/export").text.splitlines()) == total + 14
+
+
+class TestBulkFlights:
+    CSV = (
+        "id,From,To,aircraft,departure,arrival,duty_hrs\n"
+        "BK001,fra,lis,A320,2026-04-01T06:00:00Z,2026-04-01T08:30:00Z,2.5\n"
+        "BK002,FRA,MAD,A320,\"Apr 2, 06:00\",\"Apr 2, 08:00\",2.0\n"
+        "BK003,FRANKFURT,MAD,A320,2026-04-03T06:00:00Z,2026-04-03T08:00:00Z,2.0\n"
+        "BK001,FRA,LIS,A320,2026-04-04T06:00:00Z,2026-04-04T08:30:00Z,2.5\n"
+        "FQ001,FRA,LIS,B737,2026-03-01T08:00:00Z,2026-03-01T10:00:00Z,2.0\n"
+    )
+
+    def test_csv_import_reports_rows_and_skips_existing(self, db_session):
+        response = client.post("/flights/bulk", params={"format": "csv", "on_conflict": "skip"}, content=self.CSV)
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["received"], data["inserted"], data["skipped"], data["rejected"]) == (5, 2, 1, 2)
+        assert [(e["line"], e["id"]) for e in data["errors"]] == [(4, "BK003"), (5, "BK001")]
+
+        assert client.get("/flights/BK001").json()["From"] == "FRA"
+        assert client.get("/flights/BK001").json()["departure"].startswith("2026-04-01T06:00")
+        assert client.get("/flights/FQ001").json()["aircraft"] == "A320"
+
+    def test_aircraft_wider_than_the_column_is_rejected_by_line(self, db_session):
+        body = (
+            "id,From,To,aircraft,departure,arrival,duty_hrs\n"
+            "BK010,FRA,LIS,A320,2026-04-01T06:00:00Z,2026-04-01T08:30:00Z,2.5\n"
+            f"BK011,FRA,LIS,{'A' * 21},2026-04-01T06:00:00Z,2026-04-01T08:30:00Z,2.5\n"
+        )
+        response = client.post("/flights/bulk", params={"format": "csv"}, content=body)
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["inserted"], data["rejected"]) == (1, 1)
+        assert [(e["line"], e["id"]) for e in data["errors"]] == [(3, "BK011")]
+
+    def test_fail_policy_writes_nothing(self, db_session):
+        response = client.post("/flights/bulk", params={"format": "csv"}, content=self.CSV)
+        assert response.status_code == 409
+        assert response.json()["detail"]["errors"] == [
+            {"line": 6, "id": "FQ001", "errors": ["flight id already exists"]}
+        ]
+        assert client.get("/flights/BK001").status_code == 404
+
+    def test_ndjson_upsert_updates_existing(self, db_session):
+        body = "\n".join([
+            '{"id": "FQ001", "From": "FRA", "To": "LIS", "aircraft": "B737", '
+            '"departure": "2026-03-01T08:00:00Z", "arrival": "2026-03-01T10:00:00Z", "duty_hrs": 2.0}',
+            "",
+            "[1, 2]",
+        ])
+        data = client.post("/flights/bulk", params={"on_conflict": "upsert"}, content=body).json()
+        assert (data["inserted"], data["updated"], data["rejected"]) == (0, 1, 1)
+        assert data["errors"] == [{"line": 3, "id": None, "errors": ["expected a JSON object"]}]
+        assert client.get("/flights/FQ001").json()["aircraft"] == "B737"
+
+    def test_export_round_trips(self, db_session):
+        exported = client.get("/flights/export", params={"format": "csv"}).text
+        db_session.execute(text("DELETE FROM crew_assignments"))
+        db_session.execute(text("DELETE FROM flights"))
+        db_session.commit()
+
+        data = client.post("/flights/bulk", params={"format": "csv"}, content=exported).json()
+        assert data["inserted"] == 14 and data["rejected"] == 0
+        assert client.get("/flights/export", params={"format": "csv"}).text == exported
+
+    def test_rejects_csv_without_the_flight_columns(self, db_session):
+        response = client.post("/flights/bulk", params={"format": "csv"}, content="id,From\nX,FRA\n")
+        assert response.status_code == 400
+
+
+class TestBulkCrew:
+    def test_upsert_summary(self, db_session):
+        body = "\n".join([
+            # unchanged
+            '{"id": "E0001", "name": "Alice Meyer", "email": "alice.meyer@example.com", "base_airport": "FRA", "qualifications": ["A320"]}',
+            # updated: new base and an extra qualification
+            '{"id": "E0002", "name": "Bob Khan", "email": "bob.khan@example.com", "base_airport": "LIS", "qualifications": ["A320", "B737"]}',
+            # inserted
+            '{"id": "E0100", "name": "Nia Park", "email": "nia.park@example.com", "base_airport": "FRA", "qualifications": ["E190"]}',
+            # rejected: email of E0003
+            '{"id": "E0101", "name": "Ola", "email": "carla.silva@example.com", "base_airport": "FRA"}',
+            # rejected: fails CrewCreate
+            '{"id": "E0102", "name": "Pia", "email": "not-an-email", "base_airport": "FRA"}',
+            # rejected: email claimed earlier in the upload
+            '{"id": "E0103", "name": "Nia Two", "email": "nia.park@example.com", "base_airport": "FRA"}',
+        ])
+        response = client.post("/crew/bulk", content=body)
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["received"], data["inserted"], data["updated"], data["unchanged"], data["rejected"]) == (6, 1, 1, 1, 3)
+        assert [(e["line"], e["id"]) for e in data["errors"]] == [(4, "E0101"), (5, "E0102"), (6, "E0103")]
+
+        assert client.get("/crew/E0002").json()["base_airport"] == "LIS"
+        assert client.get("/crew/E0002").json()["qualifications"] == ["A320", "B737"]
+        assert client.get("/crew/E0100").json()["qualifications"] == ["E190"]
+        assert client.get("/crew/E0101").status_code == 404
+
+    def test_rows_wider_than_the_columns_are_rejected_by_line(self, db_session):
+        long_email = "a" * 60 + "@" + "b" * 40 + ".io"
+        body = "\n".join([
+            '{"id": "E0100", "name": "Nia Park", "email": "nia.park@example.com", "base_airport": "FRA"}',
+            '{"id": "E0123456789", "name": "Too Long", "email": "too.long@example.com", "base_airport": "FRA"}',
+            f'{{"id": "E0102", "name": "Long Mail", "email": "{long_email}", "base_airport": "FRA"}}',
+        ])
+        response = client.post("/crew/bulk", content=body)
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["inserted"], data["rejected"]) == (1, 2)
+        assert [(e["line"], e["id"]) for e in data["errors"]] == [(2, "E0123456789"), (3, "E0102")]
+
+    def test_csv_without_qualifications_keeps_them(self, db_session):
+        body = "id,name,email,base_airport\nE0004,Dan Novak,dan.novak@example.com,VIE\n"
+        data = client.post("/crew/bulk", params={"format": "csv"}, content=body).json()
+        assert data["updated"] == 1
+        assert client.get("/crew/E0004").json()["qualifications"] == ["A320", "B737"]
+
+    def test_export_round_trips_unchanged(self, db_session):
+        exported = client.get("/crew/export", params={"format": "csv"}).text
+        data = client.post("/crew/bulk", params={"format": "csv"}, content=exported).json()
+        assert (data["unchanged"], data["inserted"], data["updated"], data["rejected"]) == (5, 0, 0, 0)
+
+
+class TestScheduleCache:
+    def flight_ids(self, crew_id):
+        schedule = client.get(f"/flights/schedule/{crew_id}").json()["schedule"]
+        return [item["flight"]["id"] for item in schedule if item["type"] == "flight"]
+
+    def test_repeated_reads_are_hits(self, db_session):
+        before = client.get("/health/cache").json()["schedule"]
+        first = client.get("/flights/schedule/E0001").json()
+        assert client.get("/flights/schedule/E0001").json() == first
+        after = client.get("/health/cache").json()["schedule"]
+        assert after["hits"] == before["hits"] + 1
+        assert after["size"] >= 1
+
+    def test_assignment_writes_invalidate(self, db_session):
+        assert "FQ001" not in self.flight_ids("E0001")
+
+        created = client.post("/assignments", json={"flight_id": "FQ001", "crew_employee_id": "E0001"}).json()
+        assert "FQ001" in self.flight_ids("E0001")
+
+        client.delete(f"/assignments/{created['id']}")
+        assert "FQ001" not in self.flight_ids("E0001")
+
+        # reactivates the soft-deleted row
+        client.post("/assignments", json={"flight_id": "FQ001", "crew_employee_id": "E0001"})
+        assert "FQ001" in self.flight_ids("E0001")
+
+    def test_flight_upsert_invalidates_its_crew(self, db_session):
+        client.post("/assignments", json={"flight_id": "FQ001", "crew_employee_id": "E0001"})
+        self.flight_ids("E0001")
+
+        row = ('{"id": "FQ001", "From": "FRA", "To": "LIS", "aircraft": "A320", '
+               '"departure": "2026-03-01T08:00:00Z", "arrival": "2026-03-01T11:00:00Z", "duty_hrs": 3.0}')
+        client.post("/flights/bulk", params={"on_conflict": "upsert"}, content=row)
+
+        schedule = client.get("/flights/schedule/E0001").json()["schedule"]
+        flight = next(item["flight"] for item in schedule if item["type"] == "flight" and item["flight"]["id"] == "FQ001")
+        assert flight["arrival"].startswith("2026-03-01T11:00")
+
+    def test_sync_service_checks_the_schedule_version(self, db_session):
+        from app.domains.flights.schedule_cache import SCHEDULE_CACHE
+        from app.domains.flights.service import FlightService
+
+        service = FlightService()
+        service.get_crew_schedule(db_session, "E0001")
+        hits = SCHEDULE_CACHE.hits
+        service.get_crew_schedule(db_session, "E0001")
+        assert SCHEDULE_CACHE.hits == hits + 1
+
+        db_session.execute(text("UPDATE crew_members SET schedule_version = schedule_version + 1 WHERE id = 'E0001'"))
+        db_session.commit()
+        misses = SCHEDULE_CACHE.misses
+        service.get_crew_schedule(db_session, "E0001")
+        assert SCHEDULE_CACHE.misses == misses + 1
+
+
+class TestDutyLedger:
+    def ledger(self, db_session):
+        rows = db_session.execute(text(
+            "SELECT crew_id, duty_date::text, total_hours::float FROM crew_duty_days ORDER BY 1, 2"
+        )).all()
+        # ends the snapshot, and discards a rebuild
+        db_session.rollback()
+        return [tuple(row) for row in rows]
+
+    def rebuilt(self, db_session):
+        from app.domains.crew_assignment.repository import CrewAssignmentRepository
+
+        CrewAssignmentRepository().rebuild_duty_days(db_session)
+        return self.ledger(db_session)
+
+    def test_assignment_writes_keep_the_ledger(self, db_session):
+        assert ("E0002", "2026-03-04", 8.0) in self.ledger(db_session)
+
+        created = client.post("/assignments", json={"flight_id": "FQ001", "crew_employee_id": "E0001"}).json()
+        assert ("E0001", "2026-03-01", 2.0) in self.ledger(db_session)
+
+        client.delete(f"/assignments/{created['id']}")
+        assert not [row for row in self.ledger(db_session) if row[:2] == ("E0001", "2026-03-01")]
+
+        client.post("/assignments", json={"flight_id": "FQ001", "crew_employee_id": "E0001"})
+        assert self.ledger(db_session) == self.rebuilt(db_session)
+
+    def test_auto_assign_keeps_the_ledger(self, db_session):
+        assert client.post("/assignments/auto").json()["total_assigned"] >= 4
+        assert self.ledger(db_session) == self.rebuilt(db_session)
+
+    def test_flight_upsert_keeps_the_ledger(self, db_session):
+        row = ('{"id": "FD022", "From": "FRA", "To": "AMS", "aircraft": "A320", '
+               '"departure": "2026-03-05T12:00:00Z", "arrival": "2026-03-05T14:00:00Z", "duty_hrs": 2.0}')
+        client.post("/assignments", json={"flight_id": "FD022", "crew_employee_id": "E0001"})
+        client.post("/flights/bulk", params={"on_conflict": "upsert"}, content=row)
+        assert ("E0001", "2026-03-05", 2.0) in self.ledger(db_session)
+        assert self.ledger(db_session) == self.rebuilt(db_session)
+
+    def test_daily_limit_reads_the_ledger(self, db_session):
+        db_session.execute(text(
+            "INSERT INTO crew_duty_days (crew_id, duty_date, total_hours) VALUES ('E0001', '2026-03-01', 7)"
+        ))
+        db_session.commit()
+        result = client.post("/assignments/validate", json={"flight_id": "FQ001", "crew_employee_id": "E0001"}).json()
+        assert "DAILY_DUTY_EXCEEDED" in [e["code"] for e in result["errors"]]
+
+        # the rebuild command puts the ledger back in line with the assignments
+        from app.domains.crew_assignment.duty_ledger import main
+
+        main(["E0001"])
+        result = client.post("/assignments/validate", json={"flight_id": "FQ001", "crew_employee_id": "E0001"}).json()
+        assert result["valid"]
+
+
+class TestConditionalGet:
+    def revalidate(self, path, tag):
+        return client.get(path, headers={"If-None-Match": tag})
+
+    def test_flight(self, db_session):
+        first = client.get("/flights/FQ001")
+        tag = first.headers["ETag"]
+        unchanged = self.revalidate("/flights/FQ001", tag)
+        assert unchanged.status_code == 304
+        assert unchanged.content == b""
+        assert unchanged.headers["ETag"] == tag
+
+        row = ('{"id": "FQ001", "From": "FRA", "To": "LIS", "aircraft": "A321", '
+               '"departure": "2026-03-01T08:00:00Z", "arrival": "2026-03-01T10:00:00Z", "duty_hrs": 2.0}')
+        client.post("/flights/bulk", params={"on_conflict": "upsert"}, content=row)
+        changed = self.revalidate("/flights/FQ001", tag)
+        assert changed.status_code == 200
+        assert changed.json()["aircraft"] == "A321"
+        assert changed.headers["ETag"] != tag
+
+    def test_crew(self, db_session):
+        tag = client.get("/crew/E0001").headers["ETag"]
+        assert self.revalidate("/crew/E0001", tag).status_code == 304
+
+        client.patch("/crew/E0001", json={"qualifications": ["A320", "E190"]})
+        changed = self.revalidate("/crew/E0001", tag)
+        assert changed.status_code == 200
+        assert changed.json()["qualifications"] == ["A320", "E190"]
+
+        tag = changed.headers["ETag"]
+        row = ('{"id": "E0001", "name": "Alice Meyer", "email": "alice.meyer@example.com", '
+               '"base_airport": "MUC", "qualifications": ["A320", "E190"]}')
+        client.post("/crew/bulk", content=row)
+        assert self.revalidate("/crew/E0001", tag).json()["base_airport"] == "MUC"
+
+    def test_schedule(self, db_session):
+        path = "/flights/schedule/E0001"
+        tag = client.get(path).headers["ETag"]
+        assert self.revalidate(path, tag).status_code == 304
+
+        client.post("/assignments", json={"flight_id": "FQ001", "crew_employee_id": "E0001"})
+        changed = self.revalidate(path, tag)
+        assert changed.status_code == 200
+        assert "FQ001" in {item["flight"]["id"] for item in changed.json()["schedule"] if item["flight"]}
+
+        tag = changed.headers["ETag"]
+        row = ('{"id": "FQ001", "From": "FRA", "To": "LIS", "aircraft": "A320", '
+               '"departure": "2026-03-01T08:00:00Z", "arrival": "2026-03-01T11:00:00Z", "duty_hrs": 3.0}')
+        client.post("/flights/bulk", params={"on_conflict": "upsert"}, content=row)
+        assert self.revalidate(path, tag).status_code == 200
+        # a flight nobody on this schedule flies does not change it
+        tag = client.get(path).headers["ETag"]
+        row = row.replace("FQ001", "FD022")
+        client.post("/flights/bulk", params={"on_conflict": "upsert"}, content=row)
+        assert self.revalidate(path, tag).status_code == 304
+
+    def test_if_none_match_lists_and_weak_tags(self, db_session):
+        tag = client.get("/flights/FQ001").headers["ETag"]
+        assert self.revalidate("/flights/FQ001", f'"nope", W/{tag}').status_code == 304
+        assert self.revalidate("/flights/FQ001", "*").status_code == 304
+        assert self.revalidate("/flights/FQ001", '"nope"').status_code == 200
+        assert self.revalidate("/flights/schedule/NOPE", "*").status_code == 404
+
+
+class TestListResponses:
+    @pytest.mark.parametrize("path, schema", [
+        ("/flights", "app.domains.flights.schemas:FlightRead"),
+        ("/crew", "app.domains.crew_management.schemas:CrewRead"),
+        ("/assignments?include_removed=true", "app.domains.crew_assignment.schemas:AssignmentRead"),
+    ])
+    def test_body_is_what_pydantic_would_write(self, db_session, path, schema):
+        import importlib
+        from pydantic import TypeAdapter
+
+        module, name = schema.split(":")
+        model = getattr(importlib.import_module(module), name)
+        response = client.get(path)
+        assert response.headers["content-type"] == "application/json"
+        items = [model.model_validate(item) for item in response.json()]
+        assert items
+        assert response.content == TypeAdapter(list[model]).dump_json(items)
+
+    def test_cursor_header_kept(self, db_session):
+        response = client.get("/flights", params={"limit": 2})
+        assert len(response.json()) == 2
+        assert "X-Next-Cursor" in response.headers
+
+    def test_rows_not_matching_the_model_are_rejected(self, db_session):
+        from fastapi.exceptions import ResponseValidationError
+        from app.domains.flights.schemas import FlightRead
+        from app.domains.responses import RowListRenderer
+
+        rows = db_session.execute(text(
+            """SELECT id, "From", "To", aircraft, departure, arrival, "Duty_hrs"::text AS duty_hrs
+            FROM flights ORDER BY id LIMIT 3"""
+        )).all()
+        with pytest.raises(ResponseValidationError):
+            RowListRenderer(FlightRead).render(rows)
+        assert RowListRenderer(FlightRead).render([]).body == b"[]"
+
+
+class TestRosterBoard:
+    WINDOW = {"from": "2026-03-01T00:00:00Z", "to": "2026-03-08T00:00:00Z"}
+
+    def test_every_crew_schedule_in_one_response(self, db_session):
+        response = client.get("/flights/schedule", params=self.WINDOW)
+        assert response.status_code == 200
+        board = response.json()
+        assert [entry["crew_member_id"] for entry in board] == ["E0001", "E0002", "E0003", "E0004", "E0005"]
+        # the window holds every flight, so each entry is the crew member's own schedule
+        for entry in board:
+            assert entry == client.get(f"/flights/schedule/{entry['crew_member_id']}").json()
+
+    def test_window_and_base_filter(self, db_session):
+        board = client.get("/flights/schedule", params={"from": "2026-03-04", "to": "2026-03-05"}).json()
+        schedules = {entry["crew_member_id"]: entry["schedule"] for entry in board}
+        assert schedules["E0001"] == []
+        assert [item["type"] for item in schedules["E0002"]] == ["flight", "rest", "flight"]
+        assert schedules["E0002"][1]["rest_hours"] == 1.0
+
+        board = client.get("/flights/schedule", params={**self.WINDOW, "base": "lis"}).json()
+        assert board == [{"crew_member_id": "E0003", "schedule": []}]
+
+    def test_one_query(self, db_session):
+        assert TestLoadingProfiles().count_queries("/flights/schedule?from=2026-03-01&to=2026-03-08") == 1
+
+    def test_large_board_is_streamed(self, db_session, monkeypatch):
+        from app.domains.flights import board, service
+
+        whole = client.get("/flights/schedule", params=self.WINDOW)
+        assert whole.headers["content-length"]
+        monkeypatch.setattr(board, "BOARD_BATCH_SIZE", 2)
+        monkeypatch.setattr(service, "BOARD_BATCH_SIZE", 2)
+        streamed = client.get("/flights/schedule", params=self.WINDOW)
+        assert "content-length" not in streamed.headers
+        assert streamed.content == whole.content
+
+        empty = client.get("/flights/schedule", params={**self.WINDOW, "base": "XXX"})
+        assert empty.json() == []
+
+    @pytest.mark.parametrize("window", [
+        {"from": "2026-03-08", "to": "2026-03-01"},
+        {"from": "2026-03-01", "to": "2026-05-01"},
+    ])
+    def test_bad_window(self, db_session, window):
+        assert client.get("/flights/schedule", params=window).status_code == 400
+
+
+class TestHealth:
+    def test_db_health_reports_pool(self, db_session):
+        client.get("/flights")
+        response = client.get("/health/db")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["reachable"] is True
+        pool = data["pool"]
+        for key in ("size", "checked_out", "overflow", "checkouts", "wait_avg_s", "wait_max_s", "timeouts"):
+            assert key in pool
+        assert pool["checkouts"] >= 1
+        assert pool["overflow"] >= 0
+        # GET /flights runs on the async engine, or on the replica's when one is configured
+        replica_checkouts = data["replica"].get("pool", {}).get("checkouts", 0)
+        assert data["async_pool"]["checkouts"] + replica_checkouts >= 1
+        assert data["replica"]["configured"] is ("pool" in data["replica"])
@@ -0,0 +1,87 @@
+import pytest
+from sqlalchemy import and_, select, text
+from sqlalchemy.dialects import postgresql
+
+from app.domains.crew_assignment.models import CrewAssignment
+from app.domains.crew_management.models import CrewQualification
+from app.domains.flights.repository import _list_stmt
+
+
+@pytest.fixture
+def history(db_session):
+    """Removed assignments outnumbering live ones, as in production, analyzed.
+
+    Without them the partial and full indexes are the same size and the
+    planner's pick between them depends on leftover statistics. The indexes
+    are rebuilt first, as rows other tests committed and deleted leave them
+    bloated. Nothing is committed; the rows, indexes and statistics are
+    rolled back.
+    """
+    db_session.execute(text("REINDEX TABLE crew_assignments"))
+    db_session.execute(text("""
+        INSERT INTO flights (id, "From", "To", aircraft, departure, arrival, "Duty_hrs")
+        SELECT 'H' || n, 'XXA', 'XXB', 'B737', now(), now() + interval '1 hour', 1.0
+        FROM generate_series(1, 1000) AS n
+    """))
+    db_session.execute(text("""
+        INSERT INTO crew_assignments (flight_id, crew_employee_id, removed_at)
+        SELECT 'H' || n, c.id, now()
+        FROM generate_series(1, 1000) AS n, crew_members AS c
+    """))
+    db_session.execute(text("ANALYZE flights, crew_assignments, crew_qualifications"))
+    yield
+    db_session.rollback()
+
+
+def plan_indexes(db_session, stmt) -> set[str]:
+    """Index names in the plan of ``stmt``, with sequential scans priced out.
+
+    The test tables are small enough that the planner would rightly pick a
+    sequential scan; disabling it shows which index the query can be served by.
+    The transaction is left open: the ``history`` rows and statistics must stay
+    visible to every plan of a test, and the fixture rolls it all back.
+    """
+    sql = stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    db_session.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = db_session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar_one()
+
+    found, stack = set(), [plan[0]["Plan"]]
+    while stack:
+        node = stack.pop()
+        if "Index Name" in node:
+            found.add(node["Index Name"])
+        stack.extend(node.get("Plans", []))
+    return found
+
+
+def index_exists(db_session, name: str) -> bool:
+    return db_session.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is not None
+
+
+@pytest.mark.usefixtures("history")
+class TestIndexes:
+    def test_active_assignments_by_crew(self, db_session):
+        stmt = select(CrewAssignment).where(
+            and_(CrewAssignment.crew_employee_id == "E0001", CrewAssignment.removed_at.is_(None))
+        )
+        assert "ix_crew_assignments_active_crew" in plan_indexes(db_session, stmt)
+
+    def test_active_assignments_by_flight(self, db_session):
+        stmt = select(CrewAssignment).where(
+            and_(CrewAssignment.flight_id == "FQ001", CrewAssignment.removed_at.is_(None))
+        )
+        assert "ix_crew_assignments_active_flight" in plan_indexes(db_session, stmt)
+
+    def test_route_filter(self, db_session):
+        stmt = _list_stmt(From="FRA", To="LIS", date=None, aircraft=None, after=None, limit=100, offset=0)
+        assert "ix_flights_from_to" in plan_indexes(db_session, stmt)
+
+    def test_crew_by_qualification(self, db_session):
+        stmt = select(CrewQualification.crew_id).where(CrewQualification.aircraft_type == "A320")
+        assert "ix_crew_qualifications_aircraft_type" in plan_indexes(db_session, stmt)
+
+    def test_aircraft_substring_filter(self, db_session):
+        if not index_exists(db_session, "ix_flights_aircraft_trgm"):
+            pytest.skip("pg_trgm is not installed on this server")
+        stmt = _list_stmt(From=None, To=None, date=None, aircraft="320", after=None, limit=100, offset=0)
+        assert "ix_flights_aircraft_trgm" in plan_indexes(db_session, stmt)
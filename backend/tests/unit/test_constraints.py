@@ -1,4 +1,6 @@
 import pytest
+from sqlalchemy import event, text
+
 from app.domains.crew_assignment.service import CrewAssignmentService
 
 
@@ -46,3 +48,33 @@ class TestOverlapConstraint:
         assert result.valid is False
         codes = [e.code for e in result.errors]
         assert "FLIGHT_OVERLAP" in codes
+
+
+class TestRosterPreload:
+    def _count_queries(self, db_session, flight_id, crew_id):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            CrewAssignmentService().validate_assignment(db_session, flight_id, crew_id)
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+        return len(statements)
+
+    def test_query_count_independent_of_roster_size(self, db_session):
+        short_roster = self._count_queries(db_session, "AA200", "E0001")
+
+        db_session.execute(text("""
+            INSERT INTO crew_assignments (flight_id, crew_employee_id, created_at) VALUES
+            ('FQ001', 'E0001', '2026-02-25T10:00:00Z'),
+            ('FD022', 'E0001', '2026-02-25T10:01:00Z'),
+            ('AA203', 'E0001', '2026-02-25T10:02:00Z')
+        """))
+        db_session.commit()
+
+        long_roster = self._count_queries(db_session, "AA200", "E0001")
+        assert long_roster == short_roster
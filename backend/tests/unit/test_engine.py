@@ -0,0 +1,63 @@
+from sqlalchemy import text
+
+from app.database.engine import ASYNC_DB_ENGINE, DB_ENGINE, DB_SETTINGS, DB_URL, pool_status
+
+
+class TestEngineSettings:
+    def test_url_keeps_port(self):
+        assert DB_URL.port == DB_SETTINGS.port
+
+    def test_statement_timeout_applied_per_session(self, db_session):
+        with DB_ENGINE.connect() as conn:
+            value = conn.execute(text("SHOW statement_timeout")).scalar_one()
+        assert value == f"{DB_SETTINGS.statement_timeout_ms // 1000}s"
+
+    def test_async_pool_sized_on_its_own(self):
+        status = pool_status(ASYNC_DB_ENGINE)
+        assert status["size"] == DB_SETTINGS.async_pool_size
+        assert status["max_overflow"] == DB_SETTINGS.async_max_overflow
+        assert pool_status(DB_ENGINE)["max_overflow"] == DB_SETTINGS.max_overflow
+
+
+class TestReplicaRouter:
+    def route(self, url, **options):
+        import asyncio
+        from sqlalchemy.ext.asyncio import create_async_engine
+        from sqlalchemy.pool import NullPool
+        from app.database.engine import ReplicaRouter
+
+        settings = {"max_lag_s": 5.0, "check_interval_s": 60.0, "retry_s": 60.0, **options}
+
+        async def check():
+            engine = create_async_engine(url, poolclass=NullPool, connect_args={"connect_timeout": 1})
+            router = ReplicaRouter(engine, **settings)
+            try:
+                return [await router.usable(), await router.usable()], router.status()
+            finally:
+                await engine.dispose()
+
+        return asyncio.run(check())
+
+    def test_server_that_is_not_a_standby_has_no_lag(self, db_session):
+        # a primary standing in for the replica is as fresh as it gets
+        used, status = self.route(db_session.get_bind().url)
+        assert used == [True, True]
+        assert status["lag_s"] == 0 and status["error"] is None
+
+    def test_unreachable_replica_falls_back(self, db_session):
+        used, status = self.route(db_session.get_bind().url.set(port=1))
+        assert used == [False, False]
+        assert status["error"] == "OperationalError"
+
+    def test_lag_over_tolerance_falls_back(self, db_session):
+        used, status = self.route(db_session.get_bind().url, max_lag_s=-1.0)
+        assert used == [False, False]
+        assert status["error"] is None
+
+    def test_no_replica_configured(self):
+        import asyncio
+        from app.database.engine import ReplicaRouter
+
+        router = ReplicaRouter(None, max_lag_s=5.0, check_interval_s=1.0, retry_s=1.0)
+        assert asyncio.run(router.usable()) is False
+        assert router.status()["configured"] is False
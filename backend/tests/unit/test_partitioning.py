@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta, timezone
+
+from app.domains.crew_assignment import partitioning
+from app.domains.crew_assignment.engine import AutoAssignEngine, CrewState, OpenFlight
+from app.domains.crew_assignment.partitioning import partition
+from app.domains.crew_assignment.roster import RosterFlight
+from app.domains.crew_assignment.strategies import AssignmentStrategy
+from app.domains.crew_assignment.timeline import CrewTimeline
+
+
+BASE = datetime(2026, 3, 1, 6, 0, tzinfo=timezone.utc)
+
+
+def make_flight(flight_id, aircraft, start_h, block_h=2.0):
+    departure = BASE + timedelta(hours=start_h)
+    arrival = departure + timedelta(hours=block_h)
+    return OpenFlight(
+        flight_id=flight_id,
+        departure=departure.isoformat(),
+        arrival=arrival.isoformat(),
+        duty_hrs=block_h,
+        departure_at=departure,
+        arrival_at=arrival,
+        aircraft=aircraft,
+    )
+
+
+def make_engine():
+    crew = [
+        CrewState("A1", frozenset({"A320"})),
+        CrewState("A2", frozenset({"A320", "A321"})),
+        CrewState("B1", frozenset({"B737"})),
+        CrewState("B2", frozenset({"B737"})),
+    ]
+    # three days of A320/A321 and B737 flying, with the nights in between
+    # long enough that every day is its own time window
+    flights = [
+        make_flight(f"{aircraft}-{day}-{slot}", aircraft, day * 24 + slot * 3)
+        for day in range(3)
+        for aircraft in ("A320", "A321", "B737")
+        for slot in range(3)
+    ]
+    flights.append(make_flight("E190-0", "E190", 1))
+    return AutoAssignEngine(crew, flights, set())
+
+
+class TestPartitioning:
+    def test_splits_by_qualification_component_and_day(self):
+        engine = make_engine()
+        partitions, serial = partition(engine, engine.flights, tasks=100)
+
+        assert [f.flight_id for f in serial] == ["E190-0"]
+        assert len(partitions) == 6
+        for part in partitions:
+            aircraft = {f.aircraft for f in part.flights}
+            days = {f.departure_at.date() for f in part.flights}
+            assert len(days) == 1
+            assert aircraft in ({"A320", "A321"}, {"B737"})
+            pool = {c.crew_id for c in part.crew}
+            assert pool == ({"A1", "A2"} if "A320" in aircraft else {"B1", "B2"})
+
+    def test_windows_are_packed_to_the_task_count(self):
+        engine = make_engine()
+        partitions, _ = partition(engine, engine.flights, tasks=2)
+        assert len(partitions) == 2
+
+    def test_trims_existing_roster_to_the_window(self):
+        engine = make_engine()
+        far = RosterFlight("OLD", "", "", 2.0, BASE - timedelta(days=10), BASE - timedelta(days=10, hours=-2))
+        near = RosterFlight("PREV", "", "", 2.0, BASE - timedelta(hours=8), BASE - timedelta(hours=6))
+        engine.crew[2].timeline = CrewTimeline([far, near])
+
+        partitions, _ = partition(engine, engine.flights, tasks=100)
+        first_b737 = next(p for p in partitions if p.flights[0].aircraft == "B737")
+        trimmed = next(c for c in first_b737.crew if c.crew_id == "B1").timeline
+        assert trimmed.has_flight("PREV")
+        assert not trimmed.has_flight("OLD")
+
+    def test_parallel_run_matches_serial_coverage(self, monkeypatch):
+        monkeypatch.setattr(partitioning, "PARALLEL_MIN_FLIGHTS", 0)
+        serial = make_engine().run(AssignmentStrategy.GREEDY)
+        parallel_engine = make_engine()
+        parallel = parallel_engine.run(AssignmentStrategy.GREEDY, workers=2)
+
+        assert parallel.total_assigned == serial.total_assigned
+        assert {f.flight_id for f in parallel.failed} == {f.flight_id for f in serial.failed}
+
+        # replaying the merged plan from scratch must not break any rule
+        timelines = {c.crew_id: CrewTimeline() for c in parallel_engine.crew}
+        flights = {f.flight_id: f for f in parallel_engine.flights}
+        for assignment in parallel.assigned:
+            timeline = timelines[assignment.crew_member_id]
+            assert timeline.accepts(flights[assignment.flight_id])
+            timeline.add(flights[assignment.flight_id])
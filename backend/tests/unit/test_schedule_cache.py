@@ -0,0 +1,66 @@
+from app.domains.flights.schedule_cache import ScheduleCache
+from app.domains.flights.schemas import CrewScheduleResponse
+
+
+def schedule(crew_id):
+    return CrewScheduleResponse(crew_member_id=crew_id, schedule=[])
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestScheduleCache:
+    def test_hit_after_put_and_miss_after_ttl(self):
+        clock = Clock()
+        cache = ScheduleCache(maxsize=10, ttl_s=60, clock=clock)
+        assert cache.get("E1") is None
+        cache.put("E1", schedule("E1"), cache.generation())
+        assert cache.get("E1").crew_member_id == "E1"
+
+        clock.now = 61
+        assert cache.get("E1") is None
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["size"]) == (1, 2, 0)
+        assert stats["hit_rate"] == 0.3333
+
+    def test_least_recently_used_is_evicted(self):
+        cache = ScheduleCache(maxsize=2, ttl_s=60)
+        for crew_id in ("E1", "E2"):
+            cache.put(crew_id, schedule(crew_id), cache.generation())
+        cache.get("E1")
+        cache.put("E3", schedule("E3"), cache.generation())
+        assert cache.get("E2") is None
+        assert cache.get("E1") is not None and cache.get("E3") is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_invalidate_drops_only_the_given_crew(self):
+        cache = ScheduleCache(maxsize=10, ttl_s=60)
+        for crew_id in ("E1", "E2"):
+            cache.put(crew_id, schedule(crew_id), cache.generation())
+        cache.invalidate(["E1", "E9"])
+        assert cache.get("E1") is None
+        assert cache.get("E2") is not None
+        assert cache.stats()["invalidations"] == 1
+
+    def test_read_that_raced_a_write_is_not_stored(self):
+        cache = ScheduleCache(maxsize=10, ttl_s=60)
+        generation = cache.generation()
+        cache.invalidate(["E1"])
+        cache.put("E1", schedule("E1"), generation)
+        assert cache.get("E1") is None
+
+    def test_zero_size_disables_it(self):
+        cache = ScheduleCache(maxsize=0, ttl_s=60)
+        cache.put("E1", schedule("E1"), cache.generation())
+        assert cache.get("E1") is None
+
+    def test_other_version_misses(self):
+        cache = ScheduleCache(maxsize=10, ttl_s=60)
+        cache.put("E1", schedule("E1"), cache.generation(), version=3)
+        assert cache.get("E1", 4) is None
+        assert cache.get("E1", 3) is not None
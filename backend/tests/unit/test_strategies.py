@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.domains.crew_assignment.engine import AutoAssignEngine, CrewState, OpenFlight
+from app.domains.crew_assignment.strategies import AssignmentStrategy
+
+
+BASE = datetime(2026, 3, 1, 6, 0, tzinfo=timezone.utc)
+
+
+def make_flight(flight_id, aircraft, start_h, block_h=2.0):
+    departure = BASE + timedelta(hours=start_h)
+    arrival = departure + timedelta(hours=block_h)
+    return OpenFlight(
+        flight_id=flight_id,
+        departure=departure.isoformat(),
+        arrival=arrival.isoformat(),
+        duty_hrs=block_h,
+        departure_at=departure,
+        arrival_at=arrival,
+        aircraft=aircraft,
+    )
+
+
+def make_engine():
+    # the dual-rated crew member is first in crew order, so the greedy pass
+    # gives them the A320 flight and nobody is left for the B737
+    crew = [
+        CrewState("DUAL", frozenset({"A320", "B737"})),
+        CrewState("SINGLE", frozenset({"A320"})),
+    ]
+    flights = [
+        make_flight("F1", "A320", 0),
+        make_flight("F2", "B737", 0.5),
+    ]
+    return AutoAssignEngine(crew, flights, set())
+
+
+class TestAssignmentStrategies:
+    def test_greedy_keeps_table_order(self):
+        result = make_engine().run(AssignmentStrategy.GREEDY)
+        assert result.total_assigned == 1
+        assert [f.flight_id for f in result.failed] == ["F2"]
+        assert result.coverage == 0.5
+
+    @pytest.mark.parametrize("strategy", [AssignmentStrategy.MATCHING, AssignmentStrategy.SWEEP])
+    def test_optimising_strategies_cover_both(self, strategy):
+        result = make_engine().run(strategy)
+        assert result.strategy == strategy.value
+        assert result.coverage == 1.0
+        assigned = {a.flight_id: a.crew_member_id for a in result.assigned}
+        assert assigned == {"F1": "SINGLE", "F2": "DUAL"}
+        assert result.objective == 2.0 * 2.0 + 2.0 * 2.0
+
+    def test_exhausted_budget_falls_back_to_greedy(self):
+        result = make_engine().run(AssignmentStrategy.MATCHING, time_budget_s=1e-9)
+        assert result.budget_exhausted is True
+        assert result.total_assigned + result.total_failed == 2
@@ -0,0 +1,94 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+from app.domains.crew_assignment.roster import RosterFlight
+from app.domains.crew_assignment.timeline import CrewTimeline
+
+
+BASE = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+
+def make_flight(flight_id, start_h, block_h, duty_hrs=2.0):
+    departure = BASE + timedelta(hours=start_h)
+    arrival = departure + timedelta(hours=block_h)
+    return RosterFlight(
+        flight_id=flight_id,
+        departure=departure.isoformat(),
+        arrival=arrival.isoformat(),
+        duty_hrs=duty_hrs,
+        departure_at=departure,
+        arrival_at=arrival,
+    )
+
+
+class TestCrewTimeline:
+    def test_overlap_found_through_long_earlier_flight(self):
+        timeline = CrewTimeline([
+            make_flight("LONG", 0, 14),
+            make_flight("SHORT", 2, 1),
+        ])
+        new = make_flight("NEW", 10, 2)
+        hit = timeline.find_overlap(new.departure_at, new.arrival_at)
+        assert hit is not None and hit.flight_id == "LONG"
+
+    def test_back_to_back_is_not_overlap(self):
+        timeline = CrewTimeline([make_flight("A", 0, 2)])
+        new = make_flight("NEW", 2, 2)
+        assert timeline.find_overlap(new.departure_at, new.arrival_at) is None
+
+    def test_latest_arrival_before_is_strict(self):
+        timeline = CrewTimeline([make_flight("A", 0, 2), make_flight("B", 5, 2)])
+        assert timeline.latest_arrival_before(BASE + timedelta(hours=7)).flight_id == "A"
+        assert timeline.latest_arrival_before(BASE + timedelta(hours=8)).flight_id == "B"
+        assert timeline.latest_arrival_before(BASE + timedelta(hours=2)) is None
+
+    def test_duty_hours_grouped_by_departure_date(self):
+        timeline = CrewTimeline([
+            make_flight("A", 1, 2, duty_hrs=2.0),
+            make_flight("B", 6, 4, duty_hrs=4.0),
+            make_flight("C", 30, 2, duty_hrs=3.0),
+        ])
+        assert timeline.duty_hours_on(BASE.date()) == 6.0
+        assert timeline.duty_hours_on((BASE + timedelta(days=1)).date()) == 3.0
+
+    def test_matches_linear_scan(self):
+        rng = random.Random(7)
+        flights = [
+            make_flight(f"F{i}", rng.uniform(0, 500), rng.uniform(0.5, 12))
+            for i in range(200)
+        ]
+        timeline = CrewTimeline()
+        for flight in flights:
+            timeline.add(flight)
+
+        for _ in range(300):
+            new = make_flight("NEW", rng.uniform(-20, 520), rng.uniform(0.5, 12))
+
+            expected_overlap = any(
+                new.departure_at < f.arrival_at and new.arrival_at > f.departure_at
+                for f in flights
+            )
+            assert (timeline.find_overlap(new.departure_at, new.arrival_at) is not None) == expected_overlap
+
+            earlier = [f.arrival_at for f in flights if f.arrival_at < new.departure_at]
+            latest = timeline.latest_arrival_before(new.departure_at)
+            assert (latest.arrival_at if latest else None) == (max(earlier) if earlier else None)
+
+    def test_built_the_same_from_any_order(self):
+        rng = random.Random(11)
+        flights = [
+            make_flight(f"F{i}", rng.choice([0, 5, 5, 9]) + i * 3, rng.uniform(0.5, 12))
+            for i in range(100)
+        ]
+        ordered = CrewTimeline(sorted(flights, key=lambda f: f.departure_at))
+        rng.shuffle(flights)
+        shuffled = CrewTimeline(flights)
+
+        for _ in range(200):
+            new = make_flight("NEW", rng.uniform(-20, 320), rng.uniform(0.5, 12))
+            assert shuffled.find_overlap(new.departure_at, new.arrival_at) == ordered.find_overlap(
+                new.departure_at, new.arrival_at
+            )
+            assert shuffled.latest_arrival_before(new.departure_at) == ordered.latest_arrival_before(
+                new.departure_at
+            )
@@ -0,0 +1,50 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.domains.flights import times
+from app.domains.flights.times import parse_cache_info, parse_flight_date, parse_flight_time
+
+
+class TestParseFlightTime:
+    @pytest.mark.parametrize(
+        "value",
+        [
+            "2026-03-01T08:00:00Z",
+            "2026-03-01T08:00:00+00:00",
+            "2026-03-01T09:00:00+01:00",
+            "2026-03-01 08:00",
+        ],
+    )
+    def test_iso_inputs_become_utc(self, value):
+        assert parse_flight_time(value) == datetime(2026, 3, 1, 8, 0, tzinfo=timezone.utc)
+        assert parse_flight_time(value).tzinfo == timezone.utc
+
+    def test_legacy_uses_legacy_year(self, monkeypatch):
+        monkeypatch.setattr(times, "legacy_year", lambda: 2031)
+        assert parse_flight_time("Feb 1, 06:00") == datetime(2031, 2, 1, 6, 0, tzinfo=timezone.utc)
+        assert parse_flight_time(" feb 10,06:30 ") == datetime(2031, 2, 10, 6, 30, tzinfo=timezone.utc)
+
+    def test_datetimes_are_normalised(self):
+        aware = datetime(2026, 3, 1, 9, 0, tzinfo=timezone(timedelta(hours=1)))
+        assert parse_flight_time(aware) == datetime(2026, 3, 1, 8, 0, tzinfo=timezone.utc)
+        assert parse_flight_time(datetime(2026, 3, 1, 8, 0)).tzinfo == timezone.utc
+
+    @pytest.mark.parametrize("value", [None, "", "soon", "Feb 30, 06:00", "Foo 1, 06:00", "2026-13-01T00:00"])
+    def test_unparseable_is_none(self, value):
+        assert parse_flight_time(value) is None
+
+    def test_repeated_values_hit_the_cache(self):
+        parse_flight_time("Mar 3, 07:15")
+        before = parse_cache_info().hits
+        for _ in range(10):
+            parse_flight_time("Mar 3, 07:15")
+        assert parse_cache_info().hits == before + 10
+
+
+class TestParseFlightDate:
+    def test_iso_and_legacy(self, monkeypatch):
+        monkeypatch.setattr(times, "legacy_year", lambda: 2026)
+        assert parse_flight_date("2026-03-04") == date(2026, 3, 4)
+        assert parse_flight_date("Mar 4") == date(2026, 3, 4)
+        assert parse_flight_date("not a date") is None